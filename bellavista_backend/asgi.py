@@ -0,0 +1,12 @@
+# ASGI Configuration for Bellavista Care Homes Backend
+# Serves the project from an event loop so async views can multiplex slow
+# upstream calls (Nominatim, SendGrid) instead of holding a worker each
+
+import os
+from django.core.asgi import get_asgi_application
+
+# Set default Django settings module
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bellavista_backend.settings')
+
+# Create ASGI application
+application = get_asgi_application()
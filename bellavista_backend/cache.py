@@ -0,0 +1,154 @@
+# SQLite Cache Backend for Bellavista Care Homes Backend
+# A cache shared by every gunicorn worker on the host, for deployments without Redis
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+
+class SQLiteCache(BaseCache):
+    """
+    Cache backend storing entries in a local SQLite file.
+
+    Unlike LocMemCache, every worker process on the host shares the same
+    entries, so hit rates and invalidation do not degrade as workers are
+    added. Integers are stored natively so incr()/decr() and add() are
+    single atomic statements rather than read-modify-write in Python.
+
+    Configure with:
+        'BACKEND': 'bellavista_backend.cache.SQLiteCache',
+        'LOCATION': '/path/to/cache.sqlite3',
+    """
+
+    # Delete expired rows roughly once every this many writes
+    CULL_EVERY = 500
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = location
+        self._local = threading.local()
+        self._writes = 0
+
+    # =========================================================================
+    # CONNECTION MANAGEMENT
+    # =========================================================================
+
+    def _db(self):
+        """Return this thread's connection, reconnecting after a fork"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self._path, timeout=5, isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache_entries ('
+            'key TEXT PRIMARY KEY, value BLOB, expires REAL)'
+        )
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def close(self, **kwargs):
+        # Connections are reused across requests
+        pass
+
+    # =========================================================================
+    # VALUE ENCODING
+    # =========================================================================
+
+    @staticmethod
+    def _encode(value):
+        # Plain ints are stored as SQLite integers so they can be incremented in SQL
+        if type(value) is int:
+            return value
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _decode(value):
+        if isinstance(value, int):
+            return value
+        return pickle.loads(value)
+
+    def _cull(self, conn):
+        self._writes += 1
+        if self._writes % self.CULL_EVERY == 0:
+            conn.execute('DELETE FROM cache_entries WHERE expires <= ?', (time.time(),))
+
+    # =========================================================================
+    # CACHE API
+    # =========================================================================
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._db()
+        cursor = conn.execute(
+            'INSERT INTO cache_entries (key, value, expires) VALUES (?, ?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires = excluded.expires '
+            'WHERE cache_entries.expires <= ?',
+            (key, self._encode(value), self.get_backend_timeout(timeout), time.time())
+        )
+        self._cull(conn)
+        return cursor.rowcount > 0
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._db().execute(
+            'SELECT value FROM cache_entries WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (key, time.time())
+        ).fetchone()
+        return default if row is None else self._decode(row[0])
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._db()
+        conn.execute(
+            'INSERT OR REPLACE INTO cache_entries (key, value, expires) VALUES (?, ?, ?)',
+            (key, self._encode(value), self.get_backend_timeout(timeout))
+        )
+        self._cull(conn)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._db().execute(
+            'UPDATE cache_entries SET expires = ? WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (self.get_backend_timeout(timeout), key, time.time())
+        )
+        return cursor.rowcount > 0
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._db().execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+        return cursor.rowcount > 0
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._db().execute(
+            'SELECT 1 FROM cache_entries WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (key, time.time())
+        ).fetchone()
+        return row is not None
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._db().execute(
+            'UPDATE cache_entries SET value = value + ? '
+            'WHERE key = ? AND typeof(value) = \'integer\' AND (expires IS NULL OR expires > ?) '
+            'RETURNING value',
+            (delta, key, time.time())
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"Key '{key}' not found")
+        return row[0]
+
+    def clear(self):
+        self._db().execute('DELETE FROM cache_entries')
@@ -0,0 +1,103 @@
+# Health Probes for Bellavista Care Homes Backend
+# Liveness and readiness endpoints for the platform's health checks
+
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
+
+CACHE_PROBE_KEY = 'health:probe'
+
+
+class Readiness:
+    """
+    Readiness checks for one process, cached for READINESS_CACHE_SECONDS.
+
+    Probes between refreshes are answered from memory, so their cost does
+    not depend on traffic or table sizes. A refresh runs `SELECT 1`, one
+    cache read and, until it first passes, the migration check; the
+    migration graph is only loaded from disk while migrations are pending.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked_at = None
+        self._result = None
+        self._migrated = False
+
+    def clear(self):
+        with self._lock:
+            self._checked_at = None
+            self._result = None
+            self._migrated = False
+
+    def check_database(self):
+        with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+
+    def check_migrations(self):
+        if self._migrated:
+            return
+        executor = MigrationExecutor(connections[DEFAULT_DB_ALIAS])
+        pending = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        if pending:
+            raise RuntimeError(f'{len(pending)} unapplied migration(s)')
+        # Migrations cannot be unapplied under a running process
+        self._migrated = True
+
+    def check_cache(self):
+        cache.get(CACHE_PROBE_KEY)
+
+    def run_checks(self):
+        """
+        Run every check.
+
+        Returns:
+            tuple: (ready, {check name: 'ok' or the error})
+        """
+        checks = {}
+        for name, check in (
+            ('database', self.check_database),
+            ('migrations', self.check_migrations),
+            ('cache', self.check_cache),
+        ):
+            try:
+                check()
+                checks[name] = 'ok'
+            except Exception as e:
+                checks[name] = f'{type(e).__name__}: {e}'
+        return all(result == 'ok' for result in checks.values()), checks
+
+    def status(self):
+        """Cached (ready, checks), refreshed at most once per interval"""
+        with self._lock:
+            now = time.monotonic()
+            if self._checked_at is None or now - self._checked_at >= settings.READINESS_CACHE_SECONDS:
+                self._result = self.run_checks()
+                self._checked_at = now
+            return self._result
+
+
+readiness = Readiness()
+
+
+@never_cache
+def liveness_view(request):
+    """The process is up and serving requests; no I/O"""
+    return JsonResponse({'status': 'alive'})
+
+
+@never_cache
+def readiness_view(request):
+    """Database, migrations and cache are usable; 503 if not"""
+    ready, checks = readiness.status()
+    return JsonResponse(
+        {'status': 'ready' if ready else 'unavailable', 'checks': checks},
+        status=200 if ready else 503,
+    )
@@ -0,0 +1,248 @@
+# Instrumentation Hooks for Bellavista Care Homes Backend
+# Per-request accounting of database queries, external calls and named phases
+
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+# Stats for the request being handled in this context (None outside requests)
+_current = ContextVar('request_stats', default=None)
+
+# Listeners called as listener(service, seconds, ok) after every external call
+_external_call_listeners = []
+
+slow_query_logger = logging.getLogger('bellavista.slow_queries')
+
+
+class RequestStats:
+    """Timings collected while one request is handled"""
+
+    def __init__(self, request=None):
+        self.request = request
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        # service -> [call count, seconds]
+        self.external = {}
+        # phase name -> seconds, in the order phases first ran
+        self.phases = {}
+
+    @property
+    def external_seconds(self):
+        return sum(seconds for _, seconds in self.external.values())
+
+    @property
+    def view_name(self):
+        """URL name of the view handling the request, once it has been resolved"""
+        match = getattr(self.request, 'resolver_match', None)
+        if match:
+            return match.view_name
+        return self.request.path if self.request is not None else None
+
+
+def begin_request(request=None):
+    """
+    Start collecting stats for the current request; returns (stats, token).
+
+    Nested calls (several middlewares tracking the same request) share the
+    stats already in progress.
+    """
+    stats = _current.get()
+    if stats is None:
+        stats = RequestStats(request)
+    return stats, _current.set(stats)
+
+
+def end_request(token):
+    """Stop collecting stats for the request started with begin_request()"""
+    _current.reset(token)
+
+
+@contextmanager
+def request_context(request):
+    """
+    Attribute work done after a view returned, such as producing a streamed
+    body, to its request; the middlewares have already ended it by then.
+    """
+    stats, token = begin_request(request)
+    try:
+        yield stats
+    finally:
+        try:
+            end_request(token)
+        except ValueError:
+            # An abandoned stream finalised from another context
+            pass
+
+
+def current_stats():
+    """Stats for the request in progress, or None"""
+    return _current.get()
+
+
+def add_external_call_listener(listener):
+    """Register a callable notified of every tracked external call"""
+    if listener not in _external_call_listeners:
+        _external_call_listeners.append(listener)
+
+
+@contextmanager
+def track_external_call(service):
+    """
+    Time a call to an external service (e.g. 'nominatim', 'sendgrid').
+
+    Works around awaits too. The duration is added to the current request's
+    stats (if any) and reported to every listener, such as the metrics
+    registry, even when the call raises.
+    """
+    start = time.perf_counter()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        seconds = time.perf_counter() - start
+        stats = _current.get()
+        if stats is not None:
+            totals = stats.external.setdefault(service, [0, 0.0])
+            totals[0] += 1
+            totals[1] += seconds
+        for listener in _external_call_listeners:
+            listener(service, seconds, ok)
+
+
+@contextmanager
+def track(phase):
+    """
+    Time a named phase of the current request (e.g. 'validate', 'serialize').
+
+    Repeated phases accumulate. Does nothing outside a tracked request.
+    """
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.phases[phase] = stats.phases.get(phase, 0.0) + time.perf_counter() - start
+
+
+def log_slow_query(sql, seconds, view):
+    """
+    Log a query that took at least SLOW_QUERY_THRESHOLD_MS.
+
+    Only SLOW_QUERY_SAMPLE_RATE of slow queries are logged, so a degraded
+    hot query cannot flood the logs.
+    """
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold is None or seconds * 1000 < threshold:
+        return
+    if random.random() >= settings.SLOW_QUERY_SAMPLE_RATE:
+        return
+    slow_query_logger.warning(
+        'Slow query (%.1fms) in %s: %s', seconds * 1000, view or 'no request', sql,
+        extra={'duration_ms': round(seconds * 1000, 1), 'view': view, 'sql': sql},
+    )
+
+
+def db_execute_wrapper(execute, sql, params, many, context):
+    """
+    Database execute wrapper that counts queries against the current request
+    and logs a sample of slow ones with the view that ran them.
+    """
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        seconds = time.perf_counter() - start
+        stats = _current.get()
+        if stats is not None:
+            stats.db_queries += 1
+            stats.db_seconds += seconds
+        log_slow_query(sql, seconds, stats.view_name if stats is not None else None)
+
+
+def instrument_connection(sender, connection, **kwargs):
+    """
+    connection_created handler: install db_execute_wrapper on new connections.
+
+    The wrapper reads the request from a context variable, so queries run
+    through sync_to_async by async views are still attributed correctly.
+    """
+    if db_execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(db_execute_wrapper)
+
+
+# =============================================================================
+# SERVER-TIMING HEADER
+# =============================================================================
+
+def _timing_metric(name, seconds, description=None):
+    metric = f'{name};dur={seconds * 1000:.1f}'
+    if description:
+        metric += f';desc="{description}"'
+    return metric
+
+
+def server_timing(stats, total_seconds):
+    """Server-Timing header value for a finished request"""
+    queries = 'query' if stats.db_queries == 1 else 'queries'
+    metrics = [_timing_metric('db', stats.db_seconds, f'{stats.db_queries} {queries}')]
+    for service, (count, seconds) in stats.external.items():
+        metrics.append(_timing_metric(f'ext-{service}', seconds, f'{count} call{"" if count == 1 else "s"}'))
+    for phase, seconds in stats.phases.items():
+        metrics.append(_timing_metric(phase, seconds))
+    metrics.append(_timing_metric('total', total_seconds))
+    return ', '.join(metrics)
+
+
+class ServerTimingMiddleware:
+    """
+    Adds a Server-Timing header (database, external calls, tracked phases
+    and total) to every response when SERVER_TIMING_ENABLED is set.
+
+    Browser dev tools show the breakdown in the network panel.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.SERVER_TIMING_ENABLED:
+            return self.get_response(request)
+
+        stats, token = begin_request(request)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request(token)
+        response['Server-Timing'] = server_timing(stats, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.SERVER_TIMING_ENABLED:
+            return await self.get_response(request)
+
+        stats, token = begin_request(request)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_request(token)
+        response['Server-Timing'] = server_timing(stats, time.perf_counter() - start)
+        return response
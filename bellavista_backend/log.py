@@ -0,0 +1,153 @@
+# Structured Logging for Bellavista Care Homes Backend
+# JSON log lines written by a background thread, tagged with request ids
+
+import json
+import logging
+import os
+import queue
+import re
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+# Correlation id of the request being handled in this context
+_correlation_id = ContextVar('correlation_id', default=None)
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+# Incoming ids are reused only if they look like ids (no log injection)
+REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]{1,64}\Z')
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName', 'correlation_id'}
+
+_base_record_factory = logging.getLogRecordFactory()
+
+
+def _record_factory(*args, **kwargs):
+    """Stamp every record with the request's id when it is created"""
+    record = _base_record_factory(*args, **kwargs)
+    record.correlation_id = _correlation_id.get()
+    return record
+
+
+logging.setLogRecordFactory(_record_factory)
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    One JSON object per line: time, level, logger, message, the request's
+    correlation id, any `extra` fields and the formatted exception.
+    """
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if getattr(record, 'correlation_id', None):
+            entry['correlation_id'] = record.correlation_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class BackgroundQueueHandler(QueueHandler):
+    """
+    Formats records on the calling thread and queues them for a writer thread.
+
+    The queue is unbounded, so logging never waits on stdout or a slow log
+    pipe. Each process (gunicorn worker) starts its own writer on first use.
+    """
+
+    def __init__(self, stream=None):
+        super().__init__(queue.SimpleQueue())
+        self.target = logging.StreamHandler(stream or sys.stdout)
+        self.target.setFormatter(logging.Formatter('%(message)s'))
+        self.listener = None
+        self._pid = None
+
+    def _start_listener(self):
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+        self._pid = os.getpid()
+
+    def enqueue(self, record):
+        if self._pid != os.getpid():
+            self._start_listener()  # first record, or first one after a fork
+        super().enqueue(record)
+
+    def flush(self):
+        """Wait until every queued record has been written"""
+        if self.listener is not None and self._pid == os.getpid():
+            self.listener.stop()
+            self._start_listener()
+
+    def close(self):
+        if self.listener is not None and self._pid == os.getpid():
+            self.listener.stop()
+            self.listener = None
+        super().close()
+
+
+def parse_log_levels(value):
+    """'tours=DEBUG,django.db.backends=WARNING' -> {'tours': 'DEBUG', ...}"""
+    levels = {}
+    for part in value.split(','):
+        name, _, level = part.strip().partition('=')
+        if name and level:
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+class CorrelationIdMiddleware:
+    """
+    Gives every request a correlation id for its log lines.
+
+    Reuses a well-formed X-Request-ID from the client or proxy, otherwise
+    generates one, and echoes it in the response. Place it first in
+    MIDDLEWARE so every log line of the request carries it.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def request_id(request):
+        incoming = request.headers.get(REQUEST_ID_HEADER, '')
+        return incoming if REQUEST_ID_PATTERN.match(incoming) else uuid.uuid4().hex
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request_id = self.request_id(request)
+        token = _correlation_id.set(request_id)
+        try:
+            response = self.get_response(request)
+        finally:
+            _correlation_id.reset(token)
+        response[REQUEST_ID_HEADER] = request_id
+        return response
+
+    async def __acall__(self, request):
+        request_id = self.request_id(request)
+        token = _correlation_id.set(request_id)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _correlation_id.reset(token)
+        response[REQUEST_ID_HEADER] = request_id
+        return response
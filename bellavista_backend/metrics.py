@@ -0,0 +1,320 @@
+# Metrics for Bellavista Care Homes Backend
+# Prometheus text-format metrics aggregated across gunicorn workers
+
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+
+from .instrumentation import add_external_call_listener, begin_request, current_stats, end_request
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# name -> (type, help text, histogram buckets)
+METRICS = {
+    'bellavista_http_requests_total': (
+        'counter', 'HTTP requests by view, method and status code', None),
+    'bellavista_http_request_duration_seconds': (
+        'histogram', 'Time to produce a response, by view', LATENCY_BUCKETS),
+    'bellavista_http_response_size_bytes': (
+        'histogram', 'Response body size, by view (streaming responses excluded)', SIZE_BUCKETS),
+    'bellavista_http_request_db_queries': (
+        'histogram', 'Database queries per request, by view', QUERY_COUNT_BUCKETS),
+    'bellavista_http_request_db_seconds': (
+        'histogram', 'Database time per request, by view', LATENCY_BUCKETS),
+    'bellavista_external_call_duration_seconds': (
+        'histogram', 'Calls to external services (Nominatim, SendGrid), by view and outcome', LATENCY_BUCKETS),
+}
+
+
+class MetricsRegistry:
+    """
+    Counters and histograms for one process.
+
+    Samples are keyed by (metric name, label pairs). Histograms hold
+    per-bucket counts (not cumulative) followed by the sum and count, so
+    snapshots from several processes can be merged by adding them up.
+    """
+
+    def __init__(self):
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, labels, value=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._samples[key] = self._samples.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            sample = self._samples.get(key)
+            if sample is None:
+                sample = self._samples[key] = [0] * (len(buckets) + 1) + [0.0, 0]
+            sample[bisect_left(buckets, value)] += 1
+            sample[-2] += value
+            sample[-1] += 1
+
+    def snapshot(self):
+        """JSON-serialisable copy of every sample"""
+        with self._lock:
+            return [
+                [name, list(labels), list(value) if isinstance(value, list) else value]
+                for (name, labels), value in self._samples.items()
+            ]
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+
+registry = MetricsRegistry()
+
+
+def view_label(request):
+    """URL name of the view that handled a request, or 'unmatched'"""
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else 'unmatched'
+
+
+def record_external_call(service, seconds, ok):
+    """instrumentation listener: one external call finished"""
+    stats = current_stats()
+    registry.observe('bellavista_external_call_duration_seconds', {
+        'service': service,
+        # 'none' outside requests, e.g. management commands
+        'view': view_label(stats.request) if stats is not None else 'none',
+        'outcome': 'ok' if ok else 'error',
+    }, seconds)
+
+
+add_external_call_listener(record_external_call)
+
+
+# =============================================================================
+# MULTI-PROCESS AGGREGATION
+# =============================================================================
+
+_flush_lock = threading.Lock()
+_start_lock = threading.Lock()
+_flusher_pid = None
+# Set by every recorded request, cleared by the flusher before it writes
+_dirty = False
+
+
+def _snapshot_path(pid):
+    return os.path.join(settings.METRICS_DIR, f'metrics-{pid}.json')
+
+
+def flush():
+    """
+    Write this process's snapshot to METRICS_DIR for other workers to read.
+
+    Files of exited workers are kept so their counts are not lost.
+    """
+    if not settings.METRICS_DIR:
+        return
+
+    with _flush_lock:
+        os.makedirs(settings.METRICS_DIR, exist_ok=True)
+        path = _snapshot_path(os.getpid())
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(registry.snapshot(), f)
+        os.replace(tmp_path, path)
+
+
+def _flush_periodically():
+    global _dirty
+    while True:
+        time.sleep(settings.METRICS_FLUSH_INTERVAL)
+        if not _dirty:
+            continue
+        _dirty = False
+        try:
+            flush()
+        except OSError:
+            logger.warning('Could not write the metrics snapshot', exc_info=True)
+
+
+def _start_flusher():
+    """
+    Start this process's background flusher, once per worker.
+
+    Requests only update the registry; the flusher writes the snapshot at
+    most once per METRICS_FLUSH_INTERVAL, and only after new requests, so
+    file I/O and the flush lock stay off the request path (and the ASGI
+    event loop). The pid check restarts it in a forked worker.
+    """
+    global _flusher_pid
+    with _start_lock:
+        if _flusher_pid == os.getpid():
+            return
+        threading.Thread(target=_flush_periodically, name='metrics-flusher', daemon=True).start()
+        _flusher_pid = os.getpid()
+
+
+def schedule_flush():
+    """Mark new samples for the background flusher (starting it if needed)"""
+    global _dirty
+    _dirty = True
+    if _flusher_pid != os.getpid():
+        _start_flusher()
+
+
+def collect():
+    """Merge the snapshots of every worker into one dict of samples"""
+    snapshots = [registry.snapshot()]
+    if settings.METRICS_DIR:
+        own_path = _snapshot_path(os.getpid())
+        for path in glob.glob(os.path.join(settings.METRICS_DIR, 'metrics-*.json')):
+            if path == own_path:
+                continue  # the live registry is more recent
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue  # being replaced or corrupt - skip this scrape
+
+    merged = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot:
+            if name not in METRICS:
+                continue
+            key = (name, tuple(tuple(pair) for pair in labels))
+            if key not in merged:
+                merged[key] = list(value) if isinstance(value, list) else value
+            elif isinstance(value, list):
+                merged[key] = [a + b for a, b in zip(merged[key], value)]
+            else:
+                merged[key] += value
+    return merged
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def render(merged):
+    """Render merged samples in the Prometheus text exposition format"""
+    lines = []
+    for name, (metric_type, help_text, buckets) in METRICS.items():
+        samples = sorted((labels, value) for (sample_name, labels), value in merged.items() if sample_name == name)
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        for labels, value in samples:
+            if metric_type == 'counter':
+                lines.append(f'{name}{_format_labels(labels)} {value}')
+                continue
+            cumulative = 0
+            for bound, count in zip(list(buckets) + ['+Inf'], value):
+                cumulative += count
+                lines.append(f'{name}_bucket{_format_labels(labels, [("le", bound)])} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {value[-2]}')
+            lines.append(f'{name}_count{_format_labels(labels)} {value[-1]}')
+    return '\n'.join(lines) + '\n'
+
+
+# =============================================================================
+# MIDDLEWARE AND ENDPOINT
+# =============================================================================
+
+class MetricsMiddleware:
+    """
+    Records request count, latency, response size and database usage per
+    URL name (e.g. 'tours:available_slots').
+
+    Place it first in MIDDLEWARE so the latency covers the whole stack.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        stats, token = begin_request(request)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request(token)
+        self.record(request, response, stats, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+
+        stats, token = begin_request(request)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_request(token)
+        self.record(request, response, stats, time.perf_counter() - start)
+        return response
+
+    def record(self, request, response, stats, seconds):
+        view = view_label(request)
+        labels = {'view': view}
+
+        registry.inc('bellavista_http_requests_total', {
+            'view': view,
+            'method': request.method,
+            'status': str(response.status_code),
+        })
+        registry.observe('bellavista_http_request_duration_seconds', labels, seconds)
+        registry.observe('bellavista_http_request_db_queries', labels, stats.db_queries)
+        registry.observe('bellavista_http_request_db_seconds', labels, stats.db_seconds)
+        if not response.streaming:
+            registry.observe('bellavista_http_response_size_bytes', labels, len(response.content))
+        schedule_flush()
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint: every worker's metrics, merged.
+
+    Scrapers must send METRICS_TOKEN as a bearer token. Without a token
+    the endpoint is only open with DEBUG on, so a production deployment
+    never exposes its traffic and timings by accident.
+    """
+    if not settings.METRICS_ENABLED:
+        raise Http404('Metrics are disabled')
+
+    token = settings.METRICS_TOKEN
+    if not token and not settings.DEBUG:
+        return HttpResponseForbidden('Set METRICS_TOKEN to scrape metrics\n', content_type='text/plain')
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return HttpResponseForbidden('Forbidden\n', content_type='text/plain')
+
+    flush()
+    return HttpResponse(render(collect()), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,285 @@
+# Request Profiling for Bellavista Care Homes Backend
+# Opt-in cProfile and tracemalloc captures of single requests, for staff
+
+import cProfile
+import json
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timezone
+
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import FileResponse, Http404, JsonResponse
+from django.urls import reverse
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_QUERY_PARAM = 'profile'
+PROFILE_ID_PATTERN = re.compile(r'^[0-9]{8}T[0-9]{6}-[0-9a-f]{8}$')
+
+# file suffix -> content type of a stored capture
+CAPTURE_FILES = {
+    'prof': 'application/octet-stream',         # pstats.Stats(path)
+    'tracemalloc': 'application/octet-stream',  # tracemalloc.Snapshot.load(path)
+    'json': 'application/json',                 # request details
+}
+
+TRACEMALLOC_FRAMES = 10
+
+# cProfile and tracemalloc are process-wide, so only one request is
+# profiled at a time; others asking meanwhile run normally
+_profiling_lock = threading.Lock()
+
+
+def wants_profile(request):
+    """Cheap check for the opt-in flag, before any user lookup"""
+    return request.headers.get(PROFILE_HEADER) == '1' or request.GET.get(PROFILE_QUERY_PARAM) == '1'
+
+
+def _is_staff(request):
+    user = getattr(request, 'user', None)
+    return bool(user is not None and user.is_active and user.is_staff)
+
+
+def should_profile(request):
+    """Opted in, sent by staff and picked by PROFILING_SAMPLE_RATE"""
+    return (
+        settings.PROFILING_ENABLED
+        and wants_profile(request)
+        and _is_staff(request)
+        and random.random() < settings.PROFILING_SAMPLE_RATE
+    )
+
+
+class Capture:
+    """
+    cProfile plus tracemalloc around one request.
+
+    cProfile only records the thread that enabled it, so work the request
+    hands to another thread (a sync view under ASGI) is profiled with
+    profile_thread() and merged in by stats().
+    """
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+        self.thread_profilers = []
+        self.started_tracemalloc = False
+        self.start = None
+        self.seconds = None
+        self.snapshot = None
+
+    def __enter__(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self.started_tracemalloc = True
+        self.start = time.perf_counter()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.disable()
+        self.seconds = time.perf_counter() - self.start
+        self.snapshot = tracemalloc.take_snapshot()
+        if self.started_tracemalloc:
+            tracemalloc.stop()
+
+    @contextmanager
+    def profile_thread(self):
+        """Profile the calling thread as part of this capture"""
+        profiler = cProfile.Profile()
+        self.thread_profilers.append(profiler)
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+
+    def stats(self):
+        """pstats.Stats of every profiled thread"""
+        stats = pstats.Stats(self.profiler)
+        for profiler in self.thread_profilers:
+            stats.add(profiler)
+        return stats
+
+
+def store_capture(request, response, capture):
+    """
+    Write a capture to PROFILING_DIR and prune the oldest ones.
+
+    Returns:
+        str: The profile id
+    """
+    profile_id = f'{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}'
+    os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+    base = os.path.join(settings.PROFILING_DIR, profile_id)
+
+    capture.stats().dump_stats(f'{base}.prof')
+    capture.snapshot.dump(f'{base}.tracemalloc')
+    match = getattr(request, 'resolver_match', None)
+    with open(f'{base}.json', 'w') as f:
+        json.dump({
+            'id': profile_id,
+            'method': request.method,
+            'path': request.get_full_path(),
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'duration_ms': round(capture.seconds * 1000, 1),
+            'user': request.user.get_username(),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+        }, f)
+
+    prune_captures(settings.PROFILING_MAX_CAPTURES)
+    return profile_id
+
+
+def list_captures():
+    """Request details of every stored capture, newest first"""
+    captures = []
+    if not os.path.isdir(settings.PROFILING_DIR):
+        return captures
+    for name in sorted(os.listdir(settings.PROFILING_DIR), reverse=True):
+        if name.endswith('.json'):
+            try:
+                with open(os.path.join(settings.PROFILING_DIR, name)) as f:
+                    captures.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+    return captures
+
+
+def prune_captures(keep):
+    """Delete all but the `keep` newest captures"""
+    for capture in list_captures()[keep:]:
+        for suffix in CAPTURE_FILES:
+            try:
+                os.remove(os.path.join(settings.PROFILING_DIR, f"{capture['id']}.{suffix}"))
+            except FileNotFoundError:
+                pass
+
+
+def _add_profile_headers(response, profile_id):
+    response['X-Profile-Id'] = profile_id
+    response['X-Profile-Url'] = reverse('profile_download', args=[profile_id, 'prof'])
+
+
+# =============================================================================
+# MIDDLEWARE AND DOWNLOADS
+# =============================================================================
+
+class ProfilingMiddleware:
+    """
+    Profiles requests from staff that send "X-Profile: 1" or ?profile=1.
+
+    The request runs under cProfile with tracemalloc tracing, and the
+    profile, an allocation snapshot and the request details are stored
+    for download from /profiles/ (the response's X-Profile-Url). Covers
+    every view, including the admin. Place it after
+    AuthenticationMiddleware.
+
+    With PROFILING_ENABLED off, or no opt-in flag, a request costs a
+    settings lookup and a header check. Under ASGI, sync views run in a
+    worker thread, so process_view() runs them under a profiler of their
+    own; the event loop part of the profile may include concurrent
+    requests on the same worker.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not should_profile(request) or not _profiling_lock.acquire(blocking=False):
+            return self.get_response(request)
+
+        try:
+            with Capture() as capture:
+                response = self.get_response(request)
+            _add_profile_headers(response, store_capture(request, response, capture))
+        finally:
+            _profiling_lock.release()
+        return response
+
+    async def __acall__(self, request):
+        if not (settings.PROFILING_ENABLED and wants_profile(request)):
+            return await self.get_response(request)
+        # request.user is loaded lazily from the session, which needs a thread
+        if not await sync_to_async(should_profile)(request) or not _profiling_lock.acquire(blocking=False):
+            return await self.get_response(request)
+
+        try:
+            with Capture() as capture:
+                request._profile_capture = capture
+                response = await self.get_response(request)
+            profile_id = await sync_to_async(store_capture)(request, response, capture)
+            _add_profile_headers(response, profile_id)
+        finally:
+            _profiling_lock.release()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """
+        Under ASGI, run a profiled sync view in its own thread's profiler.
+
+        Django calls this sync hook in the thread the view would run in,
+        and skips calling the view when a response is returned. Rendering
+        (DRF serialization, admin templates) happens here too so it is
+        included.
+        """
+        capture = getattr(request, '_profile_capture', None)
+        if capture is None or iscoroutinefunction(view_func):
+            return None
+        with capture.profile_thread():
+            response = view_func(request, *view_args, **view_kwargs)
+            if callable(getattr(response, 'render', None)):
+                response = response.render()
+        return response
+
+
+def _require_enabled():
+    if not settings.PROFILING_ENABLED:
+        raise Http404('Profiling is disabled')
+
+
+@staff_member_required
+def profile_list(request):
+    """Stored captures, newest first, with their download URLs"""
+    _require_enabled()
+    captures = list_captures()
+    for capture in captures:
+        capture['downloads'] = {
+            suffix: reverse('profile_download', args=[capture['id'], suffix]) for suffix in CAPTURE_FILES
+        }
+    return JsonResponse({'profiles': captures})
+
+
+@staff_member_required
+def profile_download(request, profile_id, kind):
+    """
+    Download one capture file.
+
+    kind 'prof' loads with pstats.Stats (or snakeviz), 'tracemalloc' with
+    tracemalloc.Snapshot.load, 'json' is the request details.
+    """
+    _require_enabled()
+    if kind not in CAPTURE_FILES or not PROFILE_ID_PATTERN.match(profile_id):
+        raise Http404('Unknown profile')
+    path = os.path.join(settings.PROFILING_DIR, f'{profile_id}.{kind}')
+    if not os.path.exists(path):
+        raise Http404('Unknown profile')
+    return FileResponse(
+        open(path, 'rb'), as_attachment=True, filename=f'{profile_id}.{kind}', content_type=CAPTURE_FILES[kind]
+    )
@@ -0,0 +1,14 @@
+# Renderers for Bellavista Care Homes Backend
+# JSON rendering reported to the request instrumentation
+
+from rest_framework.renderers import JSONRenderer
+
+from .instrumentation import track
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """JSONRenderer that records its time as the request's 'serialize' phase"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with track('serialize'):
+            return super().render(data, accepted_media_type, renderer_context)
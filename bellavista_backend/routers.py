@@ -0,0 +1,175 @@
+# Database Routing for Bellavista Care Homes Backend
+# Sends reporting reads to a read replica while keeping writes on the primary
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+# Alias of the read replica in settings.DATABASES
+REPLICA_ALIAS = 'replica'
+
+# Shared-cache key marking a client that wrote recently and must read from
+# the primary, per client address like the rate-limit buckets
+PIN_KEY = 'replica:pin:{ident}'
+
+# Writes that reporting views never read, so they do not pin the client
+# (session saves, the geocode log kept by location lookups)
+UNPINNED_MODELS = {'sessions.session', 'tours.geocodedlocation'}
+
+# True while a reporting view is running for a client that may use the replica
+_use_replica = ContextVar('use_replica', default=False)
+
+# Models written during the current request (set by ReplicaPinningMiddleware);
+# a shared set, so writes made in a sync_to_async thread are seen too
+_writes = ContextVar('writes', default=None)
+
+
+def replica_configured():
+    """Return True if a read replica database is configured"""
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+class ReplicaRouter:
+    """
+    Database router for reporting reads.
+
+    Reads go to the replica only inside replica_reads() (or a view decorated
+    with use_replica). Everything else, and every write, uses the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get():
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        writes = _writes.get()
+        if writes is not None and model._meta.label_lower not in UNPINNED_MODELS:
+            writes.add(model._meta.label_lower)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primary and replica hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
+
+
+@contextmanager
+def replica_reads(request):
+    """
+    Route reads in this block to the replica, unless the client wrote recently.
+
+    Clients pinned by ReplicaPinningMiddleware keep reading from the primary
+    so they always see their own bookings and status changes.
+    """
+    if not replica_configured() or getattr(request, 'pinned_to_primary', False):
+        yield
+        return
+
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def is_pinned_to_primary(request):
+    """Return True if the client wrote recently and its reads must use the primary"""
+    return replica_configured() and getattr(request, 'pinned_to_primary', False)
+
+
+def use_replica(view_func):
+    """Decorator for reporting views whose reads may be served by the replica"""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        with replica_reads(request):
+            return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+class ReplicaPinningMiddleware:
+    """
+    Read-your-writes stickiness for the replica.
+
+    After a request that wrote data, the client's address is pinned in the
+    shared cache for REPLICA_STICKINESS_SECONDS; meanwhile that client's
+    reporting reads stay on the primary until the replica has caught up.
+    The pin lives server side, so it works for the cross-origin frontend,
+    which sends no cookies. Writes are seen by the router, so read-only
+    POSTs (the batch lookup) do not pin. If the cache fails, clients are
+    not pinned.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def pin_key(self, request):
+        return PIN_KEY.format(ident=BaseThrottle().get_ident(request))
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not replica_configured():
+            request.pinned_to_primary = False
+            return self.get_response(request)
+
+        key = self.pin_key(request)
+        try:
+            request.pinned_to_primary = cache.get(key) is not None
+        except Exception:
+            logger.warning('Replica pin check failed - reading from the replica', exc_info=True)
+            request.pinned_to_primary = False
+        writes = set()
+        token = _writes.set(writes)
+        try:
+            response = self.get_response(request)
+        finally:
+            _writes.reset(token)
+        if self.should_pin(response, writes):
+            try:
+                cache.set(key, 1, settings.REPLICA_STICKINESS_SECONDS)
+            except Exception:
+                logger.warning('Replica pin failed', exc_info=True)
+        return response
+
+    async def __acall__(self, request):
+        if not replica_configured():
+            request.pinned_to_primary = False
+            return await self.get_response(request)
+
+        key = self.pin_key(request)
+        try:
+            request.pinned_to_primary = await cache.aget(key) is not None
+        except Exception:
+            logger.warning('Replica pin check failed - reading from the replica', exc_info=True)
+            request.pinned_to_primary = False
+        writes = set()
+        token = _writes.set(writes)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _writes.reset(token)
+        if self.should_pin(response, writes):
+            try:
+                await cache.aset(key, 1, settings.REPLICA_STICKINESS_SECONDS)
+            except Exception:
+                logger.warning('Replica pin failed', exc_info=True)
+        return response
+
+    def should_pin(self, response, writes):
+        return bool(writes) and response.status_code < 400
@@ -1,8 +1,12 @@
 # Django Settings for Bellavista Care Homes Backend
 
+import sys
 from pathlib import Path
 from decouple import config
 
+from .db import parse_database_url, postgres_available
+from .log import parse_log_levels
+
 # =============================================================================
 # BASIC CONFIGURATION
 # =============================================================================
@@ -51,13 +55,18 @@ INSTALLED_APPS = [
 # =============================================================================
 
 MIDDLEWARE = [
+    'bellavista_backend.log.CorrelationIdMiddleware',
+    'bellavista_backend.metrics.MetricsMiddleware',
+    'bellavista_backend.instrumentation.ServerTimingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'bellavista_backend.middleware.AsyncWhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'bellavista_backend.routers.ReplicaPinningMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'bellavista_backend.profiling.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -88,23 +97,80 @@ TEMPLATES = [
 
 # WSGI application
 WSGI_APPLICATION = 'bellavista_backend.wsgi.application'
+ASGI_APPLICATION = 'bellavista_backend.asgi.application'
 
 # =============================================================================
 # DATABASE CONFIGURATION
 # =============================================================================
 
+# Seconds to keep a database connection open between requests. Keep it 0
+# under ASGI (the gunicorn + UvicornWorker deployment): sync views and
+# sync_to_async calls run in executor threads, each with its own persistent
+# connection that nothing reuses or closes, so one worker can hold hundreds.
+# Pool with PgBouncer in front of Postgres instead.
+CONN_MAX_AGE = config('CONN_MAX_AGE', default=0, cast=int)
+
 # Database configuration
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
         'OPTIONS': {
-            'timeout': 20,
+            # Seconds a connection waits for a lock before "database is locked"
+            'timeout': config('SQLITE_BUSY_TIMEOUT', default=20, cast=int),
         },
-        'CONN_MAX_AGE': 600,  # Connection pooling
+        'CONN_MAX_AGE': CONN_MAX_AGE,
     }
 }
 
+# Use PostgreSQL (or another SQLite file) when DATABASE_URL is set
+DATABASE_URL = config('DATABASE_URL', default='')
+if DATABASE_URL:
+    DATABASES['default'] = parse_database_url(DATABASE_URL, conn_max_age=CONN_MAX_AGE)
+
+# Tests run against TEST_DATABASE_URL when that Postgres server is reachable,
+# falling back to SQLite otherwise
+RUNNING_TESTS = len(sys.argv) > 1 and sys.argv[1] == 'test'
+TEST_DATABASE_URL = config('TEST_DATABASE_URL', default='')
+if TEST_DATABASE_URL and RUNNING_TESTS:
+    test_database = parse_database_url(TEST_DATABASE_URL)
+    if test_database['ENGINE'] != 'django.db.backends.postgresql' or postgres_available(test_database):
+        DATABASES['default'] = test_database
+
+# Optional read replica for reporting endpoints (export, stats, booking list).
+# A second SQLite file works as a local stand-in for a Postgres replica.
+# Tests always run against a single database.
+DATABASE_REPLICA_URL = config('DATABASE_REPLICA_URL', default='')
+if DATABASE_REPLICA_URL and not RUNNING_TESTS:
+    DATABASES['replica'] = parse_database_url(DATABASE_REPLICA_URL, conn_max_age=CONN_MAX_AGE)
+
+DATABASE_ROUTERS = ['bellavista_backend.routers.ReplicaRouter']
+
+# Seconds a client keeps reading from the primary after it writes
+REPLICA_STICKINESS_SECONDS = config('REPLICA_STICKINESS_SECONDS', default=15, cast=int)
+
+# Behind a transaction-pooling PgBouncer, server-side cursors must be disabled
+for database in DATABASES.values():
+    database['DISABLE_SERVER_SIDE_CURSORS'] = config('DATABASE_DISABLE_SERVER_SIDE_CURSORS', default=False, cast=bool)
+
+# Rows fetched per round trip when bulk readers stream with .iterator()
+DATABASE_ITERATOR_CHUNK_SIZE = config('DATABASE_ITERATOR_CHUNK_SIZE', default=2000, cast=int)
+
+# PRAGMAs applied to every new SQLite connection (bellavista_backend/db.py)
+SQLITE_PRAGMAS = {
+    # WAL lets readers proceed while a writer holds the lock
+    'journal_mode': config('SQLITE_JOURNAL_MODE', default='WAL'),
+    # NORMAL is safe with WAL and avoids an fsync on every commit
+    'synchronous': config('SQLITE_SYNCHRONOUS', default='NORMAL'),
+    # Memory-mapped I/O for reads (bytes, default 128MB)
+    'mmap_size': config('SQLITE_MMAP_SIZE', default=134217728, cast=int),
+    # Page cache size (negative values are KiB, default 32MB)
+    'cache_size': config('SQLITE_CACHE_SIZE', default=-32768, cast=int),
+    # Milliseconds to retry on a busy database, matching the timeout above
+    'busy_timeout': config('SQLITE_BUSY_TIMEOUT', default=20, cast=int) * 1000,
+    'temp_store': 'MEMORY',
+}
+
 # =============================================================================
 # PASSWORD VALIDATION
 # =============================================================================
@@ -156,34 +222,74 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'bellavista_backend.renderers.TimedJSONRenderer',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 50,
+    # Proxies in front of the app (the client IP is taken from X-Forwarded-For
+    # before them); 0 uses the connecting address
+    'NUM_PROXIES': config('NUM_PROXIES', default=0 if DEBUG else 1, cast=int),
+}
+
+# Token-bucket rate limits per client IP and endpoint (tours.throttling),
+# kept in the shared cache so they hold across workers
+RATE_LIMIT_ENABLED = config('RATE_LIMIT_ENABLED', default=not RUNNING_TESTS, cast=bool)
+THROTTLE_RATES = {
+    # /api/tours/book/
+    'booking': config('BOOKING_RATE_LIMIT', default='5/min'),
+    # find-nearest-home endpoints (Nominatim lookups); a batch takes one
+    # token per address not yet in the geocode cache
+    'geocoding': config('GEOCODING_RATE_LIMIT', default='30/min'),
 }
 
 # =============================================================================
 # CACHING CONFIGURATION
 # =============================================================================
 
-CACHES = {
-    'default': {
+# Shared by every worker: Redis when REDIS_URL is set, otherwise a local
+# SQLite file. Tests use an isolated in-memory cache unless CACHE_BACKEND is set.
+REDIS_URL = config('REDIS_URL', default='')
+CACHE_BACKEND = config(
+    'CACHE_BACKEND',
+    default='locmem' if RUNNING_TESTS else ('redis' if REDIS_URL else 'sqlite')
+)
+CACHE_LOCATION = config('CACHE_LOCATION', default=str(BASE_DIR / 'cache.sqlite3'))
+
+if CACHE_BACKEND == 'redis':
+    default_cache = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    }
+elif CACHE_BACKEND == 'sqlite':
+    default_cache = {
+        'BACKEND': 'bellavista_backend.cache.SQLiteCache',
+        'LOCATION': CACHE_LOCATION,
+    }
+else:
+    default_cache = {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
         'LOCATION': 'unique-snowflake',
-        'TIMEOUT': 300,  # 5 minutes
         'OPTIONS': {
             'MAX_ENTRIES': 1000,
         }
     }
+
+CACHES = {
+    'default': {
+        **default_cache,
+        'KEY_PREFIX': 'bellavista',
+        'TIMEOUT': 300,  # 5 minutes
+    }
 }
 
-# Cache middleware for faster responses
-if not DEBUG:
-    MIDDLEWARE.insert(1, 'django.middleware.cache.UpdateCacheMiddleware')
-    MIDDLEWARE.append('django.middleware.cache.FetchFromCacheMiddleware')
-    CACHE_MIDDLEWARE_ALIAS = 'default'
-    CACHE_MIDDLEWARE_SECONDS = 300
-    CACHE_MIDDLEWARE_KEY_PREFIX = 'bellavista'
+# Read-only endpoints opt in to caching with tours.cache.cache_policy;
+# tests exercise views uncached unless they enable it explicitly
+VIEW_CACHE_ENABLED = config('VIEW_CACHE_ENABLED', default=not RUNNING_TESTS, cast=bool)
+
+# Cache warm-up (manage.py warm_caches, or on worker start when enabled)
+WARM_CACHES_ON_START = config('WARM_CACHES_ON_START', default=False, cast=bool)
+WARM_CACHE_DAYS = config('WARM_CACHE_DAYS', default=14, cast=int)
+WARM_GEOCODE_LIMIT = config('WARM_GEOCODE_LIMIT', default=200, cast=int)
 
 # =============================================================================
 # PERFORMANCE SETTINGS
@@ -197,6 +303,105 @@ DATA_UPLOAD_MAX_MEMORY_SIZE = 2621440   # 2.5MB
 SESSION_COOKIE_AGE = 1209600  # 2 weeks
 SESSION_SAVE_EVERY_REQUEST = False
 
+# /readyz re-runs its database, migration and cache checks at most this often per worker
+READINESS_CACHE_SECONDS = config('READINESS_CACHE_SECONDS', default=5.0, cast=float)
+
+# =============================================================================
+# METRICS CONFIGURATION
+# =============================================================================
+
+# Prometheus-format metrics at /metrics
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+# Directory where each worker writes its metrics for /metrics to merge
+# (gunicorn.conf.py sets a fresh one per server start)
+METRICS_DIR = config('METRICS_DIR', default='')
+# Seconds between a worker's metric snapshots
+METRICS_FLUSH_INTERVAL = config('METRICS_FLUSH_INTERVAL', default=1.0, cast=float)
+# Bearer token required to scrape /metrics; without one, /metrics is only
+# served with DEBUG on
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Server-Timing header (DB, external calls, serialization) on every response;
+# it exposes internal timings, so keep it off on public deployments
+SERVER_TIMING_ENABLED = config('SERVER_TIMING_ENABLED', default=DEBUG, cast=bool)
+
+# Queries slower than this are logged to 'bellavista.slow_queries' with the
+# view that ran them (empty disables); the sample rate caps log volume
+SLOW_QUERY_THRESHOLD_MS = config(
+    'SLOW_QUERY_THRESHOLD_MS', default='200', cast=lambda value: float(value) if value else None
+)
+SLOW_QUERY_SAMPLE_RATE = config('SLOW_QUERY_SAMPLE_RATE', default=1.0, cast=float)
+
+# Staff can profile a request with "X-Profile: 1" or ?profile=1; captures are
+# downloaded from /profiles/ and only the newest PROFILING_MAX_CAPTURES are kept
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=False, cast=bool)
+PROFILING_DIR = config('PROFILING_DIR', default=str(BASE_DIR / 'profiles'))
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=1.0, cast=float)
+PROFILING_MAX_CAPTURES = config('PROFILING_MAX_CAPTURES', default=50, cast=int)
+
+# =============================================================================
+# LOGGING CONFIGURATION
+# =============================================================================
+
+# JSON lines on stdout, written by a background thread so requests never
+# wait on log I/O. LOG_LEVEL sets the default; LOG_LEVELS overrides single
+# loggers, e.g. LOG_LEVELS=tours=DEBUG,bellavista.slow_queries=ERROR
+LOG_LEVEL = config('LOG_LEVEL', default='WARNING' if RUNNING_TESTS else 'INFO').upper()
+LOG_LEVELS = config('LOG_LEVELS', default='', cast=parse_log_levels)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {
+            '()': 'bellavista_backend.log.JSONFormatter',
+        },
+    },
+    'handlers': {
+        'queue': {
+            'class': 'bellavista_backend.log.BackgroundQueueHandler',
+            'formatter': 'json',
+        },
+    },
+    'root': {
+        'handlers': ['queue'],
+        'level': LOG_LEVEL,
+    },
+    'loggers': {
+        # Replace Django's own console handler so its records go through the queue too
+        'django': {
+            'handlers': ['queue'],
+            'level': LOG_LEVEL,
+            'propagate': False,
+        },
+    },
+}
+for logger_name, level in LOG_LEVELS.items():
+    LOGGING['loggers'].setdefault(logger_name, {})['level'] = level
+
+# =============================================================================
+# GEOCODING CONFIGURATION
+# =============================================================================
+
+# Nominatim search endpoint (override to point at a mirror or a test stub)
+GEOCODING_URL = config('GEOCODING_URL', default='https://nominatim.openstreetmap.org/search')
+# Nominatim usage policy allows at most one request per second
+GEOCODING_REQUESTS_PER_SECOND = config('GEOCODING_REQUESTS_PER_SECOND', default=1.0, cast=float)
+# Longest a request may queue for a rate-limit slot before failing
+GEOCODING_MAX_QUEUE_WAIT = config('GEOCODING_MAX_QUEUE_WAIT', default=2.0, cast=float)
+# Per-request timeout for Nominatim calls (seconds)
+GEOCODING_TIMEOUT = config('GEOCODING_TIMEOUT', default=5.0, cast=float)
+# Consecutive failures before the circuit opens, and how long it stays open
+GEOCODING_BREAKER_THRESHOLD = config('GEOCODING_BREAKER_THRESHOLD', default=5, cast=int)
+GEOCODING_BREAKER_COOLDOWN = config('GEOCODING_BREAKER_COOLDOWN', default=30.0, cast=float)
+# Maximum open connections to the geocoder per process
+GEOCODING_POOL_SIZE = config('GEOCODING_POOL_SIZE', default=10, cast=int)
+# How long geocoded locations stay in the shared cache (seconds)
+GEOCODING_CACHE_SECONDS = config('GEOCODING_CACHE_SECONDS', default=86400, cast=int)
+
+# Precomputed outcode-to-home travel times (see manage.py build_travel_matrix)
+TRAVEL_TIME_MATRIX_PATH = config('TRAVEL_TIME_MATRIX_PATH', default=str(BASE_DIR / 'tours' / 'data' / 'travel_times.bin'))
+
 # =============================================================================
 # CORS CONFIGURATION
 # =============================================================================
@@ -227,6 +432,9 @@ EMAIL_TIMEOUT = 10  # Timeout for email sending
 # Default sender email
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='Bellavista Care Homes <noreply@bellavista.com>')
 
+# SendGrid API base URL (override to point at a local sink for load tests)
+SENDGRID_API_HOST = config('SENDGRID_API_HOST', default='https://api.sendgrid.com')
+
 # Fallback to console backend if no email credentials
 if not EMAIL_HOST_USER and DEBUG:
     EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
@@ -239,6 +447,8 @@ if not DEBUG:
     # Force HTTPS in production
     SECURE_SSL_REDIRECT = True
     SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
+    # Platform health checks call the service directly over HTTP
+    SECURE_REDIRECT_EXEMPT = [r'^livez$', r'^readyz$']
     
     # HSTS (HTTP Strict Transport Security)
     SECURE_HSTS_SECONDS = 31536000
@@ -3,10 +3,25 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from .health import liveness_view, readiness_view
+from .metrics import metrics_view
+from .profiling import profile_download, profile_list
+
 urlpatterns = [
     # Django Admin Interface
     path('admin/', admin.site.urls),
     
+    # Health probes (liveness: no I/O, readiness: cached DB/migration/cache checks)
+    path('livez', liveness_view, name='liveness'),
+    path('readyz', readiness_view, name='readiness'),
+    
+    # Prometheus metrics for all workers
+    path('metrics', metrics_view, name='metrics'),
+    
+    # Staff request profiles (PROFILING_ENABLED)
+    path('profiles/', profile_list, name='profile_list'),
+    path('profiles/<str:profile_id>.<str:kind>', profile_download, name='profile_download'),
+    
     # API Endpoints
     path('api/tours/', include('tours.urls')),
 ]
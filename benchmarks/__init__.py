@@ -0,0 +1,2 @@
+# Benchmarks Package
+# Standalone performance benchmarks for the Bellavista Care Homes backend
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent request capacity of the WSGI and ASGI deployments
+
+Starts a stub Nominatim server that answers after a fixed delay, then runs
+the app once as a sync gunicorn worker (wsgi.py) and once as a uvicorn
+worker (asgi.py), firing concurrent find-nearest-home lookups for unique
+locations so every request waits on the slow upstream.
+
+Usage:
+    python benchmarks/bench_async_capacity.py [--delay 0.5] [--concurrency 50] [--requests 200]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Requests arrive as if through the TLS-terminating proxy of a production
+# deployment, which the server (DEBUG off) would otherwise redirect to HTTPS
+PROXY_HEADERS = {'X-Forwarded-Proto': 'https'}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_stub_geocoder(delay):
+    """Serve Nominatim-shaped responses after `delay` seconds"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            body = json.dumps([{'lat': '51.4816', 'lon': '-3.1791'}]).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', free_port()), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def server_env(geocoder_url, database_path):
+    env = dict(os.environ)
+    env.update({
+        # Measure production settings, not DEBUG's query log and error pages
+        'DEBUG': 'False',
+        'ALLOWED_HOSTS': '127.0.0.1,localhost',
+        'DATABASE_URL': f'sqlite:///{database_path}',
+        'CACHE_BACKEND': 'locmem',
+        'GEOCODING_URL': geocoder_url,
+        # Lift the Nominatim policy limits; the stub has no quota
+        'GEOCODING_REQUESTS_PER_SECOND': '100000',
+        'GEOCODING_MAX_QUEUE_WAIT': '60',
+        'GEOCODING_TIMEOUT': '60',
+        'GEOCODING_POOL_SIZE': '1000',
+        # Every request comes from one client address
+        'RATE_LIMIT_ENABLED': 'False',
+    })
+    return env
+
+
+def wait_until_ready(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f'http://127.0.0.1:{port}/api/tours/test/', headers=PROXY_HEADERS, timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f'Server on port {port} did not start')
+
+
+async def load(port, concurrency, total, label):
+    """Fire `total` requests with at most `concurrency` in flight"""
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=f'http://127.0.0.1:{port}', headers=PROXY_HEADERS,
+                                 timeout=120, limits=limits) as client:
+        async def one(i):
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get('/api/tours/find-nearest-home/', params={
+                    'location': f'{label} benchmark street {i}'
+                })
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - start
+
+    return elapsed, sorted(latencies), errors
+
+
+def run(label, command, env, port, concurrency, total):
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_ready(port)
+        elapsed, latencies, errors = asyncio.run(load(port, concurrency, total, label))
+    finally:
+        process.terminate()
+        process.wait()
+
+    p50 = statistics.median(latencies) * 1e3 if latencies else 0
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e3 if latencies else 0
+    print(
+        f"{label:<5} requests/s {total / elapsed:>7.1f}  p50 {p50:>8.0f}ms  "
+        f"p99 {p99:>8.0f}ms  errors {errors}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--delay', type=float, default=0.5, help='Stub geocoder latency in seconds')
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    stub = start_stub_geocoder(args.delay)
+    geocoder_url = f'http://127.0.0.1:{stub.server_address[1]}/search'
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        env = server_env(geocoder_url, os.path.join(tmpdir, 'bench.sqlite3'))
+        subprocess.run([sys.executable, 'manage.py', 'migrate', '-v', '0'], cwd=ROOT, env=env, check=True)
+
+        print(f'Stub geocoder latency {args.delay}s, {args.concurrency} concurrent clients, 1 worker process')
+        for label, worker_class in (('wsgi', 'sync'), ('asgi', 'uvicorn.workers.UvicornWorker')):
+            port = free_port()
+            app = f'bellavista_backend.{label}:application'
+            command = [
+                sys.executable, '-m', 'gunicorn', app,
+                '--workers', '1', '--worker-class', worker_class, '--bind', f'127.0.0.1:{port}',
+            ]
+            run(label, command, env, port, args.concurrency, args.requests)
+
+    stub.shutdown()
+
+
+if __name__ == '__main__':
+    main()
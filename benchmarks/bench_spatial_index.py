@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark nearest-home lookups: linear haversine scan vs spatial index
+
+Usage:
+    python benchmarks/bench_spatial_index.py
+"""
+
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bellavista_backend.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from tours.spatial_index import SphericalIndex  # noqa: E402
+from tours.views import haversine_distance  # noqa: E402
+
+SITE_COUNTS = [10, 1_000, 100_000]
+QUERY_COUNT = 200
+
+
+def linear_nearest(sites, lat, lon):
+    """The original find_nearest_home loop over every site"""
+    nearest = None
+    min_distance = float('inf')
+    for key, site_lat, site_lon in sites:
+        distance = haversine_distance(lat, lon, site_lat, site_lon)
+        if distance < min_distance:
+            min_distance = distance
+            nearest = key
+    return nearest
+
+
+def random_points(rng, count):
+    """Random points across Wales and England"""
+    return [(rng.uniform(50.0, 55.8), rng.uniform(-5.5, 1.7)) for _ in range(count)]
+
+
+def time_per_query(func, queries):
+    """Return mean seconds per query"""
+    start = time.perf_counter()
+    for lat, lon in queries:
+        func(lat, lon)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    rng = random.Random(2024)
+    queries = random_points(rng, QUERY_COUNT)
+
+    print(f"{'sites':>8} {'build':>10} {'linear':>12} {'index k=1':>12} {'index k=5':>12} {'speedup':>9}")
+    for count in SITE_COUNTS:
+        sites = [(f'site-{i}', lat, lon) for i, (lat, lon) in enumerate(random_points(rng, count))]
+
+        build_start = time.perf_counter()
+        index = SphericalIndex(sites)
+        build_time = time.perf_counter() - build_start
+
+        # Keep the linear scan affordable at 100k sites
+        linear_queries = queries[:20] if count > 10_000 else queries
+        linear = time_per_query(lambda lat, lon: linear_nearest(sites, lat, lon), linear_queries)
+        nearest_1 = time_per_query(lambda lat, lon: index.nearest(lat, lon, 1), queries)
+        nearest_5 = time_per_query(lambda lat, lon: index.nearest(lat, lon, 5), queries)
+
+        # Sanity check: both approaches agree
+        for lat, lon in queries[:20]:
+            assert index.nearest(lat, lon, 1)[0][0] == linear_nearest(sites, lat, lon)
+
+        print(
+            f"{count:>8} {build_time * 1e3:>8.1f}ms {linear * 1e6:>10.1f}us "
+            f"{nearest_1 * 1e6:>10.1f}us {nearest_5 * 1e6:>10.1f}us {linear / nearest_1:>8.1f}x"
+        )
+
+
+if __name__ == '__main__':
+    main()
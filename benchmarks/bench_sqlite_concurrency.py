@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark SQLite read latency while bookings are being written
+
+Compares SQLite defaults (rollback journal, synchronous=FULL) with the
+SQLITE_PRAGMAS from settings. Writer threads insert bookings in short
+transactions while reader threads run the available_slots query.
+
+Usage:
+    python benchmarks/bench_sqlite_concurrency.py [--seconds 5] [--readers 4] [--writers 2]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bellavista_backend.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from bellavista_backend.db import apply_sqlite_pragmas  # noqa: E402
+
+HOMES = ['cardiff', 'barry', 'waverley', 'college-fields']
+SLOTS = ['09:00', '10:00', '11:00', '14:00', '15:00', '16:00']
+BUSY_TIMEOUT = 20  # seconds, as in settings
+
+
+def connect(path, pragmas):
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+    if pragmas:
+        apply_sqlite_pragmas(conn, pragmas)
+    return conn
+
+
+def setup_database(path, pragmas):
+    conn = connect(path, pragmas)
+    conn.execute(
+        'CREATE TABLE tours_tourbooking ('
+        'id INTEGER PRIMARY KEY, first_name TEXT, email TEXT, preferred_home TEXT, '
+        'preferred_date TEXT, preferred_time TEXT, status TEXT, created_at TEXT)'
+    )
+    rng = random.Random(1)
+    conn.executemany(
+        'INSERT INTO tours_tourbooking (first_name, email, preferred_home, preferred_date, '
+        'preferred_time, status, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+        [('Seed', 'seed@example.com', rng.choice(HOMES), f'2026-11-{rng.randint(1, 28):02d}',
+          rng.choice(SLOTS), 'pending', '2026-10-01') for _ in range(20_000)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def run(label, pragmas, seconds, readers, writers):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'bench.sqlite3')
+        setup_database(path, pragmas)
+
+        stop = threading.Event()
+        read_latencies = []
+        writes = [0]
+        errors = [0]
+        lock = threading.Lock()
+
+        def writer():
+            conn = connect(path, pragmas)
+            rng = random.Random()
+            while not stop.is_set():
+                try:
+                    conn.execute('BEGIN IMMEDIATE')
+                    for _ in range(5):
+                        conn.execute(
+                            'INSERT INTO tours_tourbooking (first_name, email, preferred_home, '
+                            'preferred_date, preferred_time, status, created_at) '
+                            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                            ('Load', 'load@example.com', rng.choice(HOMES), '2026-11-15',
+                             rng.choice(SLOTS), 'pending', '2026-10-19')
+                        )
+                    time.sleep(0.002)  # simulate work inside the transaction
+                    conn.commit()
+                    with lock:
+                        writes[0] += 1
+                except sqlite3.OperationalError:
+                    conn.rollback()
+                    with lock:
+                        errors[0] += 1
+            conn.close()
+
+        def reader():
+            conn = connect(path, pragmas)
+            rng = random.Random()
+            latencies = []
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    conn.execute(
+                        'SELECT preferred_time FROM tours_tourbooking '
+                        'WHERE preferred_home = ? AND preferred_date = ?',
+                        (rng.choice(HOMES), f'2026-11-{rng.randint(1, 28):02d}')
+                    ).fetchall()
+                    latencies.append(time.perf_counter() - start)
+                except sqlite3.OperationalError:
+                    with lock:
+                        errors[0] += 1
+            conn.close()
+            with lock:
+                read_latencies.extend(latencies)
+
+        threads = [threading.Thread(target=writer) for _ in range(writers)]
+        threads += [threading.Thread(target=reader) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    read_latencies.sort()
+    p50 = statistics.median(read_latencies) * 1e3
+    p99 = read_latencies[int(len(read_latencies) * 0.99)] * 1e3
+    print(
+        f"{label:<10} reads/s {len(read_latencies) / seconds:>8.0f}  p50 {p50:>7.2f}ms  "
+        f"p99 {p99:>7.2f}ms  max {read_latencies[-1] * 1e3:>7.2f}ms  "
+        f"write txns/s {writes[0] / seconds:>6.0f}  locked errors {errors[0]}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    args = parser.parse_args()
+
+    run('default', {}, args.seconds, args.readers, args.writers)
+    run('tuned', settings.SQLITE_PRAGMAS, args.seconds, args.readers, args.writers)
+
+
+if __name__ == '__main__':
+    main()
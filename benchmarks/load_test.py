@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test of the tours API
+
+Seeds a throwaway SQLite database, starts the app under gunicorn with
+uvicorn workers, and drives a weighted mix of booking, availability,
+listing, stats and nearest-home traffic at a fixed concurrency. Nominatim
+and SendGrid are replaced by a local stub server, so runs are offline and
+repeatable. Throughput and p50/p95/p99 latency are reported per endpoint
+and saved as JSON; pass --compare with an earlier file to see the change.
+
+Usage:
+    python benchmarks/load_test.py [--duration 30] [--concurrency 20] [--workers 2]
+        [--bookings 20000] [--mix slots=35,nearest=20,stats=10,list=10,book=25]
+        [--output results.json] [--compare previous.json]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.bench_async_capacity import PROXY_HEADERS, free_port, wait_until_ready  # noqa: E402
+
+RESULTS_DIR = ROOT / 'benchmarks' / 'results'
+
+HOMES = ['cardiff', 'barry', 'waverley', 'college-fields']
+TIME_SLOTS = ['09:00', '10:00', '11:00', '14:00', '15:00', '16:00']
+PLACES = ['Cardiff', 'Barry', 'Penarth', 'Llandaff', 'Cowbridge', 'Dinas Powys', 'Whitchurch', 'Canton']
+
+DEFAULT_MIX = 'slots=35,nearest=20,stats=10,list=10,book=25'
+
+
+# =============================================================================
+# STUB UPSTREAMS
+# =============================================================================
+
+class StubUpstreams:
+    """
+    One local HTTP server standing in for Nominatim (GET /search) and
+    SendGrid (POST /v3/mail/send), with optional fixed latencies.
+    """
+
+    def __init__(self, geocode_delay=0.0, email_delay=0.0):
+        self.geocode_calls = 0
+        self.emails = 0
+        upstreams = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(geocode_delay)
+                upstreams.geocode_calls += 1
+                # Deterministic point in South Wales for every query
+                digest = hashlib.sha1(self.path.encode()).digest()
+                lat = 51.35 + digest[0] / 255 * 0.3
+                lon = -3.45 + digest[1] / 255 * 0.4
+                self.reply(200, json.dumps([{'lat': str(lat), 'lon': str(lon)}]).encode())
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                time.sleep(email_delay)
+                upstreams.emails += 1
+                self.reply(202, b'')
+
+            def reply(self, status, body):
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', free_port()), Handler)
+        self.server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+
+
+# =============================================================================
+# TRAFFIC MIX
+# =============================================================================
+
+def slots_request(rng):
+    day = date.today() + timedelta(days=rng.randrange(1, 30))
+    return 'GET', '/api/tours/available-slots/', {'params': {'date': day.isoformat(), 'home': rng.choice(HOMES)}}
+
+
+def nearest_request(rng):
+    # A small set of popular places plus a long tail of unique streets
+    if rng.random() < 0.7:
+        location = rng.choice(PLACES)
+    else:
+        location = f'{rng.randrange(1, 200)} {rng.choice(PLACES)} Road'
+    return 'GET', '/api/tours/find-nearest-home/', {'params': {'location': location}}
+
+
+def stats_request(rng):
+    return 'GET', '/api/tours/stats/', {}
+
+
+def list_request(rng):
+    return 'GET', '/api/tours/bookings/', {'params': {'page': rng.randrange(1, 5)}}
+
+
+def book_request(rng):
+    day = date.today() + timedelta(days=rng.randrange(1, 60))
+    return 'POST', '/api/tours/book/', {'json': {
+        'first_name': 'Load',
+        'last_name': 'Test',
+        'email': f'load{rng.randrange(10 ** 6)}@example.com',
+        'phone_number': '07123456789',
+        'preferred_home': rng.choice(HOMES),
+        'preferred_date': day.isoformat(),
+        'preferred_time': rng.choice(TIME_SLOTS),
+    }}
+
+
+ENDPOINTS = {
+    'slots': slots_request,
+    'nearest': nearest_request,
+    'stats': stats_request,
+    'list': list_request,
+    'book': book_request,
+}
+
+
+def parse_mix(value):
+    """'slots=35,book=25' -> {'slots': 35.0, 'book': 25.0}"""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f'unknown endpoint {name!r} (choose from {", ".join(ENDPOINTS)})')
+        mix[name] = float(weight or 1)
+    return mix
+
+
+# =============================================================================
+# LOAD GENERATION
+# =============================================================================
+
+async def drive(base_url, mix, concurrency, duration, seed):
+    """
+    Run `concurrency` closed-loop clients for `duration` seconds.
+
+    Returns:
+        tuple: ({endpoint: [latency seconds of successful requests]},
+                {endpoint: error count}, elapsed seconds)
+    """
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    latencies = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, headers=PROXY_HEADERS, timeout=60, limits=limits) as client:
+        start = time.perf_counter()
+        deadline = start + duration
+
+        async def client_loop(index):
+            rng = random.Random(seed * 1000 + index)
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights)[0]
+                method, path, kwargs = ENDPOINTS[name](rng)
+                sent = time.perf_counter()
+                try:
+                    response = await client.request(method, path, **kwargs)
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies[name].append(time.perf_counter() - sent)
+                else:
+                    errors[name] += 1
+
+        await asyncio.gather(*(client_loop(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return latencies, errors, elapsed
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def summarise(latencies, errors, elapsed):
+    """Per-endpoint and overall throughput and latency percentiles (ms)"""
+    def stats(values, error_count):
+        values = sorted(values)
+        ms = lambda seconds: round(seconds * 1000, 2) if seconds is not None else None  # noqa: E731
+        return {
+            'requests': len(values) + error_count,
+            'errors': error_count,
+            'throughput_rps': round((len(values) + error_count) / elapsed, 1),
+            'p50_ms': ms(statistics.median(values) if values else None),
+            'p95_ms': ms(percentile(values, 0.95)),
+            'p99_ms': ms(percentile(values, 0.99)),
+        }
+
+    endpoints = {name: stats(latencies[name], errors[name]) for name in latencies}
+    overall = stats([v for values in latencies.values() for v in values], sum(errors.values()))
+    return endpoints, overall
+
+
+# =============================================================================
+# SERVER
+# =============================================================================
+
+def server_env(upstreams, database_path, cache_enabled):
+    env = dict(os.environ)
+    env.update({
+        # Measure production settings, not DEBUG's query log and error pages
+        'DEBUG': 'False',
+        'ALLOWED_HOSTS': '127.0.0.1,localhost',
+        'DATABASE_URL': f'sqlite:///{database_path}',
+        'CACHE_BACKEND': 'sqlite',
+        'CACHE_LOCATION': f'{database_path}.cache',
+        'VIEW_CACHE_ENABLED': str(cache_enabled),
+        'SERVER_TIMING_ENABLED': 'False',
+        'RATE_LIMIT_ENABLED': 'False',  # every simulated user shares one address
+        'GEOCODING_URL': f'{upstreams.url}/search',
+        'GEOCODING_REQUESTS_PER_SECOND': '100000',
+        'GEOCODING_MAX_QUEUE_WAIT': '60',
+        'SENDGRID_API_KEY': 'load-test',
+        'SENDGRID_API_HOST': upstreams.url,
+    })
+    return env
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(endpoints, overall, previous=None):
+    header = f"{'endpoint':<10} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    print(header)
+    print('-' * len(header))
+    rows = list(endpoints.items()) + [('overall', overall)]
+    for name, row in rows:
+        line = (
+            f"{name:<10} {row['requests']:>9} {row['errors']:>7} {row['throughput_rps']:>8.1f} "
+            + ' '.join(f"{row[key] if row[key] is not None else '-':>8}" for key in ('p50_ms', 'p95_ms', 'p99_ms'))
+        )
+        if previous:
+            before = previous['overall'] if name == 'overall' else previous['endpoints'].get(name)
+            if before and before.get('p95_ms') and row['p95_ms']:
+                line += f"   p95 {row['p95_ms'] / before['p95_ms'] - 1:+.0%}"
+                line += f", req/s {row['throughput_rps'] / before['throughput_rps'] - 1:+.0%}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--duration', type=float, default=30, help='Seconds of load (default: 30)')
+    parser.add_argument('--concurrency', type=int, default=20, help='Concurrent clients (default: 20)')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn worker processes (default: 2)')
+    parser.add_argument('--bookings', type=int, default=20000, help='Bookings seeded before the run')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f'Endpoint weights (default: {DEFAULT_MIX})')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the data and the traffic')
+    parser.add_argument('--geocode-delay', type=float, default=0.05, help='Stub Nominatim latency in seconds')
+    parser.add_argument('--email-delay', type=float, default=0.1, help='Stub SendGrid latency in seconds')
+    parser.add_argument('--no-cache', action='store_true', help='Turn per-view response caching off')
+    parser.add_argument('--output', type=Path, help='Results file (default: benchmarks/results/load-<commit>-<time>.json)')
+    parser.add_argument('--compare', type=Path, help='Earlier results file to compare against')
+    args = parser.parse_args()
+
+    commit = git_commit()
+    started = datetime.now(timezone.utc)
+
+    with StubUpstreams(args.geocode_delay, args.email_delay) as upstreams, tempfile.TemporaryDirectory() as tmpdir:
+        env = server_env(upstreams, os.path.join(tmpdir, 'load.sqlite3'), not args.no_cache)
+        manage = [sys.executable, 'manage.py']
+        subprocess.run(manage + ['migrate', '-v', '0'], cwd=ROOT, env=env, check=True)
+        subprocess.run(
+            manage + ['seed_bookings', '--count', str(args.bookings), '--seed', str(args.seed)],
+            cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL
+        )
+
+        port = free_port()
+        process = subprocess.Popen([
+            sys.executable, '-m', 'gunicorn', 'bellavista_backend.asgi:application',
+            '--worker-class', 'uvicorn.workers.UvicornWorker', '--workers', str(args.workers),
+            '--bind', f'127.0.0.1:{port}',
+        ], cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_until_ready(port)
+            print(
+                f'{args.bookings} seeded bookings, {args.workers} workers, {args.concurrency} clients, '
+                f'{args.duration:.0f}s, cache {"off" if args.no_cache else "on"}'
+            )
+            latencies, errors, elapsed = asyncio.run(
+                drive(f'http://127.0.0.1:{port}', args.mix, args.concurrency, args.duration, args.seed)
+            )
+        finally:
+            process.terminate()
+            process.wait()
+
+        geocode_calls, emails = upstreams.geocode_calls, upstreams.emails
+
+    endpoints, overall = summarise(latencies, errors, elapsed)
+    previous = json.loads(args.compare.read_text()) if args.compare else None
+    print_report(endpoints, overall, previous)
+    print(f'stub upstream calls: {geocode_calls} geocodes, {emails} emails')
+
+    results = {
+        'commit': commit,
+        'started_at': started.isoformat(),
+        'python': platform.python_version(),
+        'settings': {
+            'duration': args.duration,
+            'concurrency': args.concurrency,
+            'workers': args.workers,
+            'bookings': args.bookings,
+            'mix': args.mix,
+            'seed': args.seed,
+            'geocode_delay': args.geocode_delay,
+            'email_delay': args.email_delay,
+            'cache': not args.no_cache,
+        },
+        'elapsed_seconds': round(elapsed, 2),
+        'upstream_calls': {'geocode': geocode_calls, 'email': emails},
+        'endpoints': endpoints,
+        'overall': overall,
+    }
+    output = args.output or RESULTS_DIR / f"load-{commit or 'unknown'}-{started:%Y%m%dT%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + '\n')
+    print(f'results saved to {output}')
+
+
+if __name__ == '__main__':
+    main()
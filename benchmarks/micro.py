@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for per-request and per-row hot functions
+
+Times distance maths, booking model helpers, confirmation email rendering
+and the serializer/JSON paths at 1, 100 and 10,000 rows, then compares
+each result with benchmarks/baselines.json. A benchmark more than
+--threshold slower than its baseline is a regression and makes the run
+exit with status 1. Runs offline against a throwaway SQLite database.
+
+Baselines are machine-specific: refresh them with --save-baseline on the
+machine that checks for regressions.
+
+Usage:
+    python benchmarks/micro.py [--filter serializer] [--threshold 0.25] [--save-baseline]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINES = ROOT / 'benchmarks' / 'baselines.json'
+ROW_COUNTS = [1, 100, 10_000]
+
+sys.path.insert(0, str(ROOT))
+_tmpdir = tempfile.TemporaryDirectory()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'bellavista_backend.settings')
+os.environ['DATABASE_URL'] = f'sqlite:///{_tmpdir.name}/micro.sqlite3'
+os.environ['CACHE_BACKEND'] = 'locmem'
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+
+from bellavista_backend.renderers import TimedJSONRenderer  # noqa: E402
+from tours.email_service import render_confirmation_email  # noqa: E402
+from tours.models import TourBooking  # noqa: E402
+from tours.serializers import TourBookingCreateSerializer, TourBookingListSerializer  # noqa: E402
+from tours.views import haversine_distance  # noqa: E402
+
+
+def make_booking(i):
+    """Unsaved booking with every field filled in, as loaded from the database"""
+    return TourBooking(
+        id=i + 1,
+        first_name='Olivia',
+        last_name='Jones' if i % 10 else None,
+        email=f'olivia{i}@example.com',
+        phone_number='07123456789',
+        preferred_home=['cardiff', 'barry', 'waverley', 'college-fields'][i % 4],
+        preferred_date=date(2026, 3, 2) + timedelta(days=i % 60),
+        preferred_time=time(10 + i % 6),
+        notes='Would like to see the garden' if i % 7 == 0 else None,
+        status='pending',
+        created_at=datetime(2026, 2, 1, 9, 30, tzinfo=timezone.utc),
+    )
+
+
+def booking_payload(i):
+    """Valid POST body for the create serializer"""
+    return {
+        'first_name': 'Olivia',
+        'last_name': 'Jones',
+        'email': f'Olivia{i}@Example.com',
+        'phone_number': '07123456789',
+        'preferred_home': 'cardiff',
+        'preferred_date': (date.today() + timedelta(days=7)).isoformat(),
+        'preferred_time': '10:00',
+    }
+
+
+def validate(payloads):
+    serializer = TourBookingCreateSerializer(data=payloads, many=True)
+    assert serializer.is_valid(), serializer.errors
+
+
+def benchmarks():
+    """name -> zero-argument callable"""
+    booking = make_booking(1)
+    cases = {
+        'haversine_distance': lambda: haversine_distance(51.4816, -3.1791, 51.3998, -3.2826),
+        'TourBooking.full_name': lambda: booking.full_name,
+        'TourBooking.get_home_display_name': booking.get_home_display_name,
+        'render_confirmation_email': lambda: render_confirmation_email(booking),
+    }
+    renderer = TimedJSONRenderer()
+    for rows in ROW_COUNTS:
+        bookings = [make_booking(i) for i in range(rows)]
+        payloads = [booking_payload(i) for i in range(rows)]
+        data = TourBookingListSerializer(bookings, many=True).data
+        cases[f'create_serializer_validation[{rows}]'] = lambda payloads=payloads: validate(payloads)
+        cases[f'list_serializer_data[{rows}]'] = (
+            lambda bookings=bookings: TourBookingListSerializer(bookings, many=True).data
+        )
+        cases[f'json_render[{rows}]'] = lambda data=data: renderer.render(data)
+    return cases
+
+
+def measure(func, repeat):
+    """Best seconds per call over `repeat` runs of at least 0.2s each"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def format_seconds(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.2f}{unit}'
+    return f'{seconds / 1e-9:.0f}ns'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--filter', default='', help='Only run benchmarks whose name contains this')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing runs per benchmark (best is kept)')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed slowdown against the baseline before failing (default: 0.25 = 25%%)')
+    parser.add_argument('--save-baseline', action='store_true', help=f'Write results to {BASELINES.name}')
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    stored = json.loads(BASELINES.read_text()) if BASELINES.exists() else {'results': {}}
+    baselines = stored['results']
+
+    results = {}
+    regressions = []
+    print(f"{'benchmark':<38} {'per call':>10} {'baseline':>10} {'change':>8}")
+    for name, func in benchmarks().items():
+        if args.filter not in name:
+            continue
+        seconds = results[name] = measure(func, args.repeat)
+        baseline = baselines.get(name)
+        change = ''
+        if baseline:
+            ratio = seconds / baseline - 1
+            change = f'{ratio:+.0%}'
+            if ratio > args.threshold:
+                regressions.append(name)
+                change += ' !'
+        print(f"{name:<38} {format_seconds(seconds):>10} "
+              f"{format_seconds(baseline) if baseline else '-':>10} {change:>8}")
+
+    if args.save_baseline:
+        stored['results'] = {**baselines, **results}
+        stored['machine'] = f'{platform.python_implementation()} {platform.python_version()} on {platform.machine()}'
+        BASELINES.write_text(json.dumps(stored, indent=2, sort_keys=True) + '\n')
+        print(f'baselines saved to {BASELINES}')
+    elif regressions:
+        print(f'{len(regressions)} regression(s) over {args.threshold:.0%}: {", ".join(regressions)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
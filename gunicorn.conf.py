@@ -0,0 +1,23 @@
+# Gunicorn Configuration for Bellavista Care Homes Backend
+# Loaded automatically by gunicorn from the project root
+
+import glob
+import os
+import tempfile
+
+
+def on_starting(server):
+    """Give this server run an empty metrics directory shared by its workers"""
+    metrics_dir = os.environ.setdefault(
+        'METRICS_DIR', os.path.join(tempfile.gettempdir(), f'bellavista-metrics-{os.getpid()}')
+    )
+    os.makedirs(metrics_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(metrics_dir, 'metrics-*.json')):
+        os.remove(path)
+
+
+def post_worker_init(worker):
+    """Warm the shared cache once per deploy when WARM_CACHES_ON_START is set"""
+    from tours.warmup import warm_caches_in_background
+
+    warm_caches_in_background()
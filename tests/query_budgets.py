@@ -0,0 +1,73 @@
+"""
+Query budgets for every tours endpoint
+
+Maximum number of database queries each URL may issue per request, once
+process-wide caches (such as the care home registry) are warm. A new URL
+in tours/urls.py needs an entry here before the test suite passes.
+"""
+
+import importlib.util
+from datetime import date, timedelta
+
+from tours.query_plans import hot_endpoints
+
+
+def booking_payload():
+    return {
+        'first_name': 'Jane', 'last_name': 'Smith', 'email': 'jane@example.com',
+        'phone_number': '07987654321', 'preferred_home': 'barry',
+        'preferred_date': (date.today() + timedelta(days=10)).isoformat(),
+        'preferred_time': '14:00',
+    }
+
+
+def tour_date():
+    return (date.today() + timedelta(days=7)).isoformat()
+
+
+# URL name -> request to make and the most queries it may run.
+# 'kwargs' may name 'booking_id', which is filled in with an existing booking;
+# 'requires' lists optional packages the endpoint cannot work without.
+QUERY_BUDGETS = {
+    'tours:book_tour': {
+        'budget': 1, 'method': 'post', 'data': booking_payload,
+    },
+    'tours:list_bookings': {
+        'budget': 2, 'method': 'get',
+    },
+    'tours:update_status': {
+        'budget': 2, 'method': 'patch', 'data': lambda: {'status': 'visited'}, 'kwargs': ('booking_id',),
+    },
+    'tours:export_tours': {
+        'budget': 1, 'method': 'get', 'data': lambda: {'status': 'all'}, 'requires': ('openpyxl',),
+    },
+    'tours:available_slots': {
+        'budget': 1, 'method': 'get', 'data': lambda: {'date': tour_date(), 'home': 'cardiff'},
+    },
+    'tours:booking_stats': {
+        'budget': 2, 'method': 'get',
+    },
+    'tours:test_connection': {
+        'budget': 1, 'method': 'get',
+    },
+    'tours:find_nearest_home': {
+        'budget': 0, 'method': 'get', 'data': lambda: {'lat': '51.48', 'lon': '-3.18'},
+    },
+    'tours:find_nearest_home_with_slots': {
+        'budget': 1, 'method': 'get', 'data': lambda: {'lat': '51.48', 'lon': '-3.18'},
+    },
+    'tours:find_nearest_home_batch': {
+        'budget': 0, 'method': 'post',
+        'data': lambda: {'locations': [{'lat': 51.48, 'lon': -3.18}, {'lat': 51.40, 'lon': -3.28}]},
+    },
+}
+
+
+def installed(url_name):
+    """False if an optional package the endpoint needs is not installed"""
+    return all(importlib.util.find_spec(package) for package in QUERY_BUDGETS[url_name].get('requires', ()))
+
+
+def installed_hot_endpoints():
+    """tours.query_plans.hot_endpoints() without endpoints that cannot run here"""
+    return [endpoint for endpoint in hot_endpoints() if installed(endpoint[1])]
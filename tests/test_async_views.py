@@ -0,0 +1,150 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+import httpx
+import requests
+from django.core.cache import cache
+from django.http import Http404
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import exceptions, status
+from rest_framework.test import APIClient
+from tours.geocoding import AsyncGeocodingClient, CircuitBreaker, RateLimiter
+
+
+class AsyncGeocodingClientTest(SimpleTestCase):
+    """Test cases for the asyncio Nominatim client"""
+
+    def setUp(self):
+        cache.clear()
+
+    def make_client(self, handler):
+        client = AsyncGeocodingClient(RateLimiter(0, 1), CircuitBreaker(2, 60), url='https://geo.test/search')
+        transport = httpx.MockTransport(handler)
+        client._session = lambda loop: httpx.AsyncClient(transport=transport)
+        return client
+
+    def test_geocode_success(self):
+        """Test that a result is parsed into coordinates"""
+        client = self.make_client(lambda request: httpx.Response(200, json=[{'lat': '51.48', 'lon': '-3.17'}]))
+
+        self.assertEqual(asyncio.run(client.geocode('Cardiff')), (51.48, -3.17))
+
+    def test_concurrent_identical_lookups_coalesced(self):
+        """Test that concurrent lookups for one query share a single upstream call"""
+        calls = []
+
+        async def handler(request):
+            calls.append(request.url.params['q'])
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json=[{'lat': '51.40', 'lon': '-3.28'}])
+
+        client = self.make_client(handler)
+
+        async def lookup_many():
+            return await asyncio.gather(*(client.geocode(' Barry ') for _ in range(5)))
+
+        results = asyncio.run(lookup_many())
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [(51.40, -3.28)] * 5)
+
+    def test_errors_raise_request_exception_and_trip_breaker(self):
+        """Test that upstream failures surface like the sync client's"""
+        client = self.make_client(lambda request: httpx.Response(500))
+
+        for _ in range(2):
+            with self.assertRaises(requests.RequestException):
+                asyncio.run(client.geocode('Cardiff'))
+
+        self.assertEqual(client.breaker.state, CircuitBreaker.OPEN)
+
+    def test_cancelled_trial_is_released(self):
+        """Test that a half-open trial cancelled mid-request does not keep the circuit shut"""
+        async def handler(request):
+            await asyncio.sleep(1)
+            return httpx.Response(200, json=[])
+
+        client = self.make_client(handler)
+        client.breaker = CircuitBreaker(1, 0)
+        client.breaker.record_failure()
+
+        async def cancel_lookup():
+            task = asyncio.create_task(client._fetch(asyncio.get_running_loop(), 'Cardiff'))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_lookup())
+
+        client.breaker.before_call()  # the next trial is allowed
+
+
+class AsyncViewsTest(TestCase):
+    """Test cases for the async API views"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_find_nearest_home_with_location(self):
+        """Test that the async view geocodes and returns the nearest home"""
+        with patch('tours.views.ageocode_location', AsyncMock(return_value=(51.4816, -3.1791))):
+            response = self.client.get(reverse('tours:find_nearest_home'), {'location': 'Cardiff'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['nearest_home'], 'Bellavista Cardiff')
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+    def test_find_nearest_home_geocoder_failure(self):
+        """Test that geocoding failures return 503"""
+        failure = AsyncMock(side_effect=requests.RequestException('down'))
+        with patch('tours.views.ageocode_location', failure):
+            response = self.client.get(reverse('tours:find_nearest_home'), {'location': 'Cardiff'})
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    def test_method_not_allowed(self):
+        """Test that unsupported methods are rejected like @api_view"""
+        response = self.client.post(reverse('tours:find_nearest_home'), {}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        self.assertEqual(response['Allow'], 'GET')
+
+    def test_malformed_json_is_a_parse_error(self):
+        """Test that an unparseable body gets DRF's 400, not a 500"""
+        response = self.client.generic(
+            'POST', reverse('tours:test_connection'), '{"email": ', content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('JSON parse error', response.json()['detail'])
+
+    def test_api_exceptions_become_drf_responses(self):
+        """Test that APIExceptions raised in an async view are rendered like @api_view"""
+        for exc, expected in [
+            (exceptions.ValidationError({'lat': ['Invalid']}), status.HTTP_400_BAD_REQUEST),
+            (exceptions.NotFound(), status.HTTP_404_NOT_FOUND),
+            (Http404(), status.HTTP_404_NOT_FOUND),
+        ]:
+            with self.subTest(exc=type(exc).__name__), \
+                    patch('tours.views.aresolve_user_location', AsyncMock(side_effect=exc)):
+                response = self.client.get(reverse('tours:find_nearest_home'), {'location': 'Cardiff'})
+
+            self.assertEqual(response.status_code, expected)
+            self.assertEqual(response['Content-Type'], 'application/json')
+
+    def test_test_connection_email(self):
+        """Test that POST sends the test email through the async path"""
+        result = {'success': True, 'status_code': 202, 'sent_to': 'test@example.com'}
+        with patch('tours.views.send_test_email_async', AsyncMock(return_value=result)) as send:
+            response = self.client.post(reverse('tours:test_connection'), {'email': 'test@example.com'}, format='json')
+
+        send.assert_awaited_once_with('test@example.com')
+        self.assertTrue(response.data['email_test']['success'])
+
+    async def test_asgi_request_stack(self):
+        """Test the views through Django's ASGI handler and async middleware"""
+        response = await self.async_client.get(reverse('tours:find_nearest_home'), {'lat': '51.4', 'lon': '-3.27'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['nearest_home'], 'Bellavista Barry')
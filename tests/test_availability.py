@@ -0,0 +1,79 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from datetime import date, datetime, timedelta
+from rest_framework.test import APIClient
+from rest_framework import status
+from tours.availability import next_available_slots
+from tours.models import TourBooking
+
+
+class NextAvailableSlotsTest(TestCase):
+    """Test cases for next-available-slot lookups"""
+
+    def setUp(self):
+        self.tomorrow = date.today() + timedelta(days=1)
+        # Pretend it is late evening so only tomorrow onwards is searched
+        self.now = timezone.make_aware(datetime.combine(date.today(), datetime.min.time()).replace(hour=23))
+
+    def book(self, home, day, time):
+        """Create a booking occupying one slot"""
+        return TourBooking.objects.create(
+            first_name='Test',
+            email='test@example.com',
+            phone_number='+1234567890',
+            preferred_home=home,
+            preferred_date=day,
+            preferred_time=time
+        )
+
+    def test_skips_booked_slots(self):
+        """Test that booked slots are skipped for the right home only"""
+        self.book('cardiff', self.tomorrow, '09:00')
+        self.book('cardiff', self.tomorrow, '10:00')
+
+        slots = next_available_slots(['cardiff', 'barry'], 2, now=self.now)
+
+        self.assertEqual([s['time'] for s in slots['cardiff']], ['11:00', '14:00'])
+        self.assertEqual([s['time'] for s in slots['barry']], ['09:00', '10:00'])
+        self.assertEqual(slots['cardiff'][0]['date'], self.tomorrow.isoformat())
+
+    def test_rolls_over_to_next_day(self):
+        """Test that a fully booked day moves on to the following day"""
+        for time in ['09:00', '10:00', '11:00', '14:00', '15:00', '16:00']:
+            self.book('barry', self.tomorrow, time)
+
+        slots = next_available_slots(['barry'], 1, now=self.now)
+
+        self.assertEqual(slots['barry'], [{'date': (self.tomorrow + timedelta(days=1)).isoformat(), 'time': '09:00'}])
+
+    def test_single_query_for_all_homes(self):
+        """Test that availability for many homes costs one query"""
+        with self.assertNumQueries(1):
+            next_available_slots(['cardiff', 'barry', 'waverley', 'college-fields'], 5, now=self.now)
+
+
+class FindNearestHomeWithSlotsViewTest(TestCase):
+    """Test cases for the nearest-homes-with-availability endpoint"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('tours:find_nearest_home_with_slots')
+
+    def test_ranked_homes_with_slots(self):
+        """Test that homes are ranked by distance and include slots"""
+        response = self.client.get(self.url, {'lat': '51.3998', 'lon': '-3.2826', 'homes': 2, 'slots': 4})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        homes = response.data['homes']
+        self.assertEqual(len(homes), 2)
+        self.assertEqual(homes[0]['key'], 'barry')
+        self.assertEqual(len(homes[0]['next_available_slots']), 4)
+        self.assertIn('duration', homes[0])
+
+    def test_invalid_limits(self):
+        """Test that out-of-range counts are rejected"""
+        response = self.client.get(self.url, {'lat': '51.4', 'lon': '-3.2', 'homes': 0})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('error', response.data)
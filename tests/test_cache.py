@@ -0,0 +1,221 @@
+import os
+import shutil
+import tempfile
+import time
+from datetime import date, timedelta
+from unittest.mock import patch
+from django.contrib.admin.sites import AdminSite
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from bellavista_backend.cache import SQLiteCache
+from tours.cache import get_or_compute, invalidate_namespace, make_key, namespace_version
+from tours.admin import TourBookingAdmin
+from tours.location_service import geocode_location
+from tours.models import TourBooking
+
+
+class SQLiteCacheTest(SimpleTestCase):
+    """Test cases for the SQLite-backed shared cache"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'cache.sqlite3')
+        self.cache = SQLiteCache(self.path, {'TIMEOUT': 60, 'KEY_PREFIX': 'test'})
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_set_and_get(self):
+        """Test that values round-trip, including non-integers"""
+        self.cache.set('booking', {'home': 'barry', 'slots': ['10:00']})
+        self.cache.set('count', 3)
+
+        self.assertEqual(self.cache.get('booking'), {'home': 'barry', 'slots': ['10:00']})
+        self.assertEqual(self.cache.get('count'), 3)
+        self.assertIsNone(self.cache.get('missing'))
+
+    def test_entries_are_shared_between_instances(self):
+        """Test that a second backend on the same file sees the same entries"""
+        self.cache.set('shared', 'value')
+        other = SQLiteCache(self.path, {'TIMEOUT': 60, 'KEY_PREFIX': 'test'})
+
+        self.assertEqual(other.get('shared'), 'value')
+
+    def test_expired_entries_are_not_returned(self):
+        """Test that entries disappear after their timeout"""
+        self.cache.set('short', 'value', timeout=60)
+        with patch('bellavista_backend.cache.time.time', return_value=time.time() + 61):
+            self.assertIsNone(self.cache.get('short'))
+            self.assertFalse(self.cache.has_key('short'))
+
+    def test_add_only_sets_missing_or_expired_keys(self):
+        """Test that add() does not overwrite a live entry"""
+        self.assertTrue(self.cache.add('key', 'first', timeout=60))
+        self.assertFalse(self.cache.add('key', 'second'))
+        self.assertEqual(self.cache.get('key'), 'first')
+
+        with patch('bellavista_backend.cache.time.time', return_value=time.time() + 61):
+            self.assertTrue(self.cache.add('key', 'third'))
+
+    def test_incr_and_decr(self):
+        """Test that counters are incremented in place"""
+        self.cache.set('counter', 10)
+
+        self.assertEqual(self.cache.incr('counter'), 11)
+        self.assertEqual(self.cache.incr('counter', 5), 16)
+        self.assertEqual(self.cache.decr('counter'), 15)
+        self.assertEqual(self.cache.get('counter'), 15)
+
+    def test_incr_missing_key_raises(self):
+        """Test that incrementing a missing key raises ValueError like other backends"""
+        with self.assertRaises(ValueError):
+            self.cache.incr('missing')
+
+    def test_delete_touch_and_clear(self):
+        """Test delete(), touch() and clear()"""
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+
+        self.assertTrue(self.cache.touch('a', timeout=None))
+        self.assertTrue(self.cache.delete('b'))
+        self.assertFalse(self.cache.delete('b'))
+
+        self.cache.clear()
+        self.assertIsNone(self.cache.get('a'))
+
+
+class CacheNamespaceTest(TestCase):
+    """Test cases for namespaced, versioned cache keys"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_make_key_includes_namespace_and_version(self):
+        """Test the key layout"""
+        version = namespace_version('stats')
+
+        self.assertEqual(make_key('stats', 'summary', 7), f'tours:stats:v{version}:summary:7')
+
+    def test_unsafe_parts_are_hashed(self):
+        """Test that keys with spaces are hashed so every backend accepts them"""
+        key = make_key('geocode', 'cf10 1aa')
+
+        self.assertNotIn(' ', key)
+        self.assertNotEqual(key, make_key('geocode', 'cf10 1ab'))
+
+    def test_invalidate_namespace(self):
+        """Test that invalidation hides old entries in that namespace only"""
+        calls = []
+        compute = lambda: calls.append(1) or 'value'
+
+        get_or_compute('stats', ('summary',), compute, 60)
+        get_or_compute('slots', ('barry',), compute, 60)
+        self.assertEqual(len(calls), 2)
+
+        get_or_compute('stats', ('summary',), compute, 60)
+        self.assertEqual(len(calls), 2)
+
+        invalidate_namespace('stats')
+        get_or_compute('stats', ('summary',), compute, 60)
+        get_or_compute('slots', ('barry',), compute, 60)
+        self.assertEqual(len(calls), 3)
+
+    def test_invalidate_without_version(self):
+        """Test that invalidating a namespace that was never used works"""
+        before = make_key('fresh', 'x')
+        invalidate_namespace('fresh')
+
+        self.assertNotEqual(make_key('fresh', 'x'), before)
+
+    def test_geocode_results_are_cached(self):
+        """Test that repeated lookups of the same location call the geocoder once"""
+        with patch('tours.location_service.get_geocoding_client') as client:
+            client.return_value.geocode.return_value = (51.4816, -3.1791)
+
+            self.assertEqual(geocode_location('CF10 1AA'), (51.4816, -3.1791))
+            self.assertEqual(geocode_location('  cf10   1aa '), (51.4816, -3.1791))
+
+        client.return_value.geocode.assert_called_once_with('CF10 1AA')
+
+
+@override_settings(VIEW_CACHE_ENABLED=True)
+class ViewCachePolicyTest(TestCase):
+    """Test cases for per-view response caching"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.tour_date = date.today() + timedelta(days=7)
+
+    def get_slots(self, home='cardiff'):
+        return self.client.get(reverse('tours:available_slots'), {
+            'date': self.tour_date.isoformat(),
+            'home': home
+        })
+
+    def book(self, time_slot='10:00'):
+        return TourBooking.objects.create(
+            first_name='John', last_name='Doe', email='john@example.com',
+            phone_number='07123456789', preferred_home='cardiff',
+            preferred_date=self.tour_date, preferred_time=time_slot
+        )
+
+    def test_repeat_requests_are_served_from_cache(self):
+        """Test that identical requests hit the cache and parameters vary the key"""
+        self.assertEqual(self.get_slots()['X-Cache'], 'MISS')
+        self.assertEqual(self.get_slots()['X-Cache'], 'HIT')
+        self.assertEqual(self.get_slots(home='barry')['X-Cache'], 'MISS')
+
+    def test_booking_invalidates_available_slots(self):
+        """Test that a new booking is reflected immediately"""
+        self.assertIn('10:00', self.get_slots().data['available_slots'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.book('10:00')
+        response = self.get_slots()
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertNotIn('10:00', response.data['available_slots'])
+
+    def test_booking_invalidates_only_after_commit(self):
+        """Test that a request racing an uncommitted booking cannot re-cache stale slots"""
+        self.get_slots()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.book('10:00')
+            # Before the commit the cached (pre-booking) entry is still current
+            self.assertEqual(self.get_slots()['X-Cache'], 'HIT')
+
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        response = self.get_slots()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertNotIn('10:00', response.data['available_slots'])
+
+    def test_admin_bulk_action_invalidates_stats(self):
+        """Test that queryset.update() in admin actions still drops cached stats"""
+        booking = self.book()
+        url = reverse('tours:booking_stats')
+        self.assertEqual(self.client.get(url).data['confirmed_bookings'], 0)
+
+        admin = TourBookingAdmin(TourBooking, AdminSite())
+        with patch.object(admin, 'message_user'), self.captureOnCommitCallbacks(execute=True):
+            admin.mark_as_visited(None, TourBooking.objects.filter(pk=booking.pk))
+
+        self.assertEqual(self.client.get(url).data['confirmed_bookings'], 1)
+
+    def test_errors_are_not_cached(self):
+        """Test that only successful responses are stored"""
+        url = reverse('tours:available_slots')
+        self.client.get(url, {'date': 'bad', 'home': 'cardiff'})
+        response = self.client.get(url, {'date': 'bad', 'home': 'cardiff'})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.has_header('X-Cache'))
+
+    def test_uncached_endpoints(self):
+        """Test that booking lists are never cached"""
+        response = self.client.get(reverse('tours:list_bookings'))
+
+        self.assertFalse(response.has_header('X-Cache'))
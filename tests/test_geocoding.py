@@ -0,0 +1,149 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from unittest.mock import MagicMock, patch
+from tours.geocoding import (
+    CircuitBreaker, GeocoderUnavailable, GeocodingClient, RateLimiter,
+)
+import requests
+import threading
+import time
+
+
+def make_response(payload):
+    """Build a fake requests response returning the given JSON payload"""
+    response = MagicMock()
+    response.json.return_value = payload
+    response.raise_for_status.return_value = None
+    return response
+
+
+class GeocodingClientTest(SimpleTestCase):
+    """Test cases for the Nominatim geocoding client"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = GeocodingClient(min_interval=0, failure_threshold=2, cooldown=60)
+
+    def test_geocode_success(self):
+        """Test that a result is parsed into coordinates"""
+        with patch.object(self.client.session, 'get', return_value=make_response([{'lat': '51.48', 'lon': '-3.17'}])):
+            self.assertEqual(self.client.geocode('Cardiff'), (51.48, -3.17))
+
+    def test_geocode_not_found(self):
+        """Test that an empty result returns None"""
+        with patch.object(self.client.session, 'get', return_value=make_response([])):
+            self.assertIsNone(self.client.geocode('Nowhere'))
+
+    def test_concurrent_identical_lookups_coalesced(self):
+        """Test that concurrent lookups for one query share a single upstream call"""
+        release = threading.Event()
+
+        def slow_get(*args, **kwargs):
+            release.wait(2)
+            return make_response([{'lat': '51.40', 'lon': '-3.28'}])
+
+        results = []
+        with patch.object(self.client.session, 'get', side_effect=slow_get) as get:
+            threads = [
+                threading.Thread(target=lambda: results.append(self.client.geocode('Barry ')))
+                for _ in range(5)
+            ]
+            for thread in threads:
+                thread.start()
+            time.sleep(0.1)
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual(results, [(51.40, -3.28)] * 5)
+
+    def test_circuit_opens_after_repeated_failures(self):
+        """Test that the client fails fast once the failure threshold is reached"""
+        with patch.object(self.client.session, 'get', side_effect=requests.ConnectionError('down')) as get:
+            for _ in range(2):
+                with self.assertRaises(requests.ConnectionError):
+                    self.client.geocode('Cardiff')
+
+            with self.assertRaises(GeocoderUnavailable):
+                self.client.geocode('Cardiff')
+
+        self.assertEqual(get.call_count, 2)
+        self.assertEqual(self.client.breaker.state, CircuitBreaker.OPEN)
+
+
+class CircuitBreakerTest(SimpleTestCase):
+    """Test cases for the circuit breaker state machine"""
+
+    def test_half_open_trial(self):
+        """Test that one trial call is allowed after the cooldown"""
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=0.05)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        time.sleep(0.06)
+        breaker.before_call()  # trial call allowed
+        with self.assertRaises(GeocoderUnavailable):
+            breaker.before_call()  # concurrent calls still refused
+
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_trial_released_on_unexpected_error(self):
+        """Test that a trial call ending without an outcome does not block later trials"""
+        client = GeocodingClient(min_interval=0, failure_threshold=1, cooldown=0.05)
+        client.breaker.record_failure()
+        time.sleep(0.06)
+
+        with patch.object(client.session, 'get', side_effect=KeyError('boom')):
+            with self.assertRaises(KeyError):
+                client.geocode('Cardiff')
+
+        self.assertEqual(client.breaker.state, CircuitBreaker.HALF_OPEN)
+        client.breaker.before_call()  # the next trial is allowed
+
+
+class RateLimiterTest(SimpleTestCase):
+    """Test cases for the client-side rate limiter"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_rejects_when_queue_too_long(self):
+        """Test that callers are refused rather than queued indefinitely"""
+        limiter = RateLimiter(min_interval=10, max_wait=1)
+        limiter.acquire()
+
+        with self.assertRaises(GeocoderUnavailable):
+            limiter.acquire()
+
+    def test_spaces_requests(self):
+        """Test that consecutive requests are spaced by the interval"""
+        limiter = RateLimiter(min_interval=0.05, max_wait=1)
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.acquire()
+
+        # Two full intervals, less a little for clock and sleep resolution
+        self.assertGreaterEqual(time.monotonic() - start, 0.1 - 0.005)
+
+    def test_spacing_shared_between_processes(self):
+        """Test that limiters in different workers share one schedule"""
+        first, second = RateLimiter(min_interval=10, max_wait=15), RateLimiter(min_interval=10, max_wait=15)
+
+        self.assertEqual(first.reserve(), 0)
+        self.assertAlmostEqual(second.reserve(), 10, delta=0.1)
+        with self.assertRaises(GeocoderUnavailable):
+            first.reserve()
+
+        # The refused slot was handed back
+        self.assertAlmostEqual(cache.get('geocoding:next_slot') / 1000 - time.time(), 20, delta=0.1)
+
+    def test_cache_failure_spaces_locally(self):
+        """Test that a cache outage falls back to per-process spacing"""
+        limiter = RateLimiter(min_interval=10, max_wait=1)
+        with patch('tours.geocoding.cache.incr', side_effect=ConnectionError('Connection refused')), \
+                self.assertLogs('tours.geocoding', 'WARNING'):
+            self.assertEqual(limiter.reserve(), 0)
+            with self.assertRaises(GeocoderUnavailable):
+                limiter.reserve()
@@ -0,0 +1,100 @@
+from unittest import mock
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from bellavista_backend.health import readiness
+from tours.models import TourBooking
+
+
+class HealthProbeTest(TestCase):
+    """Test cases for the liveness and readiness probes"""
+
+    def setUp(self):
+        readiness.clear()
+        self.addCleanup(readiness.clear)
+
+    def test_liveness_does_no_io(self):
+        """Test that liveness answers without touching the database or cache"""
+        with CaptureQueriesContext(connection) as queries, \
+                mock.patch('bellavista_backend.health.cache') as cache:
+            response = self.client.get(reverse('liveness'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'status': 'alive'})
+        self.assertEqual(len(queries), 0)
+        cache.get.assert_not_called()
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_readiness_reports_each_check(self):
+        """Test that a healthy process is ready with every check passing"""
+        response = self.client.get(reverse('readiness'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'status': 'ready',
+            'checks': {'database': 'ok', 'migrations': 'ok', 'cache': 'ok'},
+        })
+
+    @override_settings(READINESS_CACHE_SECONDS=0)
+    def test_readiness_does_not_scan_bookings(self):
+        """Test that readiness cost does not depend on the bookings table"""
+        TourBooking.objects.create(
+            first_name='John', email='john@example.com', phone_number='07123456789',
+            preferred_home='cardiff', preferred_date='2030-01-07', preferred_time='10:00',
+        )
+        self.client.get(reverse('readiness'))  # migration check passes once
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('readiness'))
+
+        self.assertEqual([query['sql'] for query in queries], ['SELECT 1'])
+
+    def test_readiness_is_cached_between_refreshes(self):
+        """Test that probes within READINESS_CACHE_SECONDS reuse the last result"""
+        self.client.get(reverse('readiness'))
+
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(5):
+                response = self.client.get(reverse('readiness'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 0)
+
+    @override_settings(READINESS_CACHE_SECONDS=0)
+    def test_readiness_fails_when_cache_is_unreachable(self):
+        """Test that a cache outage makes the process unavailable"""
+        with mock.patch('bellavista_backend.health.cache') as cache:
+            cache.get.side_effect = ConnectionError('Connection refused')
+            with self.assertLogs('django.request', 'ERROR'):
+                response = self.client.get(reverse('readiness'))
+
+        self.assertEqual(response.status_code, 503)
+        data = response.json()
+        self.assertEqual(data['status'], 'unavailable')
+        self.assertEqual(data['checks']['cache'], 'ConnectionError: Connection refused')
+        self.assertEqual(data['checks']['database'], 'ok')
+
+        # Recovers on the next refresh
+        self.assertEqual(self.client.get(reverse('readiness')).status_code, 200)
+
+    @override_settings(READINESS_CACHE_SECONDS=0)
+    def test_readiness_fails_with_unapplied_migrations(self):
+        """Test that pending migrations keep the process out of rotation"""
+        with mock.patch('bellavista_backend.health.MigrationExecutor') as executor:
+            executor.return_value.migration_plan.return_value = [('migration', False)]
+            with self.assertLogs('django.request', 'ERROR'):
+                response = self.client.get(reverse('readiness'))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['checks']['migrations'], 'RuntimeError: 1 unapplied migration(s)')
+
+    @override_settings(READINESS_CACHE_SECONDS=0)
+    def test_migration_check_runs_until_it_passes(self):
+        """Test that the migration graph is not reloaded once migrations are applied"""
+        with mock.patch('bellavista_backend.health.MigrationExecutor') as executor:
+            executor.return_value.migration_plan.return_value = []
+            self.client.get(reverse('readiness'))
+            self.client.get(reverse('readiness'))
+
+        self.assertEqual(executor.call_count, 1)
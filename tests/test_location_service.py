@@ -0,0 +1,164 @@
+import asyncio
+from asgiref.sync import async_to_sync
+from django.core import signals
+from django.core.handlers.asgi import ASGIHandler
+from django.db import close_old_connections
+from django.test import TestCase
+from django.urls import reverse
+from unittest.mock import patch
+from rest_framework.test import APIClient
+from rest_framework import status
+from tours.location_service import nearest_homes, resolve_nearest_homes
+from tours.registry import get_registry
+from tours.views import haversine_distance
+import json
+
+
+class NearestHomesTest(TestCase):
+    """Test cases for nearest-home lookups against the home index"""
+
+    def test_matches_haversine_linear_scan(self):
+        """Test that the index agrees with a haversine scan over every home"""
+        points = [(51.4816, -3.1791), (51.40, -3.28), (52.4862, -1.8904), (51.5074, -0.1278)]
+
+        homes = get_registry().homes
+
+        for (lat, lon), matches in zip(points, nearest_homes(points)):
+            home_key, _, distance = matches[0]
+            expected = min(homes, key=lambda home: haversine_distance(lat, lon, *home.coordinates))
+            expected_distance = haversine_distance(lat, lon, *expected.coordinates)
+
+            self.assertEqual(home_key, expected.code)
+            self.assertAlmostEqual(distance, expected_distance, places=3)
+
+    def test_home_location_is_zero_distance(self):
+        """Test that a home's own coordinates resolve to that home"""
+        home_key, _, distance = nearest_homes([get_registry().get('barry').coordinates])[0][0]
+
+        self.assertEqual(home_key, 'barry')
+        self.assertAlmostEqual(distance, 0, places=5)
+
+
+class ResolveNearestHomesTest(TestCase):
+    """Test cases for batch location resolution"""
+
+    def test_duplicate_queries_geocoded_once(self):
+        """Test that repeated addresses share a single geocoding call"""
+        calls = []
+
+        def geocoder(query):
+            calls.append(query)
+            return (51.4816, -3.1791)
+
+        results = list(resolve_nearest_homes(['CF10 1AA', 'cf10  1aa', 'CF10 1AA '], geocoder=geocoder))
+
+        self.assertEqual(calls, ['cf10 1aa'])
+        self.assertEqual(sorted(r['index'] for r in results), [0, 1, 2])
+        self.assertTrue(all(r['home'] == 'cardiff' for r in results))
+
+    def test_mixed_and_invalid_entries(self):
+        """Test that every entry gets exactly one result or error"""
+        locations = [
+            {'lat': 51.3998, 'lon': -3.2826}, 'Nowhere', {'lat': 'x'}, 42,
+            {'lat': 91, 'lon': 0}, {'lat': 51.4, 'lon': 'nan'},
+        ]
+        results = {r['index']: r for r in resolve_nearest_homes(locations, geocoder=lambda q: None)}
+
+        self.assertEqual(set(results), {0, 1, 2, 3, 4, 5})
+        self.assertEqual(results[0]['home'], 'barry')
+        self.assertEqual(results[1]['error'], 'Location not found')
+        for index in (2, 4, 5):
+            self.assertEqual(results[index]['error'], 'Invalid latitude or longitude values')
+        self.assertIn('error', results[3])
+
+
+class FindNearestHomeBatchViewTest(TestCase):
+    """Test cases for the batch nearest-home endpoint"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('tours:find_nearest_home_batch')
+
+    def test_streams_ndjson_results(self):
+        """Test that results are streamed as newline-delimited JSON"""
+        with patch('tours.location_service.geocode_location', return_value=(51.4816, -3.1791)) as geocoder:
+            response = self.client.post(self.url, {
+                'locations': [{'lat': 51.3998, 'lon': -3.2826}, 'Cardiff', 'cardiff']
+            }, format='json')
+            body = b''.join(response.streaming_content).decode()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        results = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([r['index'] for r in results], [0, 1, 2])
+        self.assertEqual(results[0]['home'], 'barry')
+        self.assertEqual(results[2]['home'], 'cardiff')
+        geocoder.assert_called_once_with('cardiff')
+
+    def test_streams_under_asgi(self):
+        """Test that the first result reaches an ASGI client before the rest are resolved"""
+        release = asyncio.Event()
+        geocoded = []
+
+        async def geocoder(query):
+            await release.wait()
+            geocoded.append(query)
+            return (51.4816, -3.1791)
+
+        async def run():
+            body = json.dumps({'locations': [{'lat': 51.3998, 'lon': -3.2826}, 'Cardiff']}).encode()
+            requests = asyncio.Queue()
+            await requests.put({'type': 'http.request', 'body': body, 'more_body': False})
+            messages = asyncio.Queue()
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'POST',
+                'scheme': 'http', 'path': self.url, 'raw_path': self.url.encode(), 'query_string': b'',
+                'root_path': '', 'headers': [
+                    (b'host', b'testserver'), (b'content-type', b'application/json'),
+                    (b'content-length', str(len(body)).encode()),
+                ],
+                'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+            }
+            app = asyncio.create_task(ASGIHandler()(scope, requests.get, messages.put))
+
+            start = await asyncio.wait_for(messages.get(), 5)
+            first = await asyncio.wait_for(messages.get(), 5)
+            streamed_before_geocoding = not geocoded
+            release.set()
+            chunks = [first]
+            while chunks[-1].get('more_body'):
+                chunks.append(await asyncio.wait_for(messages.get(), 5))
+            await app
+            return start, first, streamed_before_geocoding, b''.join(chunk.get('body', b'') for chunk in chunks)
+
+        # Like Django's AsyncClient, keep the test transaction's connection open
+        signals.request_started.disconnect(close_old_connections)
+        signals.request_finished.disconnect(close_old_connections)
+        try:
+            with patch('tours.location_service.ageocode_location', geocoder):
+                start, first, streamed_before_geocoding, body = async_to_sync(run)()
+        finally:
+            signals.request_started.connect(close_old_connections)
+            signals.request_finished.connect(close_old_connections)
+
+        self.assertEqual(start['status'], 200)
+        self.assertTrue(streamed_before_geocoding)
+        self.assertEqual(json.loads(first['body'])['home'], 'barry')
+        results = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual([r['index'] for r in results], [0, 1])
+        self.assertEqual(results[1]['home'], 'cardiff')
+
+    def test_missing_locations(self):
+        """Test that an empty or missing list is rejected"""
+        response = self.client.post(self.url, {}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('error', response.data)
+
+    def test_body_must_be_an_object(self):
+        """Test that a JSON body that is not an object is rejected, not a server error"""
+        response = self.client.post(self.url, ['Cardiff'], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], 'locations must be a non-empty list')
@@ -0,0 +1,131 @@
+import io
+import json
+import logging
+import time
+from datetime import date, timedelta
+from unittest.mock import patch
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from bellavista_backend.log import BackgroundQueueHandler, JSONFormatter, _correlation_id, parse_log_levels
+from tours.email_service import send_booking_confirmation_email
+from tours.models import TourBooking
+
+
+class SlowStream(io.StringIO):
+    """A stdout that takes a while to accept each write"""
+
+    def write(self, text):
+        time.sleep(0.05)
+        return super().write(text)
+
+
+class StructuredLoggingTest(SimpleTestCase):
+    """Test cases for the JSON formatter and the background log writer"""
+
+    def make_record(self, **extra):
+        logger = logging.getLogger('tests.logging')
+        return logger.makeRecord(logger.name, logging.WARNING, __file__, 1, 'Email error: %s', ('timeout',), None,
+                                 extra=extra)
+
+    def test_json_lines_with_extras_and_correlation_id(self):
+        """Test the fields of a formatted record"""
+        token = _correlation_id.set('req-123')
+        try:
+            record = self.make_record(booking_id=7)
+        finally:
+            _correlation_id.reset(token)
+        entry = json.loads(JSONFormatter().format(record))
+
+        self.assertEqual(entry['level'], 'WARNING')
+        self.assertEqual(entry['logger'], 'tests.logging')
+        self.assertEqual(entry['message'], 'Email error: timeout')
+        self.assertEqual(entry['correlation_id'], 'req-123')
+        self.assertEqual(entry['booking_id'], 7)
+
+    def test_exceptions_are_included(self):
+        """Test that tracebacks end up in one JSON field"""
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            logger = logging.getLogger('tests.logging')
+            record = logger.makeRecord(logger.name, logging.ERROR, __file__, 1, 'failed', (), __import__('sys').exc_info())
+
+        entry = json.loads(JSONFormatter().format(record))
+        self.assertIn('ValueError: boom', entry['exception'])
+
+    def test_logging_does_not_wait_for_the_stream(self):
+        """Test that records are written by the background thread"""
+        stream = SlowStream()
+        handler = BackgroundQueueHandler(stream)
+        handler.setFormatter(JSONFormatter())
+        try:
+            start = time.perf_counter()
+            for _ in range(5):
+                handler.handle(self.make_record())
+            elapsed = time.perf_counter() - start
+            handler.flush()
+        finally:
+            handler.close()
+
+        self.assertLess(elapsed, 0.05)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(json.loads(lines[0])['message'], 'Email error: timeout')
+
+    def test_parse_log_levels(self):
+        """Test the LOG_LEVELS format"""
+        self.assertEqual(
+            parse_log_levels('tours=debug, bellavista.slow_queries=ERROR,,bad'),
+            {'tours': 'DEBUG', 'bellavista.slow_queries': 'ERROR'}
+        )
+
+
+class CorrelationIdTest(TestCase):
+    """Test cases for per-request correlation ids"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_generated_and_echoed(self):
+        """Test that each request gets its own id"""
+        first = self.client.get(reverse('tours:booking_stats'))['X-Request-ID']
+        second = self.client.get(reverse('tours:booking_stats'))['X-Request-ID']
+
+        self.assertEqual(len(first), 32)
+        self.assertNotEqual(first, second)
+
+    def test_incoming_id_reused_only_if_well_formed(self):
+        """Test that proxy ids are kept and junk is replaced"""
+        url = reverse('tours:booking_stats')
+
+        self.assertEqual(self.client.get(url, HTTP_X_REQUEST_ID='abc-123')['X-Request-ID'], 'abc-123')
+        self.assertNotEqual(self.client.get(url, HTTP_X_REQUEST_ID='a b\nc')['X-Request-ID'], 'a b\nc')
+
+    def test_request_logs_carry_the_id(self):
+        """Test that log lines from a booking's email thread carry the request's id"""
+        with patch('tours.views.send_booking_confirmation_email', side_effect=RuntimeError('down')), \
+                self.assertLogs('tours.views', level='ERROR') as logs:
+            response = self.client.post(reverse('tours:book_tour'), {
+                'first_name': 'John', 'email': 'john@example.com', 'phone_number': '07123456789',
+                'preferred_home': 'cardiff', 'preferred_time': '10:00',
+                'preferred_date': (date.today() + timedelta(days=7)).isoformat(),
+            }, format='json', HTTP_X_REQUEST_ID='booking-req-1')
+
+        entry = json.loads(JSONFormatter().format(logs.records[0]))
+        self.assertEqual(entry['correlation_id'], 'booking-req-1')
+        self.assertEqual(entry['booking_id'], response.data['booking_id'])
+
+    def test_email_failures_are_logged(self):
+        """Test that SendGrid errors are logged with the booking id instead of printed"""
+        booking = TourBooking.objects.create(
+            first_name='John', email='john@example.com', phone_number='07123456789',
+            preferred_home='cardiff', preferred_date=date.today(), preferred_time='10:00'
+        )
+        with patch.dict('os.environ', {'SENDGRID_API_KEY': 'key'}), \
+                patch('sendgrid.SendGridAPIClient.send', side_effect=RuntimeError('rejected')), \
+                self.assertLogs('tours.email_service', level='ERROR') as logs:
+            self.assertFalse(send_booking_confirmation_email(booking))
+
+        self.assertEqual(logs.records[0].booking_id, booking.id)
+        self.assertIn('rejected', logs.output[0])
@@ -0,0 +1,155 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from unittest.mock import patch
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from bellavista_backend.instrumentation import begin_request, end_request, track_external_call
+from bellavista_backend.metrics import registry
+
+
+@override_settings(METRICS_TOKEN='secret')
+class MetricsTest(TestCase):
+    """Test cases for request metrics and the /metrics endpoint"""
+
+    def setUp(self):
+        registry.clear()
+        self.client = APIClient()
+
+    def scrape(self, **headers):
+        headers.setdefault('HTTP_AUTHORIZATION', 'Bearer secret')
+        response = self.client.get(reverse('metrics'), **headers)
+        return response, response.content.decode()
+
+    def test_request_counts_and_latency_by_url_name(self):
+        """Test that requests are counted and timed per URL name"""
+        tomorrow = (date.today() + timedelta(days=1)).isoformat()
+        for _ in range(2):
+            self.client.get(reverse('tours:available_slots'), {'date': tomorrow, 'home': 'barry'})
+        self.client.get(reverse('tours:available_slots'))
+
+        response, text = self.scrape()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn('# TYPE bellavista_http_requests_total counter', text)
+        self.assertIn('bellavista_http_requests_total{method="GET",status="200",view="tours:available_slots"} 2', text)
+        self.assertIn('bellavista_http_requests_total{method="GET",status="400",view="tours:available_slots"} 1', text)
+        self.assertIn('bellavista_http_request_duration_seconds_count{view="tours:available_slots"} 3', text)
+        self.assertIn('bellavista_http_request_duration_seconds_bucket{view="tours:available_slots",le="+Inf"} 3', text)
+        self.assertIn('bellavista_http_response_size_bytes_count{view="tours:available_slots"} 3', text)
+
+    def test_database_queries_are_counted(self):
+        """Test that queries made by a view are attributed to it"""
+        self.client.get(reverse('tours:booking_stats'))
+
+        _, text = self.scrape()
+
+        # Two queries: the status aggregate and the per-home counts
+        self.assertIn('bellavista_http_request_db_queries_sum{view="tours:booking_stats"} 2', text)
+
+    async def test_async_views_are_measured(self):
+        """Test that async views served through the ASGI stack are recorded"""
+        await self.async_client.get(reverse('tours:find_nearest_home'), {'lat': '51.4', 'lon': '-3.27'})
+
+        response = await self.async_client.get(reverse('metrics'), headers={'Authorization': 'Bearer secret'})
+
+        self.assertIn(
+            'bellavista_http_requests_total{method="GET",status="200",view="tours:find_nearest_home"} 1',
+            response.content.decode()
+        )
+
+    def test_external_calls(self):
+        """Test that external calls are timed with their outcome"""
+        stats, token = begin_request()
+        try:
+            with track_external_call('nominatim'):
+                pass
+            with self.assertRaises(RuntimeError):
+                with track_external_call('sendgrid'):
+                    raise RuntimeError('down')
+        finally:
+            end_request(token)
+
+        _, text = self.scrape()
+
+        self.assertEqual(stats.external['nominatim'][0], 1)
+        self.assertIn('bellavista_external_call_duration_seconds_count{outcome="ok",service="nominatim",view="unmatched"} 1', text)
+        self.assertIn('bellavista_external_call_duration_seconds_count{outcome="error",service="sendgrid",view="unmatched"} 1', text)
+
+    def test_external_calls_labelled_with_view(self):
+        """Test that external calls are attributed to the view that made them, streamed or not"""
+        def geocode(query):
+            with track_external_call('nominatim'):
+                return 51.48, -3.18
+
+        with patch('tours.location_service.geocode_location', side_effect=geocode):
+            response = self.client.post(reverse('tours:find_nearest_home_batch'), {
+                'locations': ['Cardiff', 'Penarth']
+            }, format='json')
+            b''.join(response.streaming_content)
+        with track_external_call('sendgrid'):
+            pass
+
+        _, text = self.scrape()
+
+        self.assertIn(
+            'bellavista_external_call_duration_seconds_count'
+            '{outcome="ok",service="nominatim",view="tours:find_nearest_home_batch"} 2', text
+        )
+        self.assertIn('bellavista_external_call_duration_seconds_count{outcome="ok",service="sendgrid",view="none"} 1', text)
+
+    def test_metrics_are_merged_across_workers(self):
+        """Test that snapshots written by other worker processes are added in"""
+        metrics_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, metrics_dir)
+        other_worker = [
+            ['bellavista_http_requests_total', [['method', 'GET'], ['status', '200'], ['view', 'tours:booking_stats']], 5],
+        ]
+        with open(os.path.join(metrics_dir, 'metrics-999999.json'), 'w') as f:
+            json.dump(other_worker, f)
+
+        with override_settings(METRICS_DIR=metrics_dir):
+            self.client.get(reverse('tours:booking_stats'))
+            _, text = self.scrape()
+
+        self.assertIn('bellavista_http_requests_total{method="GET",status="200",view="tours:booking_stats"} 6', text)
+        self.assertTrue(os.path.exists(os.path.join(metrics_dir, f'metrics-{os.getpid()}.json')))
+
+    def test_requests_do_not_flush(self):
+        """Test that snapshots are written by the background flusher, never by the request"""
+        metrics_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, metrics_dir)
+        path = os.path.join(metrics_dir, f'metrics-{os.getpid()}.json')
+
+        with override_settings(METRICS_DIR=metrics_dir, METRICS_FLUSH_INTERVAL=0.01):
+            flushed_by = []
+            with patch('bellavista_backend.metrics.flush',
+                       side_effect=lambda: flushed_by.append(threading.current_thread())):
+                self.client.get(reverse('tours:booking_stats'))
+            self.assertNotIn(threading.current_thread(), flushed_by)
+
+            deadline = time.monotonic() + 5
+            while not os.path.exists(path) and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        with open(path) as f:
+            self.assertIn('tours:booking_stats', f.read())
+
+    def test_token_required_when_configured(self):
+        """Test that scrapes must present METRICS_TOKEN when it is set"""
+        self.assertEqual(self.scrape(HTTP_AUTHORIZATION='')[0].status_code, 403)
+        self.assertEqual(self.scrape(HTTP_AUTHORIZATION='Bearer wrong')[0].status_code, 403)
+        self.assertEqual(self.scrape()[0].status_code, 200)
+
+    @override_settings(METRICS_TOKEN='')
+    def test_open_without_token_only_in_debug(self):
+        """Test that /metrics is never served without a token when DEBUG is off"""
+        self.assertEqual(self.scrape(HTTP_AUTHORIZATION='')[0].status_code, 403)
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.scrape(HTTP_AUTHORIZATION='')[0].status_code, 200)
@@ -0,0 +1,95 @@
+import os
+import pstats
+import shutil
+import tempfile
+import tracemalloc
+from unittest.mock import patch
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from bellavista_backend.profiling import list_captures
+
+
+class ProfilingTest(TestCase):
+    """Test cases for opt-in staff request profiling"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        settings = override_settings(PROFILING_ENABLED=True, PROFILING_DIR=self.tmpdir, PROFILING_MAX_CAPTURES=2)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.staff = User.objects.create_user('staff', password='secret', is_staff=True)
+
+    def login(self, user=None):
+        self.client.force_login(user or self.staff)
+
+    def test_staff_request_is_profiled(self):
+        """Test that the profile, allocation snapshot and details are stored"""
+        self.login()
+        response = self.client.get(reverse('tours:booking_stats'), HTTP_X_PROFILE='1')
+
+        profile_id = response['X-Profile-Id']
+        download = self.client.get(response['X-Profile-Url'])
+        self.assertEqual(download.status_code, 200)
+        path = f'{self.tmpdir}/{profile_id}'
+        self.assertGreater(pstats.Stats(f'{path}.prof').total_calls, 0)
+        self.assertTrue(tracemalloc.Snapshot.load(f'{path}.tracemalloc').traces)
+        self.assertEqual(list_captures()[0]['view'], 'tours:booking_stats')
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_query_flag_async_views_and_admin(self):
+        """Test ?profile=1 on an async view and on the admin"""
+        self.staff.is_superuser = True
+        self.staff.save()
+        self.login()
+
+        api = self.client.get(reverse('tours:find_nearest_home'), {'lat': '51.4', 'lon': '-3.27', 'profile': '1'})
+        admin = self.client.get('/admin/tours/tourbooking/', {'profile': '1'})
+
+        self.assertEqual(api.status_code, 200)
+        self.assertTrue(api.has_header('X-Profile-Id'))
+        self.assertTrue(admin.has_header('X-Profile-Id'))
+
+    def test_sync_view_profiled_under_asgi(self):
+        """Test that a sync view run in a worker thread under ASGI is in the capture"""
+        self.async_client.force_login(self.staff)
+
+        response = async_to_sync(self.async_client.get)(reverse('tours:booking_stats'), {'profile': '1'})
+
+        self.assertEqual(response.status_code, 200)
+        stats = pstats.Stats(f"{self.tmpdir}/{response['X-Profile-Id']}.prof").stats
+        functions = {(os.path.basename(filename), name) for filename, _, name in stats}
+        self.assertIn(('views.py', 'booking_stats'), functions)
+        self.assertIn(('views.py', 'dispatch'), functions)  # DRF's APIView.dispatch
+
+    def test_not_profiled_without_opt_in_staff_or_setting(self):
+        """Test that only opted-in staff requests are profiled, and only when enabled"""
+        url = reverse('tours:booking_stats')
+        self.assertFalse(self.client.get(url, HTTP_X_PROFILE='1').has_header('X-Profile-Id'))
+
+        self.login(User.objects.create_user('visitor', password='secret'))
+        self.assertFalse(self.client.get(url, HTTP_X_PROFILE='1').has_header('X-Profile-Id'))
+
+        self.login()
+        self.assertFalse(self.client.get(url).has_header('X-Profile-Id'))
+        with override_settings(PROFILING_ENABLED=False):
+            self.assertFalse(self.client.get(url, HTTP_X_PROFILE='1').has_header('X-Profile-Id'))
+        with patch('bellavista_backend.profiling.random.random', return_value=0.5), \
+                override_settings(PROFILING_SAMPLE_RATE=0.1):
+            self.assertFalse(self.client.get(url, HTTP_X_PROFILE='1').has_header('X-Profile-Id'))
+
+    def test_listing_downloads_and_pruning(self):
+        """Test the staff-only listing and that old captures are pruned"""
+        self.login()
+        for _ in range(3):
+            self.client.get(reverse('tours:test_connection'), HTTP_X_PROFILE='1')
+
+        profiles = self.client.get(reverse('profile_list')).json()['profiles']
+        self.assertEqual(len(profiles), 2)
+        self.assertEqual(self.client.get(profiles[0]['downloads']['json']).status_code, 200)
+        self.assertEqual(self.client.get(reverse('profile_download', args=['..settings', 'py'])).status_code, 404)
+
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse('profile_list')).status_code, 302)
@@ -0,0 +1,70 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from rest_framework.test import APIClient
+from tours import urls as tour_urls
+from tours.models import TourBooking
+from tours.seeding import seed_bookings
+from .query_budgets import QUERY_BUDGETS, installed
+
+# Seeded bookings for the two data sizes compared
+SMALL_DATASET = 10
+LARGE_DATASET = 200
+
+
+def tour_url_names():
+    return [
+        f'{tour_urls.app_name}:{pattern.name}'
+        for pattern in tour_urls.urlpatterns
+        if isinstance(pattern, URLPattern)
+    ]
+
+
+class QueryBudgetTest(TestCase):
+    """Test that every endpoint stays within its query budget at any data size"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def count_queries(self, name):
+        """Queries one request to the URL issues, after a warm-up request"""
+        spec = QUERY_BUDGETS[name]
+        kwargs = {arg: TourBooking.objects.order_by('id').values_list('id', flat=True).first()
+                  for arg in spec.get('kwargs', ())}
+        url = reverse(name, kwargs=kwargs)
+        data = spec['data']() if 'data' in spec else None
+
+        def request():
+            response = getattr(self.client, spec['method'])(url, data, format='json')
+            if response.streaming:
+                b''.join(response.streaming_content)
+            return response
+
+        request()
+        with CaptureQueriesContext(connection) as queries:
+            response = request()
+        self.assertLess(response.status_code, 400, name)
+        return len(queries)
+
+    def test_every_url_has_a_budget(self):
+        """Test that new endpoints cannot skip the budget check"""
+        self.assertEqual(sorted(tour_url_names()), sorted(QUERY_BUDGETS))
+
+    def test_query_budgets(self):
+        """Test query counts against the budget at two data sizes"""
+        available = {name: installed(name) for name in QUERY_BUDGETS}
+        measured = [name for name in QUERY_BUDGETS if available[name]]
+
+        seed_bookings(SMALL_DATASET, seed=1)
+        small = {name: self.count_queries(name) for name in measured}
+
+        seed_bookings(LARGE_DATASET - TourBooking.objects.count(), seed=2)
+        large = {name: self.count_queries(name) for name in measured}
+
+        for name, spec in QUERY_BUDGETS.items():
+            with self.subTest(endpoint=name):
+                if not available[name]:
+                    self.skipTest(f'{name} needs {", ".join(spec["requires"])}')
+                self.assertLessEqual(large[name], spec['budget'], f'{name} is over its query budget')
+                self.assertEqual(large[name], small[name], f'{name} query count grows with the number of bookings')
@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from tours.models import TourBooking
+from tours.query_plans import check_hot_queries, full_scans
+from .query_budgets import installed_hot_endpoints
+
+
+class SlowQueryLogTest(TestCase):
+    """Test cases for the sampled slow-query log"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_SAMPLE_RATE=1.0)
+    def test_slow_queries_logged_with_view(self):
+        """Test that queries over the threshold are logged with SQL, duration and view"""
+        with self.assertLogs('bellavista.slow_queries', level='WARNING') as logs:
+            self.client.get(reverse('tours:booking_stats'))
+
+        record = logs.records[0]
+        self.assertEqual(record.view, 'tours:booking_stats')
+        self.assertIn('tours_tourbooking', record.sql)
+        self.assertGreaterEqual(record.duration_ms, 0)
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_SAMPLE_RATE=0.0)
+    def test_sampling(self):
+        """Test that unsampled slow queries are not logged"""
+        with self.assertNoLogs('bellavista.slow_queries'):
+            self.client.get(reverse('tours:booking_stats'))
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=None)
+    def test_disabled(self):
+        """Test that an empty threshold turns the log off"""
+        with self.assertNoLogs('bellavista.slow_queries'):
+            self.client.get(reverse('tours:booking_stats'))
+
+
+class ExplainHotQueriesTest(TestCase):
+    """Test cases for the EXPLAIN plan checker"""
+
+    def setUp(self):
+        for offset in range(3):
+            TourBooking.objects.create(
+                first_name='John', last_name='Doe', email='john@example.com',
+                phone_number='07123456789', preferred_home='cardiff',
+                preferred_date=date.today() + timedelta(days=7 + offset), preferred_time='10:00'
+            )
+
+    def test_hot_queries_use_indexes(self):
+        """Test that no hot booking query reads the whole bookings table"""
+        results = check_hot_queries()
+
+        self.assertEqual(
+            [result['label'] for result in results],
+            ['available_slots', 'booking_stats', 'list_bookings', 'export_tours']
+        )
+        queries = [query for result in results for query in result['queries']]
+        self.assertTrue(queries)
+        self.assertEqual([query['sql'] for query in queries if query['full_scans']], [])
+
+    def test_full_scan_detection(self):
+        """Test which plan lines count as full scans of growing tables"""
+        self.assertEqual(full_scans(['SCAN tours_tourbooking']), ['tours_tourbooking'])
+        self.assertEqual(full_scans(['SCAN TABLE tours_tourbooking']), ['tours_tourbooking'])
+        self.assertEqual(full_scans(['Seq Scan on tours_tourbooking  (cost=0.00..1.01 rows=1)']), ['tours_tourbooking'])
+        self.assertEqual(full_scans(['SCAN tours_tourbooking USING COVERING INDEX booking_created_idx']), [])
+        self.assertEqual(full_scans(['SCAN tours_carehome']), [])
+
+    def test_command_fails_on_scan(self):
+        """Test that --fail-on-scan turns flagged scans into an error"""
+        out = StringIO()
+        with patch('tours.query_plans.hot_endpoints', installed_hot_endpoints):
+            call_command('explain_hot_queries', '--fail-on-scan', stdout=out)
+            self.assertIn('0 full table scan(s) flagged', out.getvalue())
+
+            with patch('tours.query_plans.full_scans', return_value=['tours_tourbooking']):
+                with self.assertRaises(CommandError):
+                    call_command('explain_hot_queries', '--fail-on-scan', stdout=StringIO())
+
+    def test_command_fails_on_broken_endpoint(self):
+        """Test that an endpoint that errors or runs no queries is not passed silently"""
+        results = [
+            {'label': 'booking_stats', 'status': 200, 'queries': []},
+            {'label': 'export_tours', 'status': 500, 'queries': []},
+        ]
+        with patch('tours.management.commands.explain_hot_queries.check_hot_queries', return_value=results):
+            with self.assertRaisesMessage(CommandError, 'booking_stats, export_tours'):
+                call_command('explain_hot_queries', stdout=StringIO())
+            with self.assertRaisesMessage(CommandError, 'booking_stats, export_tours'):
+                call_command('explain_hot_queries', '--fail-on-scan', stdout=StringIO())
@@ -0,0 +1,109 @@
+from django.test import TestCase
+from datetime import date, timedelta
+from unittest.mock import patch
+from django.db import DatabaseError
+from tours.models import CareHome
+from tours.registry import _refresh, get_registry, invalidate_registry
+from tours.serializers import TourBookingCreateSerializer
+from tours.location_service import nearest_homes
+
+
+class CareHomeRegistryTest(TestCase):
+    """Test cases for the database-backed care home registry"""
+
+    def tearDown(self):
+        """Drop any snapshot holding rows rolled back with the test transaction"""
+        invalidate_registry()
+
+    def add_home(self, **overrides):
+        """Create a care home with sensible defaults"""
+        data = {
+            'code': 'swansea',
+            'display_name': 'Swansea',
+            'name': 'Bellavista Swansea',
+            'address': 'Swansea, Wales, UK',
+            'latitude': 51.6214,
+            'longitude': -3.9436,
+            'phone': '01792 000 000',
+        }
+        data.update(overrides)
+        return CareHome.objects.create(**data)
+
+    def test_seeded_homes_match_original_choices(self):
+        """Test that the migration seeds the original homes"""
+        registry = get_registry()
+
+        self.assertEqual(dict(registry.choices), {
+            'cardiff': 'Cardiff', 'barry': 'Barry', 'waverley': 'Waverley', 'college-fields': 'College Fields',
+        })
+        self.assertEqual(registry.get('barry').name, 'Bellavista Barry')
+        self.assertEqual(registry.display_name('college-fields'), 'College Fields')
+
+    def test_unknown_code_display_name(self):
+        """Test that unknown codes fall back to the code itself"""
+        self.assertEqual(get_registry().display_name('unknown'), 'unknown')
+
+    def test_unmigrated_table_serves_migration_seed(self):
+        """Test that the homes seeded by the migration are served until it has run"""
+        invalidate_registry()
+        with patch('tours.registry._load_homes', side_effect=DatabaseError('no such table')):
+            registry = _refresh()
+
+        self.assertEqual(registry.get('barry').coordinates, (51.3998, -3.2826))
+        self.assertEqual(len(registry.homes), 4)
+
+    def test_registry_invalidated_after_commit(self):
+        """Test that the shared version is bumped only once the change commits"""
+        before = get_registry()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.add_home()
+
+        self.assertIs(get_registry(), before)
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertIn('swansea', get_registry())
+
+    def test_new_home_visible_without_restart(self):
+        """Test that adding a home invalidates the snapshot"""
+        before = get_registry()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_home()
+        after = get_registry()
+
+        self.assertIsNot(before, after)
+        self.assertIn('swansea', after)
+        self.assertEqual(nearest_homes([(51.62, -3.94)])[0][0][0], 'swansea')
+
+    def test_new_home_bookable(self):
+        """Test that bookings validate against the registry"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_home()
+        data = {
+            'first_name': 'Jane',
+            'email': 'jane@example.com',
+            'phone_number': '+1234567890',
+            'preferred_home': 'swansea',
+            'preferred_date': date.today() + timedelta(days=1),
+            'preferred_time': '10:00',
+        }
+
+        serializer = TourBookingCreateSerializer(data=data)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        booking = serializer.save()
+        self.assertEqual(booking.get_home_display_name(), 'Swansea')
+
+        data['preferred_home'] = 'atlantis'
+        serializer = TourBookingCreateSerializer(data=data)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('preferred_home', serializer.errors)
+
+    def test_inactive_home_hidden(self):
+        """Test that inactive homes keep their name but are not bookable or searchable"""
+        CareHome.objects.filter(code='barry').update(is_active=False)
+        invalidate_registry()
+        registry = get_registry()
+
+        self.assertFalse(registry.is_bookable('barry'))
+        self.assertEqual(registry.display_name('barry'), 'Barry')
+        self.assertNotIn('barry', dict(registry.choices))
+        self.assertNotEqual(nearest_homes([(51.3998, -3.2826)])[0][0][0], 'barry')
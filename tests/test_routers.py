@@ -0,0 +1,121 @@
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from datetime import date, timedelta
+from unittest.mock import patch
+from rest_framework.test import APIClient
+from rest_framework import status
+from bellavista_backend.routers import PIN_KEY, ReplicaRouter, replica_reads
+from tours.models import TourBooking
+
+
+@patch('bellavista_backend.routers.replica_configured', return_value=True)
+class ReplicaRouterTest(TestCase):
+    """Test cases for routing reporting reads to the read replica"""
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.request = RequestFactory().get('/api/tours/stats/')
+
+    def test_reads_use_primary_by_default(self, _):
+        """Test that ordinary reads are left on the primary"""
+        self.assertIsNone(self.router.db_for_read(TourBooking))
+        self.assertEqual(self.router.db_for_write(TourBooking), 'default')
+
+    def test_reporting_reads_use_replica(self, _):
+        """Test that reads inside replica_reads go to the replica"""
+        self.request.pinned_to_primary = False
+        with replica_reads(self.request):
+            self.assertEqual(self.router.db_for_read(TourBooking), 'replica')
+            self.assertEqual(self.router.db_for_write(TourBooking), 'default')
+
+        self.assertIsNone(self.router.db_for_read(TourBooking))
+
+    def test_pinned_client_reads_primary(self, _):
+        """Test that a client who wrote recently keeps reading the primary"""
+        self.request.pinned_to_primary = True
+        with replica_reads(self.request):
+            self.assertIsNone(self.router.db_for_read(TourBooking))
+
+
+@override_settings(REPLICA_STICKINESS_SECONDS=30)
+class ReplicaPinningMiddlewareTest(TestCase):
+    """Test cases for read-your-writes stickiness"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.pin_key = PIN_KEY.format(ident='127.0.0.1')
+        cache.clear()
+
+    def booking_data(self):
+        return {
+            'first_name': 'John',
+            'email': 'john@example.com',
+            'phone_number': '+1234567890',
+            'preferred_home': 'cardiff',
+            'preferred_date': (date.today() + timedelta(days=1)).isoformat(),
+            'preferred_time': '10:00',
+        }
+
+    def test_write_pins_client(self):
+        """Test that a successful booking pins the client to the primary"""
+        with patch('bellavista_backend.routers.replica_configured', return_value=True), \
+                patch('django.core.cache.cache.set', wraps=cache.set) as cache_set:
+            response = self.client.post(reverse('tours:book_tour'), self.booking_data(), format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        cache_set.assert_any_call(self.pin_key, 1, 30)
+        self.assertEqual(response.cookies, {})
+
+    def test_read_only_post_does_not_pin(self):
+        """Test that a POST which writes nothing leaves the client on the replica"""
+        with patch('bellavista_backend.routers.replica_configured', return_value=True):
+            response = self.client.post(reverse('tours:find_nearest_home_batch'), {
+                'locations': [{'lat': 51.4816, 'lon': -3.1791}]
+            }, format='json')
+            b''.join(response.streaming_content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(cache.get(self.pin_key))
+
+    @override_settings(VIEW_CACHE_ENABLED=True)
+    def test_pinned_client_bypasses_stats_cache(self):
+        """Test that stats cached from a lagging replica are not served to a pinned client"""
+        url = reverse('tours:booking_stats')
+        # The test database stands in for the replica
+        with patch('bellavista_backend.routers.replica_configured', return_value=True), \
+                patch('bellavista_backend.routers.REPLICA_ALIAS', 'default'):
+            self.client.get(url)  # cached for unpinned clients
+            self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+            cache.set(self.pin_key, 1, 30)
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('X-Cache', response)
+
+    @override_settings(VIEW_CACHE_ENABLED=True)
+    def test_cross_origin_write_pins_client(self):
+        """Test that the frontend on another origin, which sends no cookies, is pinned after a booking"""
+        origin = {'HTTP_ORIGIN': 'http://localhost:3000'}
+        url = reverse('tours:booking_stats')
+        with patch('bellavista_backend.routers.replica_configured', return_value=True), \
+                patch('bellavista_backend.routers.REPLICA_ALIAS', 'default'):
+            self.client.get(url, **origin)
+            self.assertEqual(self.client.get(url, **origin)['X-Cache'], 'HIT')
+
+            response = self.client.post(reverse('tours:book_tour'), self.booking_data(), format='json', **origin)
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+            self.client.cookies.clear()
+            response = self.client.get(url, **origin)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('X-Cache', response)
+        self.assertEqual(response.data['total_bookings'], 1)
+
+    def test_no_pin_without_replica(self):
+        """Test that nothing is pinned when no replica is configured"""
+        self.client.post(reverse('tours:book_tour'), self.booking_data(), format='json')
+
+        self.assertIsNone(cache.get(self.pin_key))
@@ -0,0 +1,92 @@
+from datetime import date
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.db.models.signals import post_delete
+from django.test import TestCase
+from tours.cache import namespace_version
+from tours.models import TourBooking
+from tours.seeding import SeedBooking, generate_bookings, seed_bookings
+from .query_budgets import installed_hot_endpoints
+
+
+def booking_fields(booking):
+    return (
+        booking.first_name, booking.last_name, booking.email, booking.phone_number,
+        booking.preferred_home, booking.preferred_date, booking.preferred_time,
+        booking.notes, booking.status, booking.created_at,
+    )
+
+
+class SeedBookingsTest(TestCase):
+    """Test cases for the synthetic booking generator"""
+
+    today = date(2026, 3, 2)
+
+    def test_same_seed_same_data(self):
+        """Test that generation is deterministic by seed"""
+        first = [booking_fields(b) for b in generate_bookings(50, seed=7, today=self.today)]
+        again = [booking_fields(b) for b in generate_bookings(50, seed=7, today=self.today)]
+        other = [booking_fields(b) for b in generate_bookings(50, seed=8, today=self.today)]
+
+        self.assertEqual(first, again)
+        self.assertNotEqual(first, other)
+
+    def test_realistic_distributions(self):
+        """Test date range, status mix and creation times"""
+        bookings = list(generate_bookings(2000, seed=1, today=self.today, days_back=90, days_ahead=30))
+        homes = [b.preferred_home for b in bookings]
+
+        self.assertTrue(all(-90 <= (b.preferred_date - self.today).days <= 30 for b in bookings))
+        self.assertTrue(all(b.status == 'pending' for b in bookings if b.preferred_date >= self.today))
+        self.assertEqual(
+            {b.status for b in bookings if b.preferred_date < self.today},
+            {'pending', 'visited', 'not_visited'}
+        )
+        self.assertTrue(all(b.created_at.date() <= min(b.preferred_date, self.today) for b in bookings))
+        # The first home in the registry is the most popular
+        self.assertEqual(max(set(homes), key=homes.count), 'cardiff')
+
+    def test_chunked_insert_keeps_timestamps(self):
+        """Test that every chunk is inserted with the generated created_at"""
+        progress = []
+        expected = [booking_fields(b) for b in generate_bookings(23, seed=3, today=self.today)]
+        version = namespace_version('bookings')
+
+        with patch('tours.seeding.SeedBooking.objects.bulk_create', wraps=SeedBooking.objects.bulk_create) as bulk, \
+                patch('tours.seeding.SeedBooking.objects.bulk_update') as bulk_update:
+            inserted = seed_bookings(23, seed=3, chunk_size=10, progress=progress.append, today=self.today)
+
+        self.assertEqual(inserted, 23)
+        self.assertEqual(progress, [10, 20, 23])
+        self.assertEqual(bulk.call_count, 3)
+        bulk_update.assert_not_called()
+        self.assertEqual([booking_fields(b) for b in TourBooking.objects.order_by('id')], expected)
+        self.assertNotEqual(namespace_version('bookings'), version)
+
+    def test_command(self):
+        """Test the management command and --clear"""
+        call_command('seed_bookings', '--count', '15', '--chunk-size', '4', stdout=StringIO())
+        version = namespace_version('bookings')
+
+        deleted = []
+        post_delete.connect(lambda **kwargs: deleted.append(kwargs['instance']), sender=TourBooking, weak=False,
+                            dispatch_uid='test_seed_clear')
+        self.addCleanup(post_delete.disconnect, sender=TourBooking, dispatch_uid='test_seed_clear')
+
+        out = StringIO()
+        call_command('seed_bookings', '--count', '5', '--clear', stdout=out)
+
+        self.assertIn('Deleted 15 existing bookings', out.getvalue())
+        self.assertEqual(TourBooking.objects.count(), 5)
+        self.assertNotEqual(namespace_version('bookings'), version)
+        self.assertEqual(deleted, [])
+
+    def test_explain_with_throwaway_dataset(self):
+        """Test that explain_hot_queries can seed data and rolls it back"""
+        out = StringIO()
+        with patch('tours.query_plans.hot_endpoints', installed_hot_endpoints):
+            call_command('explain_hot_queries', '--seed-bookings', '200', stdout=out)
+
+        self.assertIn('200 bookings in the database', out.getvalue())
+        self.assertEqual(TourBooking.objects.count(), 0)
@@ -0,0 +1,102 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from bellavista_backend.instrumentation import RequestStats, begin_request, end_request, server_timing, track
+
+
+def timing_names(response):
+    return [metric.strip().split(';')[0] for metric in response['Server-Timing'].split(',')]
+
+
+@override_settings(SERVER_TIMING_ENABLED=True)
+class ServerTimingTest(TestCase):
+    """Test cases for the Server-Timing header and request phase hooks"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.tour_date = date.today() + timedelta(days=7)
+
+    def test_header_breaks_down_db_and_serialization(self):
+        """Test that responses report DB time and count, serialization and total"""
+        response = self.client.get(reverse('tours:available_slots'), {
+            'date': self.tour_date.isoformat(), 'home': 'barry'
+        })
+
+        self.assertEqual(timing_names(response), ['db', 'serialize', 'total'])
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="1 query"')
+
+    def test_booking_phases_and_email_call(self):
+        """Test that a booking reports validation, insert, email join and the SendGrid call"""
+        def send(booking):
+            from bellavista_backend.instrumentation import track_external_call
+            with track_external_call('sendgrid'):
+                return True
+
+        with patch('tours.views.send_booking_confirmation_email', side_effect=send):
+            response = self.client.post(reverse('tours:book_tour'), {
+                'first_name': 'John', 'last_name': 'Doe', 'email': 'john@example.com',
+                'phone_number': '07123456789', 'preferred_home': 'cardiff',
+                'preferred_date': self.tour_date.isoformat(), 'preferred_time': '10:00'
+            }, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            timing_names(response),
+            ['db', 'ext-sendgrid', 'validate', 'insert', 'email', 'serialize', 'total']
+        )
+        self.assertIn('ext-sendgrid;dur=', response['Server-Timing'])
+        self.assertIn('desc="1 call"', response['Server-Timing'])
+
+    def test_async_views_report_through_the_same_hooks(self):
+        """Test that async views get the header and test_connection reads the hooks"""
+        response = self.client.get(reverse('tours:test_connection'))
+
+        self.assertEqual(timing_names(response), ['db', 'serialize', 'total'])
+        self.assertEqual(response.data['performance']['db_queries'], 1)
+
+    @override_settings(SERVER_TIMING_ENABLED=False)
+    def test_disabled(self):
+        """Test that the header is only sent when enabled"""
+        response = self.client.get(reverse('tours:booking_stats'))
+
+        self.assertFalse(response.has_header('Server-Timing'))
+
+
+class RequestPhaseTest(TestCase):
+    """Test cases for the phase timing hook"""
+
+    def test_track_accumulates_phases(self):
+        """Test that repeated phases add up and nested requests share stats"""
+        stats, token = begin_request()
+        try:
+            inner, inner_token = begin_request()
+            end_request(inner_token)
+            with track('serialize'):
+                pass
+            with track('serialize'):
+                pass
+        finally:
+            end_request(token)
+
+        self.assertIs(inner, stats)
+        self.assertEqual(list(stats.phases), ['serialize'])
+
+    def test_track_outside_request(self):
+        """Test that tracking without a request in progress is a no-op"""
+        with track('serialize'):
+            pass
+
+    def test_header_format(self):
+        """Test the header value layout"""
+        stats = RequestStats()
+        stats.db_queries = 2
+        stats.db_seconds = 0.0042
+        stats.external['nominatim'] = [1, 0.25]
+        stats.phases['serialize'] = 0.001
+
+        self.assertEqual(
+            server_timing(stats, 0.3),
+            'db;dur=4.2;desc="2 queries", ext-nominatim;dur=250.0;desc="1 call", serialize;dur=1.0, total;dur=300.0'
+        )
@@ -0,0 +1,54 @@
+from django.test import SimpleTestCase
+from tours.spatial_index import SphericalIndex
+from tours.views import haversine_distance
+import random
+
+
+class SphericalIndexTest(SimpleTestCase):
+    """Test cases for the unit-sphere k-d tree"""
+
+    def setUp(self):
+        """Build an index over random sites across Great Britain"""
+        rng = random.Random(42)
+        self.sites = [
+            (f'site-{i}', rng.uniform(50.0, 58.5), rng.uniform(-5.5, 1.7))
+            for i in range(500)
+        ]
+        self.index = SphericalIndex(self.sites)
+
+    def brute_force(self, lat, lon):
+        """Return every site sorted by haversine distance"""
+        return sorted(
+            (haversine_distance(lat, lon, site_lat, site_lon), key)
+            for key, site_lat, site_lon in self.sites
+        )
+
+    def test_nearest_k_matches_linear_scan(self):
+        """Test that nearest-k results match a full haversine scan"""
+        rng = random.Random(7)
+        for _ in range(50):
+            lat, lon = rng.uniform(50.0, 58.5), rng.uniform(-5.5, 1.7)
+            expected = self.brute_force(lat, lon)[:5]
+            results = self.index.nearest(lat, lon, k=5)
+
+            self.assertEqual([key for key, _ in results], [key for _, key in expected])
+            for (_, distance), (expected_distance, _) in zip(results, expected):
+                self.assertAlmostEqual(distance, expected_distance, places=3)
+
+    def test_within_radius_matches_linear_scan(self):
+        """Test that radius queries return exactly the sites in range"""
+        lat, lon = 51.4816, -3.1791
+        expected = [key for distance, key in self.brute_force(lat, lon) if distance <= 60]
+        results = self.index.within(lat, lon, 60)
+
+        self.assertEqual([key for key, _ in results], expected)
+        self.assertTrue(all(distance <= 60 for _, distance in results))
+
+    def test_empty_and_small_indexes(self):
+        """Test edge cases with no sites or fewer sites than requested"""
+        self.assertEqual(SphericalIndex([]).nearest(51.5, -3.2), [])
+        self.assertEqual(SphericalIndex([]).within(51.5, -3.2, 10), [])
+
+        index = SphericalIndex([('only', 51.5, -3.2)])
+        self.assertEqual([key for key, _ in index.nearest(0, 0, k=3)], ['only'])
+        self.assertEqual(len(index), 1)
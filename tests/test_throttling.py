@@ -0,0 +1,166 @@
+import threading
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from tours.location_service import prime_geocode
+from tours.throttling import TokenBucket, parse_rate
+
+NOW = 1_800_000_000.0
+RATES = {'booking': '3/min', 'geocoding': '2/min'}
+LOCATION = {'lat': '51.48', 'lon': '-3.18'}
+
+
+class TokenBucketTest(SimpleTestCase):
+    """Test cases for the shared-cache token bucket"""
+
+    def setUp(self):
+        cache.clear()
+
+    def consume(self, bucket, at, tokens=1):
+        with patch('tours.throttling.time.time', return_value=at):
+            return bucket.consume('throttle:test:client', tokens)
+
+    def test_parse_rate(self):
+        """Test DRF-style rate strings"""
+        self.assertEqual(parse_rate('10/min'), (10, 60))
+        self.assertEqual(parse_rate('5/s'), (5, 1))
+        self.assertEqual(parse_rate('100/hour'), (100, 3600))
+        self.assertEqual(parse_rate('1000/day'), (1000, 86400))
+
+    def test_burst_then_refill(self):
+        """Test that a full bucket allows a burst, then one request per interval"""
+        bucket = TokenBucket(3, 60)
+
+        self.assertEqual([self.consume(bucket, NOW) for _ in range(3)], [0, 0, 0])
+        self.assertEqual(self.consume(bucket, NOW), 20)
+        self.assertEqual(self.consume(bucket, NOW + 5), 15)
+
+        # Refused requests take no tokens: one refills after 20 seconds
+        self.assertEqual(self.consume(bucket, NOW + 20), 0)
+        self.assertGreater(self.consume(bucket, NOW + 20), 0)
+
+    def test_consume_several_tokens(self):
+        """Test that a multi-token request takes all of its tokens or none"""
+        bucket = TokenBucket(3, 60)
+
+        self.assertEqual(self.consume(bucket, NOW, tokens=2), 0)
+        self.assertEqual(self.consume(bucket, NOW, tokens=2), 20)
+        self.assertEqual(self.consume(bucket, NOW), 0)
+
+    def test_idle_bucket_refills_to_capacity(self):
+        """Test that an idle client gets a full burst again, but no more"""
+        bucket = TokenBucket(3, 60)
+        for _ in range(3):
+            self.consume(bucket, NOW)
+
+        later = NOW + 3600
+        self.assertEqual([self.consume(bucket, later) for _ in range(3)], [0, 0, 0])
+        self.assertGreater(self.consume(bucket, later), 0)
+
+    def test_concurrent_requests_never_exceed_capacity(self):
+        """Test that atomic counters hold the limit under concurrent requests"""
+        bucket = TokenBucket(10, 3600)
+        results = []
+
+        def client():
+            for _ in range(5):
+                results.append(bucket.consume('throttle:test:shared'))
+
+        threads = [threading.Thread(target=client) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results.count(0), 10)
+
+
+@override_settings(RATE_LIMIT_ENABLED=True, THROTTLE_RATES=RATES)
+class RateLimitedEndpointTest(TestCase):
+    """Test cases for throttled booking and geocoding endpoints"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_booking_throttled_with_retry_after(self):
+        """Test that bookings beyond the burst get a 429 with Retry-After"""
+        url = reverse('tours:book_tour')
+        for _ in range(3):
+            self.assertEqual(self.client.post(url, {}, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(url, {}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '20')
+        self.assertIn('throttled', response.data['detail'])
+
+    def test_async_nearest_home_throttled(self):
+        """Test that the async geocoding endpoint is throttled too"""
+        url = reverse('tours:find_nearest_home')
+        for _ in range(2):
+            self.assertEqual(self.client.get(url, LOCATION).status_code, status.HTTP_200_OK)
+
+        response = self.client.get(url, LOCATION)
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '30')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertIn('throttled', response.json()['detail'])
+
+    def test_buckets_per_client_and_endpoint(self):
+        """Test that clients and endpoints do not share buckets"""
+        nearest = reverse('tours:find_nearest_home')
+        for _ in range(2):
+            self.client.get(nearest, LOCATION)
+        self.assertEqual(self.client.get(nearest, LOCATION).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        other_client = self.client.get(nearest, LOCATION, REMOTE_ADDR='10.0.0.2')
+        other_endpoint = self.client.get(reverse('tours:find_nearest_home_with_slots'), LOCATION)
+
+        self.assertEqual(other_client.status_code, status.HTTP_200_OK)
+        self.assertEqual(other_endpoint.status_code, status.HTTP_200_OK)
+
+    def test_batch_charged_per_uncached_address(self):
+        """Test that a batch takes one token per address that may need geocoding"""
+        url = reverse('tours:find_nearest_home_batch')
+        prime_geocode('barry', (51.40, -3.28))
+        locations = ['Cardiff', 'Penarth', 'barry', {'lat': 51.48, 'lon': -3.18}]
+
+        with patch('tours.location_service.geocode_location', return_value=(51.48, -3.18)):
+            response = self.client.post(url, {'locations': locations}, format='json')
+            b''.join(response.streaming_content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Both tokens went on the two new addresses; cached ones are free
+        response = self.client.post(url, {'locations': ['barry']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '30')
+
+    def test_batch_larger_than_bucket_rejected(self):
+        """Test that a batch needing more lookups than a full bucket is refused outright"""
+        response = self.client.post(reverse('tours:find_nearest_home_batch'), {
+            'locations': ['Cardiff', 'Penarth', 'Barry']
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('A maximum of 2 new addresses', response.data['locations'][0])
+
+    def test_cache_failure_lets_requests_through(self):
+        """Test that a cache outage does not take the endpoints down"""
+        with patch('tours.throttling.cache.incr', side_effect=ConnectionError('Connection refused')), \
+                self.assertLogs('tours.throttling', 'WARNING'):
+            response = self.client.get(reverse('tours:find_nearest_home'), LOCATION)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(RATE_LIMIT_ENABLED=False)
+    def test_disabled(self):
+        """Test that RATE_LIMIT_ENABLED=False turns throttling off"""
+        url = reverse('tours:find_nearest_home')
+        responses = [self.client.get(url, LOCATION) for _ in range(5)]
+
+        self.assertEqual({response.status_code for response in responses}, {status.HTTP_200_OK})
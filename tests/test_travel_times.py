@@ -0,0 +1,97 @@
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+from django.core.management import call_command
+from django.urls import reverse
+from unittest.mock import AsyncMock, patch
+from rest_framework.test import APIClient
+from rest_framework import status
+from tours.travel_times import (
+    TravelTimeMatrix, atravel_minutes, estimate_minutes, get_travel_matrix, outcode_from_location, reset_travel_matrix, travel_minutes,
+)
+from io import StringIO
+import os
+import tempfile
+import threading
+
+
+class TravelTimeHelpersTest(TestCase):
+    """Test cases for travel time estimation helpers"""
+
+    def test_outcode_from_location(self):
+        """Test outcode extraction from postcodes and non-postcodes"""
+        self.assertEqual(outcode_from_location('CF10 1AA'), 'CF10')
+        self.assertEqual(outcode_from_location('cf101aa'), 'CF10')
+        self.assertEqual(outcode_from_location(' cf62 '), 'CF62')
+        self.assertEqual(outcode_from_location('SW1A 1AA'), 'SW1A')
+        self.assertIsNone(outcode_from_location('Cardiff, UK'))
+
+    def test_estimate_converts_miles_to_km(self):
+        """Test that the straight-line estimate treats distance as miles"""
+        # 25 miles is ~40 km, one hour at AVERAGE_SPEED_KMH
+        self.assertEqual(estimate_minutes(25), 60)
+
+
+class TravelTimeMatrixTest(TestCase):
+    """Test cases for building and reading the travel time matrix"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.matrix_path = os.path.join(self.tmpdir.name, 'travel_times.bin')
+        self.override = override_settings(TRAVEL_TIME_MATRIX_PATH=self.matrix_path)
+        self.override.enable()
+        reset_travel_matrix()
+
+        outcodes = os.path.join(self.tmpdir.name, 'outcodes.csv')
+        with open(outcodes, 'w') as f:
+            f.write('outcode,latitude,longitude\nCF10,51.4750,-3.1750\nCF62,51.4050,-3.2700\n')
+        routes = os.path.join(self.tmpdir.name, 'routes.csv')
+        with open(routes, 'w') as f:
+            f.write('outcode,home,minutes\nCF10,barry,27\n')
+
+        call_command('build_travel_matrix', outcodes=outcodes, routes=routes, stdout=StringIO())
+
+    def tearDown(self):
+        self.override.disable()
+        reset_travel_matrix()
+        self.tmpdir.cleanup()
+
+    def test_routed_and_estimated_entries(self):
+        """Test that routed times are stored and gaps are filled with estimates"""
+        matrix = get_travel_matrix()
+
+        self.assertEqual(matrix.lookup('CF10', 'barry'), 27)
+        self.assertIsNotNone(matrix.lookup('CF62', 'cardiff'))
+        self.assertIsNone(matrix.lookup('ZZ99', 'cardiff'))
+
+    def test_travel_minutes_prefers_matrix(self):
+        """Test that postcodes read from the matrix and other input is estimated"""
+        self.assertEqual(travel_minutes('CF10 1AA', 'barry', 100), 27)
+        self.assertEqual(travel_minutes('Cardiff', 'barry', 100), estimate_minutes(100))
+
+    def test_async_lookup_loads_matrix_off_the_event_loop(self):
+        """Test that the first async lookup reads the matrix file in a worker thread"""
+        loads = []
+        original = TravelTimeMatrix.load
+
+        def load(path):
+            loads.append(threading.current_thread())
+            return original(path)
+
+        async def lookup():
+            return threading.current_thread(), await atravel_minutes('CF10 1AA', 'barry', 100)
+
+        with patch.object(TravelTimeMatrix, 'load', side_effect=load):
+            loop_thread, minutes = async_to_sync(lookup)()
+
+        self.assertEqual(minutes, 27)
+        self.assertEqual(len(loads), 1)
+        self.assertIsNot(loads[0], loop_thread)
+
+    def test_find_nearest_home_uses_matrix(self):
+        """Test that the endpoint reports the matrix travel time for postcodes"""
+        client = APIClient()
+        with patch('tours.views.ageocode_location', AsyncMock(return_value=(51.40, -3.28))):
+            response = client.get(reverse('tours:find_nearest_home'), {'location': 'CF10 1AA'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['duration'], '27 minutes')
@@ -1,5 +1,6 @@
 from django.test import TestCase
-from tours.constants import HOME_LOCATIONS, AVERAGE_SPEED_KMH
+from tours.constants import AVERAGE_SPEED_KMH
+from tours.registry import get_registry
 from tours.views import haversine_distance
 import math
 
@@ -8,21 +9,20 @@ class ConstantsTest(TestCase):
     """Test cases for constants and utility functions"""
 
     def test_home_locations_structure(self):
-        """Test that HOME_LOCATIONS has correct structure"""
+        """Test that the seeded homes have every field filled in"""
         required_keys = ['cardiff', 'barry', 'waverley', 'college-fields']
 
         for key in required_keys:
-            self.assertIn(key, HOME_LOCATIONS)
-            home = HOME_LOCATIONS[key]
+            self.assertIn(key, get_registry())
+            home = get_registry().get(key)
 
             # Check required fields
-            self.assertIn('name', home)
-            self.assertIn('address', home)
-            self.assertIn('coordinates', home)
-            self.assertIn('phone', home)
+            self.assertTrue(home.name)
+            self.assertTrue(home.address)
+            self.assertTrue(home.phone)
 
             # Check coordinates format
-            coords = home['coordinates']
+            coords = home.coordinates
             self.assertIsInstance(coords, tuple)
             self.assertEqual(len(coords), 2)
             self.assertIsInstance(coords[0], (int, float))  # latitude
@@ -30,8 +30,8 @@ class ConstantsTest(TestCase):
 
     def test_home_locations_coordinates_reasonable(self):
         """Test that coordinates are in reasonable range for UK"""
-        for home_key, home_data in HOME_LOCATIONS.items():
-            lat, lon = home_data['coordinates']
+        for home in get_registry().homes:
+            lat, lon = home.coordinates
 
             # UK latitude range (roughly)
             self.assertGreaterEqual(lat, 49.0)
@@ -140,27 +140,11 @@ class HaversineDistanceTest(TestCase):
 class HomeChoiceValidationTest(TestCase):
     """Test validation of home choices"""
 
-    def test_home_choices_match_constants(self):
-        """Test that model choices match constants"""
-        from tours.models import TourBooking
-
-        model_choices = dict(TourBooking.HOME_CHOICES)
-        constant_keys = set(HOME_LOCATIONS.keys())
-
-        # All model choices should have corresponding constants
-        for choice_key in model_choices.keys():
-            self.assertIn(choice_key, constant_keys)
-
-        # All constants should have corresponding model choices
-        for const_key in constant_keys:
-            self.assertIn(const_key, model_choices)
-
     def test_home_choice_values(self):
         """Test that home choice values are user-friendly"""
-        from tours.models import TourBooking
-
-        choices = dict(TourBooking.HOME_CHOICES)
+        choices = dict(get_registry().choices)
 
+        self.assertEqual(set(choices), {'cardiff', 'barry', 'waverley', 'college-fields'})
         # Values should be properly capitalized and readable
         for key, value in choices.items():
             self.assertIsInstance(value, str)
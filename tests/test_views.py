@@ -1,3 +1,6 @@
+import importlib.util
+from io import BytesIO
+from unittest import skipUnless
 from django.test import TestCase
 from django.urls import reverse
 from django.core import mail
@@ -189,6 +192,28 @@ class TourBookingViewsTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         self.assertFalse(response.data['success'])
 
+    @skipUnless(importlib.util.find_spec('openpyxl'), 'Excel export needs openpyxl')
+    def test_export_tours_view(self):
+        """Test that the Excel export streams one row per matching booking"""
+        from openpyxl import load_workbook
+
+        for booking_status in ('pending', 'visited', 'pending'):
+            TourBooking.objects.create(
+                first_name='Test', email='test@example.com', phone_number='+1234567890',
+                preferred_home='cardiff', preferred_date=date.today() + timedelta(days=1),
+                preferred_time='10:00', status=booking_status,
+            )
+
+        response = self.client.get(reverse('tours:export_tours'), {'status': 'pending'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertIn('tour_bookings_pending.xlsx', response['Content-Disposition'])
+        sheet = load_workbook(BytesIO(b''.join(response.streaming_content)))['Tour Bookings']
+        rows = list(sheet.values)
+        self.assertEqual(rows[0][:2], ('ID', 'First Name'))
+        self.assertEqual([row[9] for row in rows[1:]], ['Pending', 'Pending'])
+
     def test_test_connection_view(self):
         """Test test_connection view"""
         # Create a test booking
@@ -227,6 +252,16 @@ class TourBookingViewsTest(TestCase):
         self.assertIn('nearest_home', response.data)
         self.assertIn('distance', response.data)
 
+    def test_find_nearest_home_view_out_of_range_coordinates(self):
+        """Test that coordinates outside the valid ranges are rejected"""
+        url = reverse('tours:find_nearest_home_with_slots')
+        for lat, lon in (('91', '0'), ('51.48', '-181'), ('nan', '-3.18'), ('inf', '0')):
+            with self.subTest(lat=lat, lon=lon):
+                response = self.client.get(url, {'lat': lat, 'lon': lon})
+
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(response.data['error'], 'Invalid latitude or longitude values')
+
     def test_find_nearest_home_view_missing_params(self):
         """Test find_nearest_home view with missing parameters"""
         url = reverse('tours:find_nearest_home')
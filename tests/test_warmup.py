@@ -0,0 +1,106 @@
+from datetime import date, timedelta
+from io import StringIO
+from unittest.mock import patch
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from tours.location_service import geocode_location
+from tours.models import GeocodedLocation
+from tours.warmup import warm_caches_in_background
+
+
+@override_settings(VIEW_CACHE_ENABLED=True)
+class WarmCachesCommandTest(TestCase):
+    """Test cases for manage.py warm_caches"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def warm(self, *args):
+        out = StringIO()
+        call_command('warm_caches', *args, stdout=out)
+        return out.getvalue()
+
+    def test_warms_availability_and_stats(self):
+        """Test that the first visitor after warm-up gets cache hits"""
+        output = self.warm('--days', '3', '--geocodes', '0')
+        self.assertIn('Warmed 12 availability entries, 1 stats', output)
+
+        tomorrow = (date.today() + timedelta(days=1)).isoformat()
+        slots = self.client.get(reverse('tours:available_slots'), {'date': tomorrow, 'home': 'barry'})
+        stats = self.client.get(reverse('tours:booking_stats'))
+
+        self.assertEqual(slots['X-Cache'], 'HIT')
+        self.assertEqual(stats['X-Cache'], 'HIT')
+
+    def test_warms_most_frequent_geocodes_without_nominatim(self):
+        """Test that recorded locations are restored without upstream calls"""
+        GeocodedLocation.objects.create(query='cf10 1aa', latitude=51.48, longitude=-3.18, lookup_count=9)
+        GeocodedLocation.objects.create(query='rare place', latitude=52.0, longitude=-3.0, lookup_count=1)
+
+        self.warm('--days', '0', '--geocodes', '1')
+
+        with patch('tours.location_service.get_geocoding_client') as client:
+            client.return_value.geocode.return_value = (0.0, 0.0)
+            self.assertEqual(geocode_location('CF10  1AA'), (51.48, -3.18))
+            self.assertEqual(geocode_location('Rare Place'), (0.0, 0.0))
+
+        client.return_value.geocode.assert_called_once_with('Rare Place')
+
+    @override_settings(VIEW_CACHE_ENABLED=False)
+    def test_refuses_when_view_cache_disabled(self):
+        """Test that warming a disabled cache is reported as an error"""
+        with self.assertRaises(CommandError):
+            self.warm()
+
+
+class GeocodeRecordingTest(TestCase):
+    """Test cases for recording geocoded locations"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_upstream_lookups_are_counted(self):
+        """Test that each Nominatim lookup is recorded with its coordinates"""
+        with patch('tours.location_service.get_geocoding_client') as client:
+            client.return_value.geocode.return_value = (51.40, -3.28)
+            geocode_location('Barry')
+            cache.clear()
+            geocode_location(' barry ')
+
+        location = GeocodedLocation.objects.get(query='barry')
+        self.assertEqual(location.lookup_count, 2)
+        self.assertEqual((location.latitude, location.longitude), (51.40, -3.28))
+
+    def test_not_found_is_not_recorded(self):
+        """Test that locations Nominatim cannot find are not stored"""
+        with patch('tours.location_service.get_geocoding_client') as client:
+            client.return_value.geocode.return_value = None
+            geocode_location('Nowhere')
+
+        self.assertFalse(GeocodedLocation.objects.exists())
+
+
+class WarmupHookTest(TestCase):
+    """Test cases for the post-start warm-up hook"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_disabled_by_default(self):
+        """Test that the hook does nothing unless WARM_CACHES_ON_START is set"""
+        self.assertIsNone(warm_caches_in_background())
+
+    @override_settings(WARM_CACHES_ON_START=True)
+    def test_only_one_worker_warms(self):
+        """Test that the shared lock lets a single worker do the warm-up"""
+        with patch('tours.warmup.warm_caches') as warm:
+            thread = warm_caches_in_background()
+            thread.join(5)
+            self.assertIsNone(warm_caches_in_background())
+
+        warm.assert_called_once_with()
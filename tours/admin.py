@@ -2,7 +2,8 @@
 # This file customizes how the TourBooking model appears in Django Admin
 
 from django.contrib import admin
-from .models import TourBooking
+from .cache import invalidate_on_commit
+from .models import CareHome, GeocodedLocation, TourBooking
 
 
 @admin.register(TourBooking)
@@ -83,6 +84,7 @@ class TourBookingAdmin(admin.ModelAdmin):
         This is useful when processing multiple completed tours at once.
         """
         updated = queryset.update(status='visited')
+        invalidate_on_commit('bookings')  # update() sends no signals
         self.message_user(request, f'{updated} bookings marked as visited.')
     mark_as_visited.short_description = "Mark selected bookings as visited"
     
@@ -93,6 +95,7 @@ class TourBookingAdmin(admin.ModelAdmin):
         Use this for no-shows or cancelled tours.
         """
         updated = queryset.update(status='not_visited')
+        invalidate_on_commit('bookings')  # update() sends no signals
         self.message_user(request, f'{updated} bookings marked as not visited.')
     mark_as_not_visited.short_description = "Mark selected bookings as not visited"
     
@@ -103,5 +106,50 @@ class TourBookingAdmin(admin.ModelAdmin):
         Useful for rescheduled tours or status corrections.
         """
         updated = queryset.update(status='pending')
+        invalidate_on_commit('bookings')  # update() sends no signals
         self.message_user(request, f'{updated} bookings marked as pending.')
-    mark_as_pending.short_description = "Mark selected bookings as pending"
\ No newline at end of file
+    mark_as_pending.short_description = "Mark selected bookings as pending"
+
+
+@admin.register(CareHome)
+class CareHomeAdmin(admin.ModelAdmin):
+    """
+    Admin interface for the care home registry.
+    
+    Homes added or edited here are picked up by every worker's registry
+    within a second, without a deploy.
+    """
+    
+    list_display = ['name', 'code', 'display_name', 'phone', 'is_active', 'sort_order']
+    list_editable = ['is_active', 'sort_order']
+    list_filter = ['is_active']
+    search_fields = ['name', 'code', 'address']
+    readonly_fields = ['updated_at']
+    
+    fieldsets = (
+        ('Identification', {
+            'fields': ('code', 'display_name', 'name'),
+            'description': 'How the home is identified on bookings and in reports'
+        }),
+        ('Location and Contact', {
+            'fields': ('address', 'latitude', 'longitude', 'phone'),
+            'description': 'Used for location search and contact details'
+        }),
+        ('Availability', {
+            'fields': ('is_active', 'sort_order', 'updated_at'),
+        }),
+    )
+
+
+@admin.register(GeocodedLocation)
+class GeocodedLocationAdmin(admin.ModelAdmin):
+    """
+    Admin interface for searched locations.
+    
+    The most frequent ones are restored to the geocode cache by
+    manage.py warm_caches after a deploy.
+    """
+    
+    list_display = ['query', 'lookup_count', 'latitude', 'longitude', 'last_looked_up']
+    search_fields = ['query']
+    readonly_fields = ['last_looked_up']
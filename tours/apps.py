@@ -0,0 +1,20 @@
+# App Configuration for Tours App
+
+from django.apps import AppConfig
+
+
+class ToursConfig(AppConfig):
+    """Configuration for the tour booking app"""
+
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'tours'
+
+    def ready(self):
+        """Connect signal handlers once the app registry is ready"""
+        from django.db.backends.signals import connection_created
+        from bellavista_backend.db import configure_sqlite_connection
+        from bellavista_backend.instrumentation import instrument_connection
+        from . import signals  # noqa: F401
+
+        connection_created.connect(configure_sqlite_connection, dispatch_uid='configure_sqlite_connection')
+        connection_created.connect(instrument_connection, dispatch_uid='instrument_connection')
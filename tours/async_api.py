@@ -0,0 +1,95 @@
+"""
+Async API Views for Bellavista Care Homes
+Lightweight async counterpart of DRF's @api_view for I/O-bound endpoints
+"""
+
+import functools
+import json
+
+from asgiref.sync import sync_to_async
+from rest_framework import exceptions, status
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from bellavista_backend.renderers import TimedJSONRenderer
+
+
+def render_response(request, response):
+    """Render a DRF Response as JSON outside DRF's APIView machinery"""
+    response.accepted_renderer = TimedJSONRenderer()
+    response.accepted_media_type = 'application/json'
+    response.renderer_context = {'request': request, 'response': response}
+    return response.render()
+
+
+def handle_exception(request, exc, args, kwargs):
+    """
+    Turn an exception into DRF's error response, as APIView does.
+
+    APIException subclasses (ParseError, ValidationError, NotFound,
+    Throttled...), Http404 and PermissionDenied become 4xx JSON responses;
+    anything else is re-raised.
+    """
+    context = {'request': request, 'view': None, 'args': args, 'kwargs': kwargs}
+    response = api_settings.EXCEPTION_HANDLER(exc, context)
+    if response is None:
+        raise exc
+    return response
+
+
+def async_api_view(methods, throttle_classes=()):
+    """
+    Decorator for async function views that return DRF Responses.
+
+    DRF 3.14 views are sync-only, so an I/O-bound view wrapped in
+    @api_view would hold a worker thread while it waits. This keeps the
+    view a coroutine under ASGI while giving it the parts of @api_view the
+    API relies on: method checks, request.data for JSON bodies, throttling,
+    DRF's exception handling and JSON rendering (response.data stays
+    available to tests).
+
+    Args:
+        methods (list): Allowed HTTP methods, e.g. ['GET', 'POST']
+        throttle_classes (list): DRF throttles checked before the view runs
+    """
+    allowed = [method.upper() for method in methods]
+
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in allowed:
+                response = Response({
+                    'detail': f'Method "{request.method}" not allowed.'
+                }, status=status.HTTP_405_METHOD_NOT_ALLOWED)
+                response['Allow'] = ', '.join(allowed)
+                return render_response(request, response)
+
+            try:
+                response = await handle(request, *args, **kwargs)
+            except Exception as exc:
+                response = handle_exception(request, exc, args, kwargs)
+            if isinstance(response, Response):
+                response = render_response(request, response)
+            return response
+
+        async def handle(request, *args, **kwargs):
+            # Throttles use the (sync) cache client
+            for throttle in [throttle_class() for throttle_class in throttle_classes]:
+                if not await sync_to_async(throttle.allow_request)(request, None):
+                    raise exceptions.Throttled(throttle.wait())
+
+            if request.method not in ('GET', 'HEAD'):
+                if request.content_type == 'application/json':
+                    try:
+                        request.data = json.loads(request.body or b'{}')
+                    except ValueError as e:
+                        raise exceptions.ParseError(f'JSON parse error - {e}')
+                else:
+                    request.data = request.POST
+
+            return await view(request, *args, **kwargs)
+
+        # Like @api_view; csrf_exempt() would hide the coroutine on Django 4.2
+        wrapper.csrf_exempt = True
+        return wrapper
+    return decorator
@@ -0,0 +1,91 @@
+"""
+Tour Availability for Bellavista Care Homes
+Free tour slots computed from existing bookings
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .constants import AVAILABILITY_SEARCH_DAYS, TOUR_TIME_SLOTS
+from .models import TourBooking
+
+
+def booked_slots(home_codes, start_date, end_date):
+    """
+    Load every booked slot for several homes over a date range in one query.
+
+    Args:
+        home_codes (list): Care home codes
+        start_date, end_date (date): Inclusive date range
+
+    Returns:
+        set: (home_code, date, 'HH:MM') tuples that are already taken
+    """
+    # Streamed in chunks, so only the set is held in memory, never the rows too
+    rows = TourBooking.objects.filter(
+        preferred_home__in=home_codes,
+        preferred_date__range=(start_date, end_date)
+    ).order_by().values_list('preferred_home', 'preferred_date', 'preferred_time').iterator(
+        chunk_size=settings.DATABASE_ITERATOR_CHUNK_SIZE
+    )
+
+    return {(home, day, time.strftime('%H:%M')) for home, day, time in rows}
+
+
+def available_slots_for_day(home_code, day):
+    """
+    Return the free tour slots for one home on one day.
+
+    Args:
+        home_code (str): Care home code
+        day (date): Tour date
+
+    Returns:
+        list: 'HH:MM' strings in chronological order
+    """
+    taken = booked_slots([home_code], day, day)
+    return [slot for slot in TOUR_TIME_SLOTS if (home_code, day, slot) not in taken]
+
+
+def next_available_slots(home_codes, count, days=AVAILABILITY_SEARCH_DAYS, now=None):
+    """
+    Find the next free tour slots for several homes at once.
+
+    All bookings for every home over the search window are fetched with a
+    single query, then slots are walked in date/time order per home.
+    Slots earlier today are skipped.
+
+    Args:
+        home_codes (list): Care home codes
+        count (int): Number of slots to return per home
+        days (int): How many days ahead to search, including today
+        now (datetime): Current time (defaults to timezone.localtime())
+
+    Returns:
+        dict: home_code -> list of {'date': 'YYYY-MM-DD', 'time': 'HH:MM'}
+    """
+    now = now or timezone.localtime()
+    start_date = now.date()
+    end_date = start_date + timedelta(days=days - 1)
+    current_time = now.strftime('%H:%M')
+
+    taken = booked_slots(home_codes, start_date, end_date)
+
+    results = {}
+    for home_code in home_codes:
+        free = []
+        day = start_date
+        while day <= end_date and len(free) < count:
+            for slot in TOUR_TIME_SLOTS:
+                if day == start_date and slot <= current_time:
+                    continue
+                if (home_code, day, slot) not in taken:
+                    free.append({'date': day.isoformat(), 'time': slot})
+                    if len(free) == count:
+                        break
+            day += timedelta(days=1)
+        results[home_code] = free
+
+    return results
@@ -0,0 +1,211 @@
+"""
+Cache Namespaces for Bellavista Care Homes
+Namespaced keys with versioned invalidation on the shared cache
+"""
+
+import functools
+import hashlib
+import re
+import time
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+# Characters that are safe in keys for every cache backend
+SAFE_KEY_PATTERN = re.compile(r'^[A-Za-z0-9_.:@/-]*$')
+
+
+def _version_key(namespace):
+    return f'tours:ns:{namespace}'
+
+
+def _initial_version():
+    # Seeded from the clock so a version recreated after eviction never
+    # repeats one that stale entries were written under
+    return int(time.time() * 1000)
+
+
+def namespace_version(namespace):
+    """
+    Return the current version of a cache namespace.
+
+    The version is an integer in the shared cache, created on first use.
+    """
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def make_key(namespace, *parts):
+    """
+    Build a versioned cache key such as 'tours:stats:v3:summary'.
+
+    Entries written under an old version are never read again after
+    invalidate_namespace() and simply expire. Parts containing spaces or
+    other unsafe characters are hashed.
+    """
+    return _versioned_key(namespace, namespace_version(namespace), parts)
+
+
+def make_keys(namespace, parts_list):
+    """make_key() for many entries of one namespace, reading its version once"""
+    version = namespace_version(namespace)
+    return [_versioned_key(namespace, version, parts) for parts in parts_list]
+
+
+def _versioned_key(namespace, version, parts):
+    suffix = ':'.join(str(part) for part in parts)
+    if not SAFE_KEY_PATTERN.match(suffix):
+        suffix = hashlib.sha1(suffix.encode()).hexdigest()
+    return f'tours:{namespace}:v{version}:{suffix}'
+
+
+def invalidate_namespace(namespace):
+    """
+    Invalidate every entry in a namespace, in every worker, at once.
+
+    Uses an atomic increment so concurrent invalidations are never lost.
+    """
+    key = _version_key(namespace)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # No version yet (or it was evicted) - start a fresh one
+        cache.add(key, _initial_version(), timeout=None)
+        return cache.incr(key)
+
+
+def invalidate_on_commit(namespace):
+    """
+    invalidate_namespace() once the current transaction commits.
+
+    Invalidating before the commit lets a concurrent request recompute
+    from the old rows and cache them under the new version. Outside a
+    transaction the namespace is invalidated at once.
+    """
+    transaction.on_commit(functools.partial(invalidate_namespace, namespace))
+
+
+def get_or_compute(namespace, parts, compute, timeout):
+    """
+    Return a cached value, computing and storing it on a miss.
+
+    Args:
+        namespace (str): Cache namespace
+        parts (tuple): Key parts within the namespace
+        compute (callable): Produces the value on a miss
+        timeout (int): Seconds to keep the value
+
+    Returns:
+        The cached or freshly computed value
+    """
+    key = make_key(namespace, *parts)
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        if value is not None:
+            cache.set(key, value, timeout)
+    return value
+
+
+async def aget_or_compute(namespace, parts, compute, timeout):
+    """Async get_or_compute(); compute is a coroutine function"""
+    key = await sync_to_async(make_key)(namespace, *parts)
+    value = await cache.aget(key)
+    if value is None:
+        value = await compute()
+        if value is not None:
+            await cache.aset(key, value, timeout)
+    return value
+
+
+def _policy_key(view, request, args, kwargs, vary_on, tags):
+    versions = [namespace_version(tag) for tag in tags]
+    params = [request.GET.get(name, '').strip() for name in vary_on]
+    return make_key('view', view.__name__, *versions, *args, *kwargs.values(), *params)
+
+
+def _cacheable(request, bypass):
+    return (
+        settings.VIEW_CACHE_ENABLED
+        and request.method in ('GET', 'HEAD')
+        and not (bypass and bypass(request))
+    )
+
+
+def _cached_response(data):
+    from rest_framework.response import Response
+
+    response = Response(data)
+    response['X-Cache'] = 'HIT'
+    return response
+
+
+def cache_policy(timeout, vary_on=(), tags=(), bypass=None):
+    """
+    Cache successful responses of a read-only API view.
+
+    Place it below @api_view (or @async_api_view) so it sees the request,
+    and it works on both sync and async views. The cache key is
+    built from the view name, the listed query parameters and the current
+    version of every tag, so invalidate_namespace(tag) drops all cached
+    responses that depend on it. Only 200 responses are stored.
+
+    Args:
+        timeout (int): Seconds to keep a response
+        vary_on (tuple): Query parameters that change the response
+        tags (tuple): Namespaces whose invalidation must drop the response
+        bypass (callable): Given the request, True to neither read nor
+            store the cache (e.g. clients pinned to the primary database)
+
+    Example:
+        @api_view(['GET'])
+        @cache_policy(60, vary_on=('date', 'home'), tags=('bookings',))
+        def available_slots(request): ...
+    """
+    # Imported here so loading this module at startup (signals, registry)
+    # does not pull in DRF
+    from rest_framework.response import Response
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @functools.wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                if not _cacheable(request, bypass):
+                    return await view(request, *args, **kwargs)
+
+                key = await sync_to_async(_policy_key)(view, request, args, kwargs, vary_on, tags)
+                data = await cache.aget(key)
+                if data is not None:
+                    return _cached_response(data)
+
+                response = await view(request, *args, **kwargs)
+                if response.status_code == 200 and isinstance(response, Response):
+                    await cache.aset(key, response.data, timeout)
+                    response['X-Cache'] = 'MISS'
+                return response
+            return async_wrapper
+
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not _cacheable(request, bypass):
+                return view(request, *args, **kwargs)
+
+            key = _policy_key(view, request, args, kwargs, vary_on, tags)
+            data = cache.get(key)
+            if data is not None:
+                return _cached_response(data)
+
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and isinstance(response, Response):
+                cache.set(key, response.data, timeout)
+                response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
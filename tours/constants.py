@@ -1,43 +1,32 @@
 # Constants for Bellavista Care Homes
-# This file contains configuration data for all care home locations
+# Scheduling limits and calculation constants shared across the app
+
+# Care homes live in the CareHome model; see tours/registry.py
 
 # =============================================================================
-# CARE HOME LOCATIONS
+# TOUR SCHEDULING
 # =============================================================================
 
-# Dictionary containing details for each Bellavista care home
-# Used for location services and contact information
-HOME_LOCATIONS = {
-    'cardiff': {
-        'name': 'Bellavista Cardiff',
-        'address': 'Cardiff, Wales, UK',
-        'coordinates': (51.4816, -3.1791),  # Latitude, Longitude
-        'phone': '029 2000 0000'
-    },
-    'barry': {
-        'name': 'Bellavista Barry',
-        'address': 'Barry, Vale of Glamorgan, Wales, UK',
-        'coordinates': (51.3998, -3.2826),  # Latitude, Longitude
-        'phone': '01446 700 000'
-    },
-    'waverley': {
-        'name': 'Waverley Care Centre',
-        'address': 'Waverley, Wales, UK',
-        'coordinates': (51.4850, -3.1750),  # Latitude, Longitude
-        'phone': '029 2100 0000'
-    },
-    'college-fields': {
-        'name': 'College Fields',
-        'address': 'College Fields, Wales, UK',
-        'coordinates': (51.4900, -3.1800),  # Latitude, Longitude
-        'phone': '029 2200 0000'
-    }
-}
+# Tour start times offered at every home (24-hour HH:MM)
+TOUR_TIME_SLOTS = ['09:00', '10:00', '11:00', '14:00', '15:00', '16:00']
+
+# How many days ahead to search when looking for the next free slots
+AVAILABILITY_SEARCH_DAYS = 30
+
+# Limits for the nearest-homes-with-availability endpoint
+MAX_NEAREST_HOMES = 10
+MAX_SLOTS_PER_HOME = 12
 
 # =============================================================================
 # CALCULATION CONSTANTS
 # =============================================================================
 
 # Average driving speed for travel time estimation (km/h)
-# Used in the find_nearest_home function to estimate journey duration
-AVERAGE_SPEED_KMH = 40
\ No newline at end of file
+# Used when an outcode is not in the precomputed travel time matrix
+AVERAGE_SPEED_KMH = 40
+
+# Distances are calculated in miles; convert before applying AVERAGE_SPEED_KMH
+KM_PER_MILE = 1.609344
+
+# Maximum number of locations accepted by the batch nearest-home endpoint
+MAX_BATCH_LOCATIONS = 5000
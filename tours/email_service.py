@@ -3,10 +3,19 @@ SendGrid Email Service for Bellavista Care Homes
 HTTP-based email that works on Render free tier
 """
 
+import logging
 import os
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
 from django.conf import settings
+from bellavista_backend.instrumentation import track_external_call
+
+logger = logging.getLogger(__name__)
+
+# sendgrid and httpx are imported on first use: they are only needed when
+# an email is actually sent, and importing them at startup slows cold starts
+
+# SendGrid v3 send endpoint (under SENDGRID_API_HOST), called directly by the async path
+SENDGRID_SEND_PATH = '/v3/mail/send'
+SENDGRID_TIMEOUT = 10
 
 def send_booking_confirmation_email(booking):
     """
@@ -22,43 +31,14 @@ def send_booking_confirmation_email(booking):
     # Check if SendGrid is configured - fail fast
     sendgrid_api_key = os.environ.get('SENDGRID_API_KEY')
     if not sendgrid_api_key:
-        print("SendGrid API key not configured - skipping email")
+        logger.info('SendGrid API key not configured - skipping email', extra={'booking_id': booking.id})
         return False
     
+    from sendgrid import SendGridAPIClient
+    from sendgrid.helpers.mail import Mail
+    
     try:
-        # Create email content
-        subject = f'Tour Booking Confirmation - #{booking.id}'
-        
-        html_content = f"""
-        <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <h2 style="color: #2c3e50;">Tour Booking Confirmation</h2>
-            
-            <p>Dear {booking.first_name},</p>
-            
-            <p>Thank you for booking a tour with Bellavista Care Homes!</p>
-            
-            <div style="background: #f8f9fa; padding: 20px; border-radius: 5px; margin: 20px 0;">
-                <h3 style="margin-top: 0;">Booking Details:</h3>
-                <p><strong>Booking ID:</strong> #{booking.id}</p>
-                <p><strong>Name:</strong> {booking.full_name}</p>
-                <p><strong>Location:</strong> {booking.get_home_display_name()}</p>
-                <p><strong>Date:</strong> {booking.preferred_date}</p>
-                <p><strong>Time:</strong> {booking.preferred_time}</p>
-                <p><strong>Phone:</strong> {booking.phone_number}</p>
-                <p><strong>Notes:</strong> {booking.notes or 'None'}</p>
-            </div>
-            
-            <p>We will contact you within 24 hours to confirm your tour details.</p>
-            
-            <p>Best regards,<br>
-            <strong>Bellavista Care Homes Team</strong></p>
-            
-            <hr style="margin: 30px 0; border: none; border-top: 1px solid #eee;">
-            <p style="font-size: 12px; color: #666;">
-                This is an automated confirmation email. Please do not reply to this email.
-            </p>
-        </div>
-        """
+        subject, html_content = render_confirmation_email(booking)
         
         # Create SendGrid message
         message = Mail(
@@ -69,18 +49,65 @@ def send_booking_confirmation_email(booking):
         )
         
         # Send email
-        sg = SendGridAPIClient(api_key=sendgrid_api_key)
-        response = sg.send(message)
+        sg = SendGridAPIClient(api_key=sendgrid_api_key, host=settings.SENDGRID_API_HOST)
+        with track_external_call('sendgrid'):
+            response = sg.send(message)
         
-        print(f'SendGrid email sent successfully to {booking.email}')
-        print(f'Response status: {response.status_code}')
+        logger.info('SendGrid email sent', extra={
+            'booking_id': booking.id,
+            'status_code': response.status_code,
+        })
         
         return True
         
     except Exception as e:
-        print(f'SendGrid email sending failed: {e}')
+        logger.exception('SendGrid email sending failed', extra={'booking_id': booking.id})
         return False
 
+def render_confirmation_email(booking):
+    """
+    Build the subject and HTML body of a booking confirmation email
+    
+    Args:
+        booking: TourBooking instance
+        
+    Returns:
+        tuple: (subject, html_content)
+    """
+    subject = f'Tour Booking Confirmation - #{booking.id}'
+
+    html_content = f"""
+    <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+        <h2 style="color: #2c3e50;">Tour Booking Confirmation</h2>
+
+        <p>Dear {booking.first_name},</p>
+
+        <p>Thank you for booking a tour with Bellavista Care Homes!</p>
+
+        <div style="background: #f8f9fa; padding: 20px; border-radius: 5px; margin: 20px 0;">
+            <h3 style="margin-top: 0;">Booking Details:</h3>
+            <p><strong>Booking ID:</strong> #{booking.id}</p>
+            <p><strong>Name:</strong> {booking.full_name}</p>
+            <p><strong>Location:</strong> {booking.get_home_display_name()}</p>
+            <p><strong>Date:</strong> {booking.preferred_date}</p>
+            <p><strong>Time:</strong> {booking.preferred_time}</p>
+            <p><strong>Phone:</strong> {booking.phone_number}</p>
+            <p><strong>Notes:</strong> {booking.notes or 'None'}</p>
+        </div>
+
+        <p>We will contact you within 24 hours to confirm your tour details.</p>
+
+        <p>Best regards,<br>
+        <strong>Bellavista Care Homes Team</strong></p>
+
+        <hr style="margin: 30px 0; border: none; border-top: 1px solid #eee;">
+        <p style="font-size: 12px; color: #666;">
+            This is an automated confirmation email. Please do not reply to this email.
+        </p>
+    </div>
+    """
+    return subject, html_content
+
 def send_test_email(email_address):
     """
     Send test email via SendGrid
@@ -99,23 +126,54 @@ def send_test_email(email_address):
             'error': 'SendGrid API key not configured'
         }
     
+    from sendgrid import SendGridAPIClient
+    
     try:
-        message = Mail(
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to_emails=email_address,
-            subject='Bellavista Care Homes - Email Test',
-            html_content="""
-            <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-                <h2 style="color: #2c3e50;">Email Test Successful!</h2>
-                <p>This is a test email from Bellavista Care Homes API.</p>
-                <p>If you received this email, SendGrid integration is working correctly!</p>
-                <p>Best regards,<br><strong>Bellavista Care Homes Team</strong></p>
-            </div>
-            """
-        )
+        sg = SendGridAPIClient(api_key=sendgrid_api_key, host=settings.SENDGRID_API_HOST)
+        with track_external_call('sendgrid'):
+            response = sg.send(build_test_message(email_address))
         
-        sg = SendGridAPIClient(api_key=sendgrid_api_key)
-        response = sg.send(message)
+        return {
+            'success': True,
+            'status_code': response.status_code,
+            'sent_to': email_address
+        }
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
+async def send_test_email_async(email_address):
+    """
+    Send test email via the SendGrid HTTP API without blocking the event loop
+    
+    Args:
+        email_address: Email to send test to
+        
+    Returns:
+        dict: Result with success status and details (same shape as send_test_email)
+    """
+    
+    sendgrid_api_key = os.environ.get('SENDGRID_API_KEY')
+    if not sendgrid_api_key:
+        return {
+            'success': False,
+            'error': 'SendGrid API key not configured'
+        }
+    
+    import httpx
+    
+    try:
+        async with httpx.AsyncClient(timeout=SENDGRID_TIMEOUT) as client:
+            with track_external_call('sendgrid'):
+                response = await client.post(
+                    f'{settings.SENDGRID_API_HOST}{SENDGRID_SEND_PATH}',
+                    json=build_test_message(email_address).get(),
+                    headers={'Authorization': f'Bearer {sendgrid_api_key}'}
+                )
+                response.raise_for_status()
         
         return {
             'success': True,
@@ -127,4 +185,22 @@ def send_test_email(email_address):
         return {
             'success': False,
             'error': str(e)
-        }
\ No newline at end of file
+        }
+
+def build_test_message(email_address):
+    """Build the SendGrid message used by the email test endpoint"""
+    from sendgrid.helpers.mail import Mail
+    
+    return Mail(
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to_emails=email_address,
+        subject='Bellavista Care Homes - Email Test',
+        html_content="""
+        <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+            <h2 style="color: #2c3e50;">Email Test Successful!</h2>
+            <p>This is a test email from Bellavista Care Homes API.</p>
+            <p>If you received this email, SendGrid integration is working correctly!</p>
+            <p>Best regards,<br><strong>Bellavista Care Homes Team</strong></p>
+        </div>
+        """
+    )
@@ -0,0 +1,453 @@
+"""
+Geocoding Client for Bellavista Care Homes
+Resilient Nominatim client shared by every worker thread in the process
+"""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+import weakref
+
+import requests
+from asgiref.sync import sync_to_async
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.core.cache import cache
+
+from bellavista_backend.instrumentation import track_external_call
+
+NOMINATIM_URL = 'https://nominatim.openstreetmap.org/search'
+USER_AGENT = 'BellavistaCareHomes/1.0'
+
+logger = logging.getLogger(__name__)
+
+
+class GeocoderUnavailable(requests.RequestException):
+    """Raised when a lookup is refused locally (circuit open or rate limited)"""
+
+
+# =============================================================================
+# RATE LIMITING
+# =============================================================================
+
+class RateLimiter:
+    """
+    Spaces outgoing requests at least min_interval seconds apart, across
+    every worker process.
+
+    The next free slot is kept in the shared cache as a timestamp, like
+    tours.throttling.TokenBucket: each caller reserves a slot by pushing it
+    one interval later with an atomic incr (a missing key is created with
+    add), then sleeps until its slot without holding anything. Callers who
+    would wait longer than max_wait hand their slot back and are refused.
+    If the cache fails, spacing falls back to this process alone.
+    """
+
+    def __init__(self, min_interval, max_wait, key='geocoding:next_slot'):
+        self.min_interval = min_interval
+        self.max_wait = max_wait
+        self.key = key
+        self.interval_ms = math.ceil(min_interval * 1000)
+        # A reserved slot is never more than this far ahead, so the key
+        # outlives every reservation (expiry has whole-second resolution)
+        self.timeout = math.ceil(max_wait + min_interval) + 1
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def _refused(self):
+        return GeocoderUnavailable('Geocoding rate limit reached - please try again shortly')
+
+    def _reserve_shared(self):
+        # Slots are whole milliseconds, rounded up so none is ever early
+        now = time.time()
+        now_ms = math.ceil(now * 1000)
+        try:
+            slot_ms = cache.incr(self.key, self.interval_ms) - self.interval_ms
+        except ValueError:
+            # No request within the last few seconds: the slot is now
+            if cache.add(self.key, now_ms + self.interval_ms, self.timeout):
+                return 0
+            slot_ms = cache.incr(self.key, self.interval_ms) - self.interval_ms
+
+        if slot_ms < now_ms:
+            # The slot passed but its key has not expired yet; move it up to
+            # now so the next caller is still a full interval behind us
+            cache.incr(self.key, now_ms - slot_ms)
+            slot_ms = now_ms
+        wait_ms = slot_ms - now_ms
+        if wait_ms > self.max_wait * 1000:
+            cache.decr(self.key, self.interval_ms)
+            raise self._refused()
+        cache.touch(self.key, self.timeout)
+        return max(slot_ms / 1000 - now, 0)
+
+    def _reserve_local(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            wait = slot - now
+            if wait > self.max_wait:
+                raise self._refused()
+            self._next_slot = slot + self.min_interval
+        return wait
+
+    def reserve(self):
+        """Reserve the next request slot and return the seconds to wait for it"""
+        try:
+            return self._reserve_shared()
+        except GeocoderUnavailable:
+            raise
+        except Exception:
+            logger.warning('Shared geocoding rate limit failed - spacing this process only', exc_info=True)
+            return self._reserve_local()
+
+    def acquire(self):
+        """Wait for the next request slot, or raise if the queue is too long"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Like acquire(), but yields to the event loop while waiting"""
+        wait = await sync_to_async(self.reserve)()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+# =============================================================================
+# CIRCUIT BREAKER
+# =============================================================================
+
+class CircuitBreaker:
+    """
+    Fails fast after repeated upstream failures.
+
+    After failure_threshold consecutive failures the circuit opens and every
+    call is refused for cooldown seconds. The first call after the cooldown
+    is let through as a trial; success closes the circuit, failure reopens it.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold, cooldown):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now):
+        if self._opened_at is None:
+            return self.CLOSED
+        if now - self._opened_at >= self.cooldown:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def before_call(self):
+        """
+        Raise GeocoderUnavailable if calls are currently being refused.
+
+        Returns:
+            bool: True if this call is the half-open trial, which the caller
+            must release (release_trial) if it ends without an outcome
+        """
+        with self._lock:
+            state = self._state(time.monotonic())
+            if state == self.CLOSED:
+                return False
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+        raise GeocoderUnavailable('Geocoding service temporarily unavailable - please try again later')
+
+    def release_trial(self):
+        """Give back a half-open trial slot without recording an outcome"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+# =============================================================================
+# REQUEST COALESCING
+# =============================================================================
+
+class _Flight:
+    """One in-progress lookup that concurrent callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Ensures only one call per key is in progress; others share its result"""
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, timeout):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            if not flight.done.wait(timeout):
+                raise GeocoderUnavailable('Timed out waiting for geocoding result')
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = func()
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+
+# =============================================================================
+# GEOCODING CLIENT
+# =============================================================================
+
+def search_params(query):
+    """Nominatim search parameters for a UK address or postcode"""
+    return {
+        'q': query,
+        'format': 'json',
+        'limit': 1,
+        'countrycodes': 'gb'  # Limit to UK
+    }
+
+
+def parse_result(data):
+    """Return (latitude, longitude) from a Nominatim response, or None"""
+    if not data:
+        return None
+    return float(data[0]['lat']), float(data[0]['lon'])
+
+
+class GeocodingClient:
+    """
+    Nominatim client with connection pooling, coalescing, rate limiting
+    and a circuit breaker.
+    """
+
+    def __init__(self, url=NOMINATIM_URL, timeout=5.0, min_interval=1.0, max_wait=2.0,
+                 failure_threshold=5, cooldown=30.0, pool_size=10):
+        self.url = url
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.rate_limiter = RateLimiter(min_interval, max_wait)
+        self.breaker = CircuitBreaker(failure_threshold, cooldown)
+        self._single_flight = SingleFlight()
+
+    def geocode(self, query):
+        """
+        Geocode an address or postcode.
+
+        Concurrent lookups for the same (normalised) query share one upstream call.
+
+        Args:
+            query (str): Address or postcode to look up
+
+        Returns:
+            tuple: (latitude, longitude) or None if the location was not found
+
+        Raises:
+            requests.RequestException: If the lookup fails or is refused locally
+        """
+        key = ' '.join(query.split()).lower()
+        # Followers wait at most as long as the leader could take
+        wait_timeout = self.rate_limiter.max_wait + self.timeout
+        return self._single_flight.do(key, lambda: self._fetch(query), wait_timeout)
+
+    def _fetch(self, query):
+        """Perform one upstream lookup guarded by the breaker and rate limiter"""
+        trial = self.breaker.before_call()
+        outcome = False
+        try:
+            # Local back-pressure is not an upstream failure
+            self.rate_limiter.acquire()
+            try:
+                with track_external_call('nominatim'):
+                    response = self.session.get(self.url, params=search_params(query), timeout=self.timeout)
+                    response.raise_for_status()
+                    data = response.json()
+            except (requests.RequestException, ValueError) as e:
+                outcome = True
+                self.breaker.record_failure()
+                if isinstance(e, requests.RequestException):
+                    raise
+                raise requests.RequestException(f'Invalid geocoding response: {e}') from e
+
+            outcome = True
+            self.breaker.record_success()
+            return parse_result(data)
+        finally:
+            # Refused, or ended by an unexpected error: no outcome to record
+            if trial and not outcome:
+                self.breaker.release_trial()
+
+
+class AsyncGeocodingClient:
+    """
+    Asyncio counterpart of GeocodingClient for async views.
+
+    Waiting for Nominatim (or for a rate-limit slot) yields to the event
+    loop instead of holding a worker thread. The rate limiter and circuit
+    breaker are shared with the sync client, and the rate limiter's
+    schedule with every other worker, so the deployment as a whole stays
+    within the Nominatim usage policy.
+    """
+
+    def __init__(self, rate_limiter, breaker, url=NOMINATIM_URL, timeout=5.0, pool_size=10):
+        self.url = url
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.rate_limiter = rate_limiter
+        self.breaker = breaker
+        # httpx clients and in-flight tasks belong to one event loop
+        self._sessions = weakref.WeakKeyDictionary()
+        self._flights = weakref.WeakKeyDictionary()
+
+    def _session(self, loop):
+        # httpx is imported on first use to keep it off the startup path
+        import httpx
+
+        session = self._sessions.get(loop)
+        if session is None:
+            session = self._sessions[loop] = httpx.AsyncClient(
+                headers={'User-Agent': USER_AGENT},
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.pool_size),
+            )
+        return session
+
+    async def geocode(self, query):
+        """
+        Geocode an address or postcode without blocking the event loop.
+
+        Concurrent lookups for the same (normalised) query share one upstream call.
+
+        Args:
+            query (str): Address or postcode to look up
+
+        Returns:
+            tuple: (latitude, longitude) or None if the location was not found
+
+        Raises:
+            requests.RequestException: If the lookup fails or is refused locally
+        """
+        loop = asyncio.get_running_loop()
+        flights = self._flights.setdefault(loop, {})
+        key = ' '.join(query.split()).lower()
+
+        task = flights.get(key)
+        if task is None:
+            task = flights[key] = loop.create_task(self._fetch(loop, query))
+            task.add_done_callback(lambda _: flights.pop(key, None))
+        # Shield so one caller disconnecting does not cancel the others' lookup
+        return await asyncio.shield(task)
+
+    async def _fetch(self, loop, query):
+        """Perform one upstream lookup guarded by the breaker and rate limiter"""
+        import httpx
+
+        trial = self.breaker.before_call()
+        outcome = False
+        try:
+            await self.rate_limiter.acquire_async()
+            try:
+                with track_external_call('nominatim'):
+                    response = await self._session(loop).get(self.url, params=search_params(query))
+                    response.raise_for_status()
+                    data = response.json()
+            except (httpx.HTTPError, ValueError) as e:
+                outcome = True
+                self.breaker.record_failure()
+                # Views handle every geocoding failure as a requests exception
+                raise requests.RequestException(f'Geocoding request failed: {e}') from e
+
+            outcome = True
+            self.breaker.record_success()
+            return parse_result(data)
+        finally:
+            # Refused, cancelled or ended by an unexpected error
+            if trial and not outcome:
+                self.breaker.release_trial()
+
+
+_client = None
+_async_client = None
+_client_lock = threading.Lock()
+
+
+def get_geocoding_client():
+    """Return the process-wide geocoding client, creating it on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = GeocodingClient(
+                    url=settings.GEOCODING_URL,
+                    timeout=settings.GEOCODING_TIMEOUT,
+                    min_interval=1.0 / settings.GEOCODING_REQUESTS_PER_SECOND,
+                    max_wait=settings.GEOCODING_MAX_QUEUE_WAIT,
+                    failure_threshold=settings.GEOCODING_BREAKER_THRESHOLD,
+                    cooldown=settings.GEOCODING_BREAKER_COOLDOWN,
+                    pool_size=settings.GEOCODING_POOL_SIZE,
+                )
+    return _client
+
+
+def get_async_geocoding_client():
+    """Return the process-wide async geocoding client, creating it on first use"""
+    global _async_client
+    if _async_client is None:
+        sync_client = get_geocoding_client()
+        with _client_lock:
+            if _async_client is None:
+                _async_client = AsyncGeocodingClient(
+                    sync_client.rate_limiter,
+                    sync_client.breaker,
+                    url=settings.GEOCODING_URL,
+                    timeout=settings.GEOCODING_TIMEOUT,
+                    pool_size=settings.GEOCODING_POOL_SIZE,
+                )
+    return _async_client
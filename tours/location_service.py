@@ -0,0 +1,316 @@
+"""
+Location Service for Bellavista Care Homes
+Geocoding and nearest-home resolution shared by the location endpoints
+"""
+
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.db.models import F
+from django.utils import timezone
+
+from .cache import aget_or_compute, get_or_compute, make_key, make_keys
+from .geocoding import get_async_geocoding_client, get_geocoding_client
+from .models import GeocodedLocation
+from .registry import get_registry
+
+
+# Cache namespace holding geocoded locations
+GEOCODE_NAMESPACE = 'geocode'
+
+
+def normalize_query(query):
+    """Normalise search text so equivalent queries share one cache entry"""
+    return ' '.join(query.lower().split())
+
+
+def geocode_location(query):
+    """
+    Geocode an address or postcode using the shared Nominatim client.
+
+    Results are kept in the shared cache under the 'geocode' namespace, so
+    a location looked up by one worker is free for all the others.
+
+    Args:
+        query (str): Address or postcode to look up
+
+    Returns:
+        tuple: (latitude, longitude) or None if the location was not found
+
+    Raises:
+        requests.RequestException: If the geocoding service fails or is unavailable
+    """
+    normalized = normalize_query(query)
+
+    def lookup():
+        point = get_geocoding_client().geocode(query)
+        record_geocode(normalized, point)
+        return point
+
+    return get_or_compute(GEOCODE_NAMESPACE, (normalized,), lookup, settings.GEOCODING_CACHE_SECONDS)
+
+
+async def ageocode_location(query):
+    """
+    Async geocode_location() for async views.
+
+    Shares the geocode cache with the sync version and waits on Nominatim
+    without blocking the event loop.
+    """
+    normalized = normalize_query(query)
+
+    async def lookup():
+        point = await get_async_geocoding_client().geocode(query)
+        await sync_to_async(record_geocode)(normalized, point)
+        return point
+
+    return await aget_or_compute(GEOCODE_NAMESPACE, (normalized,), lookup, settings.GEOCODING_CACHE_SECONDS)
+
+
+def record_geocode(normalized, point):
+    """
+    Remember a location fetched from Nominatim for manage.py warm_caches.
+
+    Failures are ignored; the lookup itself already succeeded.
+    """
+    if point is None or len(normalized) > 255:
+        return
+    try:
+        updated = GeocodedLocation.objects.filter(query=normalized).update(
+            latitude=point[0],
+            longitude=point[1],
+            lookup_count=F('lookup_count') + 1,
+            last_looked_up=timezone.now()
+        )
+        if not updated:
+            GeocodedLocation.objects.get_or_create(
+                query=normalized,
+                defaults={'latitude': point[0], 'longitude': point[1]}
+            )
+    except DatabaseError:
+        pass
+
+
+def prime_geocode(normalized, point):
+    """Store a known location in the geocode cache without calling Nominatim"""
+    cache.set(make_key(GEOCODE_NAMESPACE, normalized), point, settings.GEOCODING_CACHE_SECONDS)
+
+
+def nearest_homes(points, k=1):
+    """
+    Find the nearest care homes for many points.
+
+    Args:
+        points (list): List of (latitude, longitude) tuples
+        k (int): Number of homes to return per point
+
+    Returns:
+        list: One list of up to k (home_code, Home, distance_miles)
+        tuples per point, nearest first
+    """
+    registry = get_registry()
+    return [
+        [(code, registry.get(code), distance)
+         for code, distance in registry.index.nearest(lat, lon, k)]
+        for lat, lon in points
+    ]
+
+
+def homes_within(lat, lon, radius_miles):
+    """
+    Find every care home within a radius of a point.
+
+    Returns:
+        list: (home_code, Home, distance_miles) tuples, nearest first
+    """
+    registry = get_registry()
+    return [
+        (code, registry.get(code), distance)
+        for code, distance in registry.index.within(lat, lon, radius_miles)
+    ]
+
+
+def parse_point(lat, lon):
+    """
+    Read a latitude/longitude pair.
+
+    Returns:
+        tuple: (lat, lon) as floats
+
+    Raises:
+        ValueError: If either is not a number or is out of range
+    """
+    lat, lon = float(lat), float(lon)
+    # NaN fails both comparisons
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError(f'Coordinates out of range: {lat}, {lon}')
+    return lat, lon
+
+
+def _parse_location(item):
+    """
+    Normalise one batch entry.
+
+    Returns:
+        tuple: ('coords', (lat, lon)), ('query', normalised_query) or ('invalid', message)
+    """
+    if isinstance(item, dict):
+        try:
+            return 'coords', parse_point(item['lat'], item['lon'])
+        except (KeyError, TypeError, ValueError):
+            return 'invalid', 'Invalid latitude or longitude values'
+
+    if isinstance(item, str) and item.strip():
+        # Collapse case and whitespace so "CF10 1AA" and "cf10  1aa" share a lookup
+        return 'query', ' '.join(item.split()).lower()
+
+    return 'invalid', 'Each location must be an address string or an object with lat and lon'
+
+
+def _result(index, location, home_code, home, distance):
+    """Build the JSON-serialisable result for one resolved location"""
+    return {
+        'index': index,
+        'location': location,
+        'nearest_home': home.name,
+        'home': home_code,
+        'address': home.address,
+        'phone': home.phone,
+        'distance': round(distance, 1),
+        'coordinates': home.coordinates
+    }
+
+
+def _group_locations(locations):
+    """
+    Sort batch entries by how they are resolved.
+
+    Returns:
+        tuple: (error results, [(index, item, point)] for coordinates,
+        {query: [(index, item)]} for addresses)
+    """
+    errors = []
+    coordinate_entries = []
+    pending_queries = {}
+    for index, item in enumerate(locations):
+        kind, value = _parse_location(item)
+        if kind == 'coords':
+            coordinate_entries.append((index, item, value))
+        elif kind == 'query':
+            pending_queries.setdefault(value, []).append((index, item))
+        else:
+            errors.append({'index': index, 'location': item, 'error': value})
+    return errors, coordinate_entries, pending_queries
+
+
+def _match_results(entries, match):
+    """Results for every entry resolved to one point's nearest homes"""
+    for index, item in entries:
+        if not match:
+            yield {'index': index, 'location': item, 'error': 'No homes found'}
+        else:
+            yield _result(index, item, *match[0])
+
+
+def _geocode_error_results(entries, error):
+    """Results for every entry sharing an address that could not be geocoded"""
+    for index, item in entries:
+        yield {'index': index, 'location': item, 'error': error}
+
+
+def uncached_queries(locations):
+    """
+    Distinct addresses in a batch that are not in the geocode cache.
+
+    Each one may cost a Nominatim lookup; coordinates and cached addresses
+    are free. Addresses that were not found are never cached, so they count.
+
+    Returns:
+        list: Normalised queries
+    """
+    _, _, pending_queries = _group_locations(locations)
+    queries = list(pending_queries)
+    keys = make_keys(GEOCODE_NAMESPACE, [(query,) for query in queries])
+    cached = cache.get_many(keys)
+    return [query for query, key in zip(queries, keys) if key not in cached]
+
+
+def resolve_nearest_homes(locations, geocoder=None):
+    """
+    Resolve the nearest care home for a batch of locations.
+
+    Coordinate entries are resolved together first, then each distinct
+    address is geocoded exactly once and every entry sharing it is emitted.
+    Results are yielded as soon as they are known, so callers can stream them.
+
+    Args:
+        locations (list): Address strings or {'lat': ..., 'lon': ...} objects
+        geocoder (callable): Function mapping a query to (lat, lon) or None,
+            defaults to geocode_location
+
+    Yields:
+        dict: One result (or error) per input location, tagged with its index
+    """
+    geocoder = geocoder or geocode_location
+    errors, coordinate_entries, pending_queries = _group_locations(locations)
+    yield from errors
+
+    # Resolve every coordinate input in one pass against the home index
+    if coordinate_entries:
+        matches = nearest_homes([point for _, _, point in coordinate_entries])
+        for (index, item, _), match in zip(coordinate_entries, matches):
+            yield from _match_results([(index, item)], match)
+
+    # Geocode each distinct address once, fanning the answer out to duplicates
+    for query, entries in pending_queries.items():
+        try:
+            point = geocoder(query)
+        except requests.RequestException as e:
+            yield from _geocode_error_results(entries, f'Geocoding service error: {str(e)}')
+            continue
+
+        if point is None:
+            yield from _geocode_error_results(entries, 'Location not found')
+            continue
+
+        yield from _match_results(entries, nearest_homes([point])[0])
+
+
+async def aresolve_nearest_homes(locations, geocoder=None):
+    """
+    Async resolve_nearest_homes() for streaming under ASGI.
+
+    An ASGI server can only stream a response from an async iterator (a
+    sync one is read to the end first), so this yields the same results
+    while geocoding on the event loop.
+
+    Args:
+        locations (list): Address strings or {'lat': ..., 'lon': ...} objects
+        geocoder (callable): Coroutine function mapping a query to (lat, lon)
+            or None, defaults to ageocode_location
+    """
+    geocoder = geocoder or ageocode_location
+    errors, coordinate_entries, pending_queries = _group_locations(locations)
+    for result in errors:
+        yield result
+
+    if coordinate_entries:
+        matches = await sync_to_async(nearest_homes)([point for _, _, point in coordinate_entries])
+        for (index, item, _), match in zip(coordinate_entries, matches):
+            for result in _match_results([(index, item)], match):
+                yield result
+
+    for query, entries in pending_queries.items():
+        try:
+            point = await geocoder(query)
+        except requests.RequestException as e:
+            results = _geocode_error_results(entries, f'Geocoding service error: {str(e)}')
+        else:
+            if point is None:
+                results = _geocode_error_results(entries, 'Location not found')
+            else:
+                results = _match_results(entries, (await sync_to_async(nearest_homes)([point]))[0])
+        for result in results:
+            yield result
@@ -0,0 +1,105 @@
+# Management Command: build_travel_matrix
+# Regenerates the outcode-to-home travel time matrix from local routing data
+
+import csv
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tours.registry import get_registry
+from tours.spatial_index import great_circle_miles
+from tours.travel_times import TravelTimeMatrix, estimate_minutes, reset_travel_matrix
+
+
+class Command(BaseCommand):
+    """
+    Build the compact travel time matrix used by find_nearest_home.
+
+    Usage:
+        python manage.py build_travel_matrix --outcodes outcodes.csv [--routes routes.csv]
+    """
+
+    help = 'Build the outcode-to-home travel time matrix from local routing data'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--outcodes', required=True,
+            help='CSV of outcode,latitude,longitude centroids'
+        )
+        parser.add_argument(
+            '--routes',
+            help='Optional CSV of outcode,home,minutes from a routing engine'
+        )
+        parser.add_argument(
+            '--output', default=settings.TRAVEL_TIME_MATRIX_PATH,
+            help='Where to write the matrix (default: TRAVEL_TIME_MATRIX_PATH)'
+        )
+
+    def handle(self, *args, **options):
+        outcodes = self.read_outcodes(options['outcodes'])
+        routes = self.read_routes(options['routes']) if options['routes'] else {}
+
+        homes = get_registry().homes
+        if not homes:
+            raise CommandError('No active care homes in the registry')
+
+        # Routed times where available, straight-line estimates otherwise
+        routed = estimated = 0
+        minutes = []
+        for outcode, lat, lon in outcodes:
+            for home in homes:
+                value = routes.get((outcode, home.code))
+                if value is None:
+                    value = estimate_minutes(great_circle_miles(lat, lon, *home.coordinates))
+                    estimated += 1
+                else:
+                    routed += 1
+                minutes.append(value)
+
+        TravelTimeMatrix.save(
+            options['output'],
+            [outcode for outcode, _, _ in outcodes],
+            [home.code for home in homes],
+            minutes
+        )
+        reset_travel_matrix()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {len(outcodes)} outcodes x {len(homes)} homes to {options["output"]} '
+            f'({routed} routed, {estimated} estimated)'
+        ))
+
+    def read_outcodes(self, path):
+        """Read outcode centroids, skipping a header row if present"""
+        outcodes = []
+        try:
+            with open(path, newline='') as f:
+                for row in csv.reader(f):
+                    if len(row) < 3:
+                        continue
+                    try:
+                        outcodes.append((row[0].strip().upper(), float(row[1]), float(row[2])))
+                    except ValueError:
+                        continue  # header or malformed row
+        except OSError as e:
+            raise CommandError(f'Could not read outcodes: {e}')
+
+        if not outcodes:
+            raise CommandError(f'No outcodes found in {path}')
+        return outcodes
+
+    def read_routes(self, path):
+        """Read routed driving times keyed by (outcode, home code)"""
+        routes = {}
+        try:
+            with open(path, newline='') as f:
+                for row in csv.reader(f):
+                    if len(row) < 3:
+                        continue
+                    try:
+                        routes[(row[0].strip().upper(), row[1].strip())] = int(round(float(row[2])))
+                    except ValueError:
+                        continue  # header or malformed row
+        except OSError as e:
+            raise CommandError(f'Could not read routes: {e}')
+        return routes
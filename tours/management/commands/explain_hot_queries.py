@@ -0,0 +1,83 @@
+# Management Command: explain_hot_queries
+# EXPLAINs the queries behind the booking endpoints and flags full table scans
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from tours.models import TourBooking
+from tours.query_plans import check_hot_queries
+from tours.seeding import seed_bookings
+
+
+class Command(BaseCommand):
+    """
+    Show the query plan of every query the hot booking endpoints run.
+
+    Plans depend on table size, so run it against a realistically seeded
+    database (seed_bookings, or --seed-bookings for a throwaway dataset
+    that is rolled back afterwards). Full table scans are flagged;
+    --fail-on-scan turns them into a non-zero exit for CI. An endpoint
+    that fails or runs no queries is always an error, since its plans
+    were not checked.
+
+    Usage:
+        python manage.py explain_hot_queries [--seed-bookings 100000] [--fail-on-scan]
+    """
+
+    help = 'EXPLAIN the queries behind the hot booking endpoints and flag full table scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fail-on-scan', action='store_true',
+            help='Exit with an error if any query reads a whole table'
+        )
+        parser.add_argument(
+            '--seed-bookings', type=int, default=0, metavar='COUNT',
+            help='Add COUNT synthetic bookings for the check and roll them back afterwards'
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options['seed_bookings']:
+                seed_bookings(options['seed_bookings'])
+            flagged, failed = self.report()
+            transaction.set_rollback(True)
+
+        if failed:
+            raise CommandError(f'Query plans not checked for: {", ".join(failed)}')
+        if flagged and options['fail_on_scan']:
+            raise CommandError(f'{flagged} full table scan(s) in hot queries')
+        self.stdout.write(self.style.SUCCESS(f'{flagged} full table scan(s) flagged'))
+
+    def report(self):
+        """
+        Print every hot query with its plan.
+
+        Returns:
+            tuple: (number of full scans, labels of endpoints that failed
+            or ran no queries)
+        """
+        self.stdout.write(f'{TourBooking.objects.count()} bookings in the database\n')
+
+        flagged = 0
+        failed = []
+        for result in check_hot_queries():
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{result['label']} (HTTP {result['status']})"))
+            if not 200 <= result['status'] < 300:
+                failed.append(result['label'])
+                self.stdout.write(self.style.ERROR(f"  request failed with HTTP {result['status']}\n"))
+                continue
+            if not result['queries']:
+                failed.append(result['label'])
+                self.stdout.write(self.style.ERROR('  no queries ran\n'))
+                continue
+            for query in result['queries']:
+                self.stdout.write(f"  {query['sql']}")
+                for line in query['plan']:
+                    self.stdout.write(f'    {line}')
+                for table in query['full_scans']:
+                    flagged += 1
+                    self.stdout.write(self.style.WARNING(f'  FULL SCAN of {table}'))
+                self.stdout.write('')
+
+        return flagged, failed
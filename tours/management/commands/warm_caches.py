@@ -0,0 +1,45 @@
+# Management Command: warm_caches
+# Pre-populates availability, stats and geocode caches after a deploy
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tours.warmup import warm_caches
+
+
+class Command(BaseCommand):
+    """
+    Warm the shared cache so the first visitors after a deploy get cache hits.
+
+    Usage:
+        python manage.py warm_caches [--days 14] [--geocodes 200]
+    """
+
+    help = 'Pre-populate availability, stats and geocode caches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.WARM_CACHE_DAYS,
+            help='Days of availability to warm for every home (default: WARM_CACHE_DAYS)'
+        )
+        parser.add_argument(
+            '--geocodes', type=int, default=settings.WARM_GEOCODE_LIMIT,
+            help='Number of most-searched locations to warm (default: WARM_GEOCODE_LIMIT)'
+        )
+
+    def handle(self, *args, **options):
+        if not settings.VIEW_CACHE_ENABLED:
+            raise CommandError('VIEW_CACHE_ENABLED is off - there is nothing to warm')
+        if options['days'] < 0 or options['geocodes'] < 0:
+            raise CommandError('--days and --geocodes must not be negative')
+
+        start = time.perf_counter()
+        warmed = warm_caches(days=options['days'], geocodes=options['geocodes'])
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Warmed {warmed['availability']} availability entries, {warmed['stats']} stats "
+            f"and {warmed['geocodes']} geocoded locations in {elapsed:.2f}s"
+        ))
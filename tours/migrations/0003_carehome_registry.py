@@ -0,0 +1,98 @@
+# Migration adding the CareHome registry and seeding the original homes
+
+from django.db import migrations, models
+
+
+# Homes previously hard-coded in TourBooking.HOME_CHOICES and constants.HOME_LOCATIONS
+INITIAL_HOMES = [
+    {
+        'code': 'cardiff',
+        'display_name': 'Cardiff',
+        'name': 'Bellavista Cardiff',
+        'address': 'Cardiff, Wales, UK',
+        'latitude': 51.4816,
+        'longitude': -3.1791,
+        'phone': '029 2000 0000',
+        'sort_order': 1,
+    },
+    {
+        'code': 'barry',
+        'display_name': 'Barry',
+        'name': 'Bellavista Barry',
+        'address': 'Barry, Vale of Glamorgan, Wales, UK',
+        'latitude': 51.3998,
+        'longitude': -3.2826,
+        'phone': '01446 700 000',
+        'sort_order': 2,
+    },
+    {
+        'code': 'waverley',
+        'display_name': 'Waverley',
+        'name': 'Waverley Care Centre',
+        'address': 'Waverley, Wales, UK',
+        'latitude': 51.4850,
+        'longitude': -3.1750,
+        'phone': '029 2100 0000',
+        'sort_order': 3,
+    },
+    {
+        'code': 'college-fields',
+        'display_name': 'College Fields',
+        'name': 'College Fields',
+        'address': 'College Fields, Wales, UK',
+        'latitude': 51.4900,
+        'longitude': -3.1800,
+        'phone': '029 2200 0000',
+        'sort_order': 4,
+    },
+]
+
+
+def seed_homes(apps, schema_editor):
+    CareHome = apps.get_model('tours', 'CareHome')
+    for home in INITIAL_HOMES:
+        CareHome.objects.update_or_create(code=home['code'], defaults=home)
+
+
+def remove_homes(apps, schema_editor):
+    CareHome = apps.get_model('tours', 'CareHome')
+    CareHome.objects.filter(code__in=[home['code'] for home in INITIAL_HOMES]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0002_update_tour_booking_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CareHome',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.SlugField(help_text="Short code stored on bookings (e.g. 'cardiff')", max_length=20, unique=True)),
+                ('display_name', models.CharField(help_text="Short name shown in forms and reports (e.g. 'Cardiff')", max_length=100)),
+                ('name', models.CharField(help_text="Full name of the home (e.g. 'Bellavista Cardiff')", max_length=100)),
+                ('address', models.CharField(help_text='Postal address of the home', max_length=255)),
+                ('latitude', models.FloatField(help_text='Latitude in decimal degrees')),
+                ('longitude', models.FloatField(help_text='Longitude in decimal degrees')),
+                ('phone', models.CharField(help_text='Contact phone number', max_length=20)),
+                ('is_active', models.BooleanField(default=True, help_text='Inactive homes are hidden from bookings and location search')),
+                ('sort_order', models.PositiveIntegerField(default=0, help_text='Order in which homes are listed')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When the home was last updated')),
+            ],
+            options={
+                'verbose_name': 'Care Home',
+                'verbose_name_plural': 'Care Homes',
+                'ordering': ['sort_order', 'code'],
+            },
+        ),
+        migrations.RunPython(seed_homes, remove_homes),
+
+        # Homes are now validated against the registry instead of fixed choices
+        migrations.AlterField(
+            model_name='tourbooking',
+            name='preferred_home',
+            field=models.CharField(help_text='Which care home to visit (CareHome code)', max_length=20),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Migration adding the durable record of geocoded search locations
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0003_carehome_registry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodedLocation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.CharField(help_text='Normalised search text (lower case, single spaces)', max_length=255, unique=True)),
+                ('latitude', models.FloatField(help_text='Latitude in decimal degrees')),
+                ('longitude', models.FloatField(help_text='Longitude in decimal degrees')),
+                ('lookup_count', models.PositiveIntegerField(default=1, help_text='How many times this location was geocoded')),
+                ('last_looked_up', models.DateTimeField(auto_now=True, help_text='When this location was last geocoded')),
+            ],
+            options={
+                'verbose_name': 'Geocoded Location',
+                'verbose_name_plural': 'Geocoded Locations',
+                'ordering': ['-lookup_count'],
+            },
+        ),
+    ]
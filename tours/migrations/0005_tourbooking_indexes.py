@@ -0,0 +1,26 @@
+# Migration adding indexes for the hot booking queries
+# (found with manage.py explain_hot_queries)
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tours', '0004_geocodedlocation'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tourbooking',
+            index=models.Index(fields=['preferred_home', 'preferred_date', 'preferred_time'], name='booking_home_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tourbooking',
+            index=models.Index(fields=['status', 'created_at'], name='booking_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tourbooking',
+            index=models.Index(fields=['created_at'], name='booking_created_idx'),
+        ),
+    ]
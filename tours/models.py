@@ -15,12 +15,7 @@ class TourBooking(models.Model):
     # CHOICES FOR DROPDOWN FIELDS
     # =============================================================================
     
-    HOME_CHOICES = [
-        ('cardiff', 'Cardiff'),
-        ('barry', 'Barry'),
-        ('waverley', 'Waverley'),
-        ('college-fields', 'College Fields'),
-    ]
+    # Homes come from the CareHome registry (tours/registry.py)
     
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -57,10 +52,10 @@ class TourBooking(models.Model):
     # TOUR DETAILS
     # =============================================================================
     
+    # Validated against the CareHome registry, so new homes need no migration
     preferred_home = models.CharField(
         max_length=20, 
-        choices=HOME_CHOICES,
-        help_text="Which care home to visit"
+        help_text="Which care home to visit (CareHome code)"
     )
     
     preferred_date = models.DateField(
@@ -108,6 +103,14 @@ class TourBooking(models.Model):
     
     class Meta:
         ordering = ['-created_at']  # Show newest bookings first
+        indexes = [
+            # Availability lookups (home + date range) and per-home stats
+            models.Index(fields=['preferred_home', 'preferred_date', 'preferred_time'], name='booking_home_date_idx'),
+            # Status filters and totals in stats and exports, newest first
+            models.Index(fields=['status', 'created_at'], name='booking_status_created_idx'),
+            # Newest-first booking list
+            models.Index(fields=['created_at'], name='booking_created_idx'),
+        ]
         verbose_name = 'Tour Booking'
         verbose_name_plural = 'Tour Bookings'
     
@@ -132,4 +135,128 @@ class TourBooking(models.Model):
     
     def get_home_display_name(self):
         """Returns the human-readable name of the selected care home"""
-        return dict(self.HOME_CHOICES)[self.preferred_home]
\ No newline at end of file
+        from .registry import get_registry
+        return get_registry().display_name(self.preferred_home)
+
+
+class CareHome(models.Model):
+    """
+    A Bellavista care home that can be booked and searched for.
+    
+    This is the single source of truth for home data. It is loaded into the
+    in-process registry (tours/registry.py), so homes can be added or edited
+    through the admin without a deploy.
+    """
+    
+    # =============================================================================
+    # IDENTIFICATION
+    # =============================================================================
+    
+    code = models.SlugField(
+        max_length=20,
+        unique=True,
+        help_text="Short code stored on bookings (e.g. 'cardiff')"
+    )
+    
+    display_name = models.CharField(
+        max_length=100,
+        help_text="Short name shown in forms and reports (e.g. 'Cardiff')"
+    )
+    
+    name = models.CharField(
+        max_length=100,
+        help_text="Full name of the home (e.g. 'Bellavista Cardiff')"
+    )
+    
+    # =============================================================================
+    # LOCATION AND CONTACT DETAILS
+    # =============================================================================
+    
+    address = models.CharField(
+        max_length=255,
+        help_text="Postal address of the home"
+    )
+    
+    latitude = models.FloatField(
+        help_text="Latitude in decimal degrees"
+    )
+    
+    longitude = models.FloatField(
+        help_text="Longitude in decimal degrees"
+    )
+    
+    phone = models.CharField(
+        max_length=20,
+        help_text="Contact phone number"
+    )
+    
+    # =============================================================================
+    # DISPLAY AND AVAILABILITY
+    # =============================================================================
+    
+    is_active = models.BooleanField(
+        default=True,
+        help_text="Inactive homes are hidden from bookings and location search"
+    )
+    
+    sort_order = models.PositiveIntegerField(
+        default=0,
+        help_text="Order in which homes are listed"
+    )
+    
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text="When the home was last updated"
+    )
+    
+    class Meta:
+        ordering = ['sort_order', 'code']
+        verbose_name = 'Care Home'
+        verbose_name_plural = 'Care Homes'
+    
+    def __str__(self):
+        """String representation shown in admin and queries"""
+        return f"{self.name} ({self.code})"
+
+class GeocodedLocation(models.Model):
+    """
+    A location that users have searched for, with its geocoded coordinates.
+    
+    Rows are written when Nominatim is actually called, so lookup_count
+    tracks how often a location had to be resolved. manage.py warm_caches
+    copies the most frequent ones back into the geocode cache after a
+    deploy without calling Nominatim again.
+    """
+    
+    query = models.CharField(
+        max_length=255,
+        unique=True,
+        help_text="Normalised search text (lower case, single spaces)"
+    )
+    
+    latitude = models.FloatField(
+        help_text="Latitude in decimal degrees"
+    )
+    
+    longitude = models.FloatField(
+        help_text="Longitude in decimal degrees"
+    )
+    
+    lookup_count = models.PositiveIntegerField(
+        default=1,
+        help_text="How many times this location was geocoded"
+    )
+    
+    last_looked_up = models.DateTimeField(
+        auto_now=True,
+        help_text="When this location was last geocoded"
+    )
+    
+    class Meta:
+        ordering = ['-lookup_count']
+        verbose_name = 'Geocoded Location'
+        verbose_name_plural = 'Geocoded Locations'
+    
+    def __str__(self):
+        """String representation shown in admin and queries"""
+        return f"{self.query} ({self.lookup_count})"
@@ -0,0 +1,119 @@
+"""
+Query Plan Checks for Bellavista Care Homes
+Runs the hot booking views and EXPLAINs every query they send
+"""
+
+import re
+from contextlib import ExitStack
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+
+def hot_endpoints():
+    """(label, URL name, query parameters) for endpoints whose queries grow with bookings"""
+    tour_date = (timezone.localdate() + timedelta(days=7)).isoformat()
+    return [
+        ('available_slots', 'tours:available_slots', {'date': tour_date, 'home': 'cardiff'}),
+        ('booking_stats', 'tours:booking_stats', {}),
+        ('list_bookings', 'tours:list_bookings', {}),
+        ('export_tours', 'tours:export_tours', {'status': 'pending'}),
+    ]
+
+
+# Tables that grow with traffic; full scans of small lookup tables such as
+# the care home registry are expected and not flagged
+GROWING_TABLES = ('tours_tourbooking', 'tours_geocodedlocation')
+
+# Plan lines that read a whole table: SQLite "SCAN t" without an index,
+# PostgreSQL "Seq Scan on t"
+FULL_SCAN_PATTERNS = (
+    re.compile(r'^SCAN (TABLE )?(?P<table>\w+)\b(?! USING (COVERING )?INDEX)'),
+    re.compile(r'Seq Scan on (?P<table>\w+)'),
+)
+
+
+def capture_queries(url_name, params):
+    """
+    Run a view in-process with response caching off and record its SELECTs.
+
+    Returns:
+        tuple: (response status code, list of (database alias, sql, params))
+    """
+    from django.test import RequestFactory, override_settings
+
+    captured = []
+
+    def recorder(alias):
+        def record(execute, sql, sql_params, many, context):
+            if sql.lstrip().upper().startswith('SELECT'):
+                captured.append((alias, sql, sql_params))
+            return execute(sql, sql_params, many, context)
+        return record
+
+    path = reverse(url_name)
+    request = RequestFactory().get(path, params)
+    view = resolve(path).func
+
+    with ExitStack() as stack:
+        stack.enter_context(override_settings(
+            VIEW_CACHE_ENABLED=False,
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+        ))
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(recorder(alias)))
+        response = view(request)
+        if hasattr(response, 'render'):
+            response.render()
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+    return response.status_code, captured
+
+
+def explain(alias, sql, params):
+    """
+    Query plan for one statement as a list of text lines.
+
+    Uses EXPLAIN QUERY PLAN on SQLite and EXPLAIN elsewhere.
+    """
+    connection = connections[alias]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [row[-1] for row in cursor.fetchall()]
+        cursor.execute(f'EXPLAIN {sql}', params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def full_scans(plan):
+    """Growing tables read in full according to a query plan"""
+    tables = []
+    for line in plan:
+        for pattern in FULL_SCAN_PATTERNS:
+            match = pattern.search(line.strip())
+            if match and match.group('table') in GROWING_TABLES:
+                tables.append(match.group('table'))
+    return tables
+
+
+def check_hot_queries(endpoints=None):
+    """
+    EXPLAIN every query behind the hot endpoints.
+
+    Returns:
+        list: One dict per endpoint with label, status and queries, each
+        query a dict with sql, plan and full_scans
+    """
+    results = []
+    for label, url_name, params in endpoints or hot_endpoints():
+        status_code, captured = capture_queries(url_name, params)
+        queries = []
+        for alias, sql, sql_params in captured:
+            plan = explain(alias, sql, sql_params)
+            queries.append({'sql': sql, 'plan': plan, 'full_scans': full_scans(plan)})
+        results.append({'label': label, 'status': status_code, 'queries': queries})
+    return results
@@ -0,0 +1,147 @@
+"""
+Care Home Registry for Bellavista Care Homes
+Immutable in-process snapshot of the CareHome table, reloaded when homes change
+"""
+
+import importlib
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+from django.db import DatabaseError
+
+from .cache import invalidate_namespace, namespace_version
+from .spatial_index import SphericalIndex
+
+# One care home as seen by the rest of the app
+Home = namedtuple('Home', ['code', 'display_name', 'name', 'address', 'coordinates', 'phone', 'is_active'])
+
+# Cache namespace whose version tracks registry changes
+CACHE_NAMESPACE = 'care_homes'
+
+# How often each process compares its snapshot against the shared version (seconds)
+CHECK_INTERVAL = 1.0
+
+# Reload at least this often, in case a version bump was missed (seconds)
+MAX_AGE = 300.0
+
+
+class HomeRegistry:
+    """
+    Immutable snapshot of every care home.
+
+    All lookups are plain dict reads on mappings built once per snapshot,
+    so per-row lookups in serializers and exports are O(1) and allocate nothing.
+    """
+
+    def __init__(self, homes, version=None):
+        self.version = version
+        self.all_homes = tuple(homes)
+        self.homes = tuple(home for home in self.all_homes if home.is_active)
+        self.choices = tuple((home.code, home.display_name) for home in self.homes)
+
+        self._by_code = MappingProxyType({home.code: home for home in self.all_homes})
+        self._display_names = MappingProxyType({home.code: home.display_name for home in self.all_homes})
+
+        # Spatial index over bookable homes for nearest-home queries
+        self.index = SphericalIndex((home.code, *home.coordinates) for home in self.homes)
+
+    def __contains__(self, code):
+        return code in self._by_code
+
+    def __len__(self):
+        return len(self.all_homes)
+
+    def get(self, code):
+        """Return the Home for a code, or None"""
+        return self._by_code.get(code)
+
+    def display_name(self, code):
+        """Return the short display name for a home code (the code itself if unknown)"""
+        return self._display_names.get(code, code)
+
+    def is_bookable(self, code):
+        """Return True if the home exists and is accepting bookings"""
+        home = self._by_code.get(code)
+        return home is not None and home.is_active
+
+
+def _default_homes():
+    """Homes seeded by the registry migration, used only until it has run"""
+    migration = importlib.import_module('tours.migrations.0003_carehome_registry')
+    return [
+        Home(data['code'], data['display_name'], data['name'], data['address'],
+             (data['latitude'], data['longitude']), data['phone'], True)
+        for data in migration.INITIAL_HOMES
+    ]
+
+
+def _load_homes():
+    """Read every care home from the database"""
+    from .models import CareHome
+    rows = CareHome.objects.values_list(
+        'code', 'display_name', 'name', 'address', 'latitude', 'longitude', 'phone', 'is_active'
+    )
+    return [
+        Home(code, display_name, name, address, (latitude, longitude), phone, is_active)
+        for code, display_name, name, address, latitude, longitude, phone, is_active in rows
+    ]
+
+
+# =============================================================================
+# PROCESS-WIDE SNAPSHOT
+# =============================================================================
+
+_registry = None
+_checked_at = 0.0
+_loaded_at = 0.0
+_lock = threading.Lock()
+
+
+def get_registry():
+    """
+    Return the current care home registry.
+
+    The snapshot is shared by all threads in the process. At most once per
+    CHECK_INTERVAL it compares its version with the shared cache and reloads
+    from the database if a home was added, changed or removed.
+    """
+    registry = _registry
+    if registry is not None and time.monotonic() - _checked_at < CHECK_INTERVAL:
+        return registry
+    return _refresh()
+
+
+def _refresh():
+    global _registry, _checked_at, _loaded_at
+
+    with _lock:
+        now = time.monotonic()
+        if _registry is not None and now - _checked_at < CHECK_INTERVAL:
+            return _registry  # another thread refreshed while we waited
+
+        version = namespace_version(CACHE_NAMESPACE)
+
+        if _registry is None or _registry.version != version or now - _loaded_at >= MAX_AGE:
+            try:
+                _registry = HomeRegistry(_load_homes(), version)
+                _loaded_at = now
+            except DatabaseError:
+                # Table not migrated yet - serve defaults and retry on next check
+                _registry = HomeRegistry(_default_homes(), None)
+
+        _checked_at = now
+        return _registry
+
+
+def invalidate_registry():
+    """
+    Mark the registry as changed.
+
+    Every process picks up the new version within CHECK_INTERVAL; the
+    calling process reloads on its next lookup.
+    """
+    global _checked_at
+    invalidate_namespace(CACHE_NAMESPACE)
+    _checked_at = 0.0
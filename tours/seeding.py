@@ -0,0 +1,174 @@
+"""
+Synthetic Booking Data for Bellavista Care Homes
+Generates realistic TourBooking volumes for performance testing
+"""
+
+import random
+from datetime import datetime, time, timedelta
+from itertools import islice
+
+from django.apps.registry import Apps
+from django.db import models, transaction
+from django.utils import timezone
+
+from .cache import invalidate_namespace
+from .constants import TOUR_TIME_SLOTS
+from .models import TourBooking
+from .registry import get_registry
+
+FIRST_NAMES = [
+    'Olivia', 'Amelia', 'Isla', 'Ava', 'Mia', 'Ivy', 'Lily', 'Rosie', 'Grace', 'Freya',
+    'Oliver', 'George', 'Arthur', 'Noah', 'Leo', 'Harry', 'Oscar', 'Jack', 'Rhys', 'Dylan',
+    'Margaret', 'Susan', 'David', 'John', 'Gwen', 'Emrys', 'Carys', 'Owain', 'Sian', 'Ieuan',
+]
+LAST_NAMES = [
+    'Jones', 'Williams', 'Davies', 'Evans', 'Thomas', 'Roberts', 'Hughes', 'Lewis',
+    'Morgan', 'Griffiths', 'Price', 'Smith', 'Taylor', 'Brown', 'Wilson', 'Edwards',
+]
+EMAIL_DOMAINS = ['gmail.com', 'hotmail.co.uk', 'outlook.com', 'btinternet.com', 'yahoo.co.uk']
+NOTES = [
+    'Mum uses a wheelchair',
+    'Would like to see the garden',
+    'Interested in respite care',
+    'Coming with my brother',
+    'Please call before the visit',
+]
+
+# Relative popularity of the tour times (mid-morning and early afternoon are busiest)
+TIME_WEIGHTS = [2, 5, 4, 5, 3, 1]
+
+# Outcome of tours whose date has passed
+PAST_STATUS_WEIGHTS = {'visited': 70, 'not_visited': 18, 'pending': 12}
+
+
+def _seed_model():
+    """
+    Build an unmanaged copy of TourBooking without auto_now/auto_now_add.
+
+    It maps onto the same table, so bulk_create writes the generated
+    timestamps in the INSERT itself. It lives in its own app registry, so
+    makemigrations and the rest of the project never see it.
+    """
+    attrs = {'__module__': __name__}
+    for field in TourBooking._meta.concrete_fields:
+        attrs[field.name] = clone = field.clone()
+        if isinstance(clone, models.DateField):
+            clone.auto_now = clone.auto_now_add = False
+
+    class Meta:
+        app_label = TourBooking._meta.app_label
+        db_table = TourBooking._meta.db_table
+        managed = False
+        apps = Apps()
+
+    attrs['Meta'] = Meta
+    return type('SeedBooking', (models.Model,), attrs)
+
+
+SeedBooking = _seed_model()
+
+
+def generate_bookings(count, seed=0, today=None, days_back=365, days_ahead=60):
+    """
+    Yield unsaved TourBooking objects with realistic, skewed distributions.
+
+    The same seed and `today` always produce the same bookings. Homes
+    follow a long-tail popularity curve, weekdays are busier than weekends,
+    most tours are booked a week or two ahead, and past tours have a mix
+    of outcomes while future ones are pending.
+
+    Args:
+        count (int): Number of bookings to generate
+        seed (int): Random seed
+        today (date): Reference date (default: today)
+        days_back (int): How far into the past tour dates go
+        days_ahead (int): How far into the future tour dates go
+    """
+    rng = random.Random(seed)
+    today = today or timezone.localdate()
+    homes = [home.code for home in get_registry().homes]
+    home_weights = [1 / rank for rank in range(1, len(homes) + 1)]
+    slots = [time.fromisoformat(slot) for slot in TOUR_TIME_SLOTS]
+    statuses = list(PAST_STATUS_WEIGHTS)
+    status_weights = list(PAST_STATUS_WEIGHTS.values())
+    tz = timezone.get_current_timezone()
+
+    now = datetime.combine(today, time(9), tz)
+    future_share = days_ahead / (days_back + days_ahead) if days_back + days_ahead else 0
+
+    for _ in range(count):
+        # Dates cluster around today and thin out further away; Sundays are quiet
+        while True:
+            if rng.random() < future_share:
+                offset = min(int(rng.expovariate(3 / days_ahead)), days_ahead)
+            else:
+                offset = -min(int(rng.expovariate(3 / days_back)) + 1, days_back)
+            tour_date = today + timedelta(days=offset)
+            if tour_date.weekday() != 6 or rng.random() < 0.3:
+                break
+
+        # Most tours are booked a week or two ahead, never after "now"
+        lead_days = min(rng.expovariate(1 / 10), 90)
+        created_at = min(datetime.combine(tour_date, time(9), tz) - timedelta(days=lead_days), now)
+        if tour_date < today:
+            status = rng.choices(statuses, status_weights)[0]
+        else:
+            status = 'pending'
+
+        first_name = rng.choice(FIRST_NAMES)
+        last_name = rng.choice(LAST_NAMES) if rng.random() < 0.9 else None
+        email = f'{first_name}.{last_name or "family"}{rng.randrange(1000)}@{rng.choice(EMAIL_DOMAINS)}'.lower()
+
+        yield TourBooking(
+            first_name=first_name,
+            last_name=last_name,
+            email=email,
+            phone_number=f'07{rng.randrange(10 ** 9):09d}',
+            preferred_home=rng.choices(homes, home_weights)[0],
+            preferred_date=tour_date,
+            preferred_time=rng.choices(slots, TIME_WEIGHTS)[0],
+            notes=rng.choice(NOTES) if rng.random() < 0.15 else None,
+            status=status,
+            created_at=created_at,
+            updated_at=created_at,
+        )
+
+
+def seed_bookings(count, seed=0, chunk_size=5000, progress=None, **options):
+    """
+    Insert `count` generated bookings with bulk_create, one transaction per chunk.
+
+    Memory stays flat however many rows are requested, and an interrupted
+    run keeps the chunks already committed. Rows go through SeedBooking so
+    the generated created_at and updated_at are inserted as they are,
+    instead of being stamped with the current time. bulk_create sends no
+    signals, so the bookings cache namespace is invalidated at the end.
+
+    Args:
+        count (int): Number of bookings to insert
+        seed (int): Random seed passed to generate_bookings()
+        chunk_size (int): Rows per bulk_create/transaction
+        progress (callable): Called with the running total after each chunk
+        **options: Passed on to generate_bookings()
+
+    Returns:
+        int: Number of bookings inserted
+    """
+    bookings = generate_bookings(count, seed=seed, **options)
+    attnames = [field.attname for field in SeedBooking._meta.concrete_fields]
+    inserted = 0
+    while True:
+        chunk = [
+            SeedBooking(**{attname: getattr(booking, attname) for attname in attnames})
+            for booking in islice(bookings, chunk_size)
+        ]
+        if not chunk:
+            break
+        with transaction.atomic():
+            SeedBooking.objects.bulk_create(chunk)
+        inserted += len(chunk)
+        if progress:
+            progress(inserted)
+
+    invalidate_namespace('bookings')
+    return inserted
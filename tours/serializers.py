@@ -4,6 +4,7 @@
 from rest_framework import serializers
 from datetime import date
 from .models import TourBooking
+from .registry import get_registry
 
 
 class TourBookingSerializer(serializers.ModelSerializer):
@@ -36,6 +37,15 @@ class TourBookingSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Tour date cannot be in the past.")
         return value
     
+    def validate_preferred_home(self, value):
+        """
+        Custom validation for preferred_home field.
+        Ensures the home exists in the care home registry and is taking bookings.
+        """
+        if not get_registry().is_bookable(value):
+            raise serializers.ValidationError(f'"{value}" is not a valid choice.')
+        return value
+    
     def validate_email(self, value):
         """
         Custom validation for email field.
@@ -0,0 +1,29 @@
+# Signal Handlers for Tours App
+# Keep in-process caches in step with database changes
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_on_commit
+from .models import CareHome, TourBooking
+from .registry import invalidate_registry
+
+
+@receiver(post_save, sender=CareHome)
+@receiver(post_delete, sender=CareHome)
+def care_home_changed(sender, **kwargs):
+    """
+    Reload the care home registry in every process once the change commits.
+
+    Bumping the version before the commit would let another worker reload
+    the old rows under the new version and keep them for up to MAX_AGE.
+    """
+    transaction.on_commit(invalidate_registry)
+
+
+@receiver(post_save, sender=TourBooking)
+@receiver(post_delete, sender=TourBooking)
+def booking_changed(sender, **kwargs):
+    """Drop cached responses derived from bookings (slots, stats) once the change commits"""
+    invalidate_on_commit('bookings')
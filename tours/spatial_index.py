@@ -0,0 +1,191 @@
+"""
+Spatial Index for Bellavista Care Homes
+k-d tree over unit-sphere coordinates for nearest-home and radius queries
+"""
+
+import heapq
+import math
+
+# Earth's radius in miles (matches haversine_distance in views.py)
+EARTH_RADIUS_MILES = 3959
+
+
+def unit_vector(lat, lon):
+    """Convert latitude/longitude in degrees to a point on the unit sphere"""
+    lat_rad = math.radians(lat)
+    lon_rad = math.radians(lon)
+    cos_lat = math.cos(lat_rad)
+    return (cos_lat * math.cos(lon_rad), cos_lat * math.sin(lon_rad), math.sin(lat_rad))
+
+
+def chord_to_miles(chord):
+    """Convert a straight-line chord on the unit sphere to great circle miles"""
+    return EARTH_RADIUS_MILES * 2 * math.asin(min(1.0, chord / 2))
+
+
+def great_circle_miles(lat1, lon1, lat2, lon2):
+    """Great circle distance between two points, in miles"""
+    return chord_to_miles(math.dist(unit_vector(lat1, lon1), unit_vector(lat2, lon2)))
+
+
+def miles_to_chord(miles):
+    """Convert a great circle distance in miles to a chord on the unit sphere"""
+    angle = min(math.pi, miles / EARTH_RADIUS_MILES)
+    return 2 * math.sin(angle / 2)
+
+
+class SphericalIndex:
+    """
+    Static k-d tree over points on the unit sphere.
+
+    Points are stored as 3D unit vectors, where straight-line (chord) distance
+    increases monotonically with great circle distance. That lets a plain
+    Euclidean k-d tree answer nearest-k and radius queries in O(log n) for
+    typical inputs, with exact great circle distances in the results.
+
+    The tree is immutable once built; rebuild it when the site list changes.
+    """
+
+    # Subtrees at or below this size are scanned linearly
+    LEAF_SIZE = 8
+
+    def __init__(self, items):
+        """
+        Build the index.
+
+        Args:
+            items (iterable): (key, latitude, longitude) tuples
+        """
+        self._keys = []
+        self._points = []
+        for key, lat, lon in items:
+            self._keys.append(key)
+            self._points.append(unit_vector(lat, lon))
+
+        # Nodes are (axis, split, left, right, start, end); leaves have axis None
+        self._order = list(range(len(self._points)))
+        self._nodes = []
+        self._root = self._build(0, len(self._order)) if self._order else None
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _build(self, start, end):
+        """Recursively build the subtree over self._order[start:end]"""
+        node_id = len(self._nodes)
+        self._nodes.append(None)
+
+        if end - start <= self.LEAF_SIZE:
+            self._nodes[node_id] = (None, None, None, None, start, end)
+            return node_id
+
+        # Split on the axis with the widest spread
+        points = self._points
+        indices = self._order[start:end]
+        spreads = []
+        for axis in range(3):
+            values = [points[i][axis] for i in indices]
+            spreads.append(max(values) - min(values))
+        axis = spreads.index(max(spreads))
+
+        indices.sort(key=lambda i: points[i][axis])
+        self._order[start:end] = indices
+        mid = start + (end - start) // 2
+        split = points[self._order[mid]][axis]
+
+        left = self._build(start, mid)
+        right = self._build(mid, end)
+        self._nodes[node_id] = (axis, split, left, right, start, end)
+        return node_id
+
+    def nearest(self, lat, lon, k=1):
+        """
+        Find the k nearest points.
+
+        Args:
+            lat, lon (float): Query latitude and longitude
+            k (int): Number of results to return
+
+        Returns:
+            list: Up to k (key, distance_miles) tuples, nearest first
+        """
+        if self._root is None or k < 1:
+            return []
+
+        query = unit_vector(lat, lon)
+        points = self._points
+        order = self._order
+        nodes = self._nodes
+
+        # Max-heap of (-squared_chord, index) holding the best k so far
+        best = []
+        stack = [(0.0, self._root)]
+
+        while stack:
+            bound, node_id = stack.pop()
+            if len(best) == k and bound >= -best[0][0]:
+                continue
+
+            axis, split, left, right, start, end = nodes[node_id]
+            if axis is None:
+                for i in order[start:end]:
+                    px, py, pz = points[i]
+                    dx, dy, dz = px - query[0], py - query[1], pz - query[2]
+                    dist_sq = dx * dx + dy * dy + dz * dz
+                    if len(best) < k:
+                        heapq.heappush(best, (-dist_sq, i))
+                    elif dist_sq < -best[0][0]:
+                        heapq.heapreplace(best, (-dist_sq, i))
+                continue
+
+            # Visit the near side first; the far side only if it can still win
+            diff = query[axis] - split
+            near, far = (left, right) if diff < 0 else (right, left)
+            stack.append((max(bound, diff * diff), far))
+            stack.append((bound, near))
+
+        results = sorted((-neg_dist_sq, i) for neg_dist_sq, i in best)
+        return [(self._keys[i], chord_to_miles(math.sqrt(dist_sq))) for dist_sq, i in results]
+
+    def within(self, lat, lon, radius_miles):
+        """
+        Find all points within a radius.
+
+        Args:
+            lat, lon (float): Query latitude and longitude
+            radius_miles (float): Search radius in miles
+
+        Returns:
+            list: (key, distance_miles) tuples, nearest first
+        """
+        if self._root is None or radius_miles < 0:
+            return []
+
+        query = unit_vector(lat, lon)
+        limit_sq = miles_to_chord(radius_miles) ** 2
+        points = self._points
+        order = self._order
+        nodes = self._nodes
+
+        matches = []
+        stack = [self._root]
+
+        while stack:
+            axis, split, left, right, start, end = nodes[stack.pop()]
+            if axis is None:
+                for i in order[start:end]:
+                    px, py, pz = points[i]
+                    dx, dy, dz = px - query[0], py - query[1], pz - query[2]
+                    dist_sq = dx * dx + dy * dy + dz * dz
+                    if dist_sq <= limit_sq:
+                        matches.append((dist_sq, i))
+                continue
+
+            diff = query[axis] - split
+            near, far = (left, right) if diff < 0 else (right, left)
+            stack.append(near)
+            if diff * diff <= limit_sq:
+                stack.append(far)
+
+        matches.sort()
+        return [(self._keys[i], chord_to_miles(math.sqrt(dist_sq))) for dist_sq, i in matches]
@@ -0,0 +1,163 @@
+"""
+Rate Limiting for Bellavista Care Homes
+Token-bucket throttles per client and endpoint, shared by every worker
+"""
+
+import logging
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import exceptions
+from rest_framework.throttling import BaseThrottle
+
+from .constants import MAX_BATCH_LOCATIONS
+from .location_service import uncached_queries
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """
+    '10/min' -> (10, 60): requests allowed and the period they refill over.
+
+    Like DRF's rates, the period is read from its first letter (s, m, h, d).
+    """
+    count, _, period = rate.partition('/')
+    return int(count), PERIODS[period.strip()[0]]
+
+
+class TokenBucket:
+    """
+    A token bucket in the shared cache, as a theoretical next-slot time.
+
+    Equivalent to a bucket of `capacity` tokens refilled at capacity/period:
+    each request pushes the client's next free slot one interval later with
+    an atomic incr, and is refused if that lands more than a full bucket
+    ahead of now (the push is then handed back). A missing key is a full
+    bucket, created with an atomic add. Counters are never read, modified
+    and written back, so limits hold across gunicorn workers.
+    """
+
+    def __init__(self, capacity, period):
+        self.capacity = capacity
+        self.interval_ms = period * 1000 // capacity
+
+    def _expire(self, key, slot_ms, now_ms):
+        # The key lives until its slot has passed, when the bucket is full again
+        cache.touch(key, math.ceil((slot_ms - now_ms) / 1000))
+
+    def consume(self, key, tokens=1):
+        """
+        Take `tokens` tokens (at most `capacity`) at once, or none.
+
+        Returns:
+            float: 0 if the request may proceed, else seconds until enough tokens are free
+        """
+        step_ms = tokens * self.interval_ms
+        now_ms = int(time.time() * 1000)
+        try:
+            slot_ms = cache.incr(key, step_ms)
+        except ValueError:
+            # No slot yet, or it expired: the bucket is full
+            first_slot_ms = now_ms + step_ms
+            if cache.add(key, first_slot_ms, math.ceil(step_ms / 1000)):
+                return 0
+            slot_ms = cache.incr(key, step_ms)
+
+        # Cache expiry has whole-second resolution, so an idle slot can trail
+        # now by up to a second; that only means a token or so more burst
+        excess_ms = slot_ms - now_ms - self.capacity * self.interval_ms
+        if excess_ms > 0:
+            cache.decr(key, step_ms)
+            return excess_ms / 1000
+        self._expire(key, slot_ms, now_ms)
+        return 0
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    DRF throttle with a token bucket per client IP and endpoint.
+
+    The rate for `scope` comes from THROTTLE_RATES, e.g. '10/min': a client
+    may burst 10 requests, then gets one more every 6 seconds. Each URL
+    using the throttle has its own buckets. Refused requests get a 429 with
+    Retry-After. With RATE_LIMIT_ENABLED off, or a cache failure, requests
+    are let through. Requests cost one token unless get_cost() says more.
+    """
+
+    scope = None
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def get_cost(self, request, view, capacity):
+        """Tokens the request takes, at most `capacity`"""
+        return 1
+
+    def get_cache_key(self, request, view):
+        match = getattr(request, 'resolver_match', None)
+        endpoint = match.view_name if match else request.path
+        return f'throttle:{self.scope}:{endpoint}:{self.get_ident(request)}'
+
+    def allow_request(self, request, view):
+        if not settings.RATE_LIMIT_ENABLED:
+            return True
+        rate = settings.THROTTLE_RATES.get(self.scope)
+        if not rate:
+            return True
+
+        capacity, period = parse_rate(rate)
+        try:
+            cost = self.get_cost(request, view, capacity)
+            wait = TokenBucket(capacity, period).consume(self.get_cache_key(request, view), cost)
+        except exceptions.APIException:
+            raise
+        except Exception:
+            logger.warning('Rate limit check failed - allowing request', exc_info=True,
+                           extra={'scope': self.scope})
+            return True
+        self.wait_seconds = wait
+        return wait == 0
+
+    def wait(self):
+        # Whole seconds for Retry-After, rounded up so a retry is never early
+        return math.ceil(self.wait_seconds) if self.wait_seconds else None
+
+
+class BookingRateThrottle(TokenBucketThrottle):
+    """Tour booking requests, which write to the database and send email"""
+
+    scope = 'booking'
+
+
+class GeocodingRateThrottle(TokenBucketThrottle):
+    """Location lookups, which may spend the shared Nominatim quota"""
+
+    scope = 'geocoding'
+
+
+class GeocodingBatchRateThrottle(GeocodingRateThrottle):
+    """
+    Batch location lookups, charged one token per address not yet cached.
+
+    Coordinates and cached addresses are free, though like any other lookup
+    a batch takes at least one token. A batch needing more new addresses
+    than a full bucket holds could never be let through and is rejected.
+    """
+
+    def get_cost(self, request, view, capacity):
+        locations = request.data.get('locations') if isinstance(request.data, dict) else None
+        if not isinstance(locations, list) or len(locations) > MAX_BATCH_LOCATIONS:
+            # The view rejects the request
+            return 1
+        cost = len(uncached_queries(locations))
+        if cost > capacity:
+            raise exceptions.ValidationError({'locations': [
+                f'A maximum of {capacity} new addresses can be geocoded per request '
+                f'({cost} given); send the rest in later requests'
+            ]})
+        return max(cost, 1)
@@ -0,0 +1,168 @@
+"""
+Travel Times for Bellavista Care Homes
+Precomputed outcode-to-home driving times with a consistent straight-line fallback
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+from array import array
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .constants import AVERAGE_SPEED_KMH, KM_PER_MILE
+
+# File signature for the compact matrix format
+MATRIX_MAGIC = b'BVTT1\n'
+
+# Marker for outcode/home pairs with no known travel time
+MISSING = 0xFFFF
+
+# UK outcode at the start of a postcode: "CF10 1AA", "CF101AA" or just "CF10"
+OUTCODE_PATTERN = re.compile(r'^([A-Z]{1,2}[0-9][A-Z0-9]?)\s*(?:[0-9][A-Z]{2})?$')
+
+
+def estimate_minutes(distance_miles):
+    """
+    Estimate driving time from straight-line distance.
+
+    Converts miles to km before dividing by AVERAGE_SPEED_KMH, so estimates
+    agree with the offline matrix builder.
+    """
+    return int(distance_miles * KM_PER_MILE / AVERAGE_SPEED_KMH * 60)
+
+
+def outcode_from_location(location):
+    """
+    Extract the outcode from a UK postcode.
+
+    Args:
+        location (str): Free-text location entered by the user
+
+    Returns:
+        str: Upper-case outcode (e.g. 'CF10') or None if it is not a postcode
+    """
+    match = OUTCODE_PATTERN.match(' '.join(location.split()).upper())
+    return match.group(1) if match else None
+
+
+class TravelTimeMatrix:
+    """
+    Read-only table of driving minutes from outcodes to homes.
+
+    Stored as a JSON header (outcode and home order) followed by a row-major
+    array of unsigned 16-bit minutes, so lookups are two dict reads and an
+    array index.
+    """
+
+    def __init__(self, outcodes, homes, minutes):
+        self.outcodes = {outcode: row for row, outcode in enumerate(outcodes)}
+        self.homes = {home: col for col, home in enumerate(homes)}
+        self.width = len(homes)
+        self.minutes = minutes
+
+    def lookup(self, outcode, home_code):
+        """Return driving minutes, or None if the pair is not in the matrix"""
+        row = self.outcodes.get(outcode)
+        col = self.homes.get(home_code)
+        if row is None or col is None:
+            return None
+        value = self.minutes[row * self.width + col]
+        return None if value == MISSING else value
+
+    @classmethod
+    def load(cls, path):
+        """Load a matrix written by save()"""
+        with open(path, 'rb') as f:
+            if f.readline() != MATRIX_MAGIC:
+                raise ValueError(f'{path} is not a travel time matrix')
+            header = json.loads(f.readline())
+            minutes = array('H')
+            minutes.frombytes(f.read())
+
+        if sys.byteorder == 'big':
+            minutes.byteswap()
+        if len(minutes) != len(header['outcodes']) * len(header['homes']):
+            raise ValueError(f'{path} is truncated')
+        return cls(header['outcodes'], header['homes'], minutes)
+
+    @staticmethod
+    def save(path, outcodes, homes, minutes):
+        """Write a matrix; minutes is a row-major iterable of ints or None"""
+        data = array('H', (MISSING if m is None else min(m, MISSING - 1) for m in minutes))
+        if sys.byteorder == 'big':
+            data.byteswap()
+
+        header = json.dumps({'outcodes': list(outcodes), 'homes': list(homes)}).encode()
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(MATRIX_MAGIC)
+            f.write(header + b'\n')
+            f.write(data.tobytes())
+        os.replace(tmp_path, path)
+
+
+_matrix = None
+_loaded = False
+_lock = threading.Lock()
+
+
+def get_travel_matrix():
+    """Return the travel time matrix, loading it on first use (None if absent)"""
+    global _matrix, _loaded
+    if not _loaded:
+        with _lock:
+            if not _loaded:
+                path = settings.TRAVEL_TIME_MATRIX_PATH
+                try:
+                    _matrix = TravelTimeMatrix.load(path) if os.path.exists(path) else None
+                except (OSError, ValueError):
+                    _matrix = None
+                _loaded = True
+    return _matrix
+
+
+async def aget_travel_matrix():
+    """get_travel_matrix() for async views; the first load reads the file in a thread"""
+    if not _loaded:
+        await sync_to_async(get_travel_matrix)()
+    return _matrix
+
+
+def reset_travel_matrix():
+    """Forget the loaded matrix so the next lookup reloads it from disk"""
+    global _matrix, _loaded
+    with _lock:
+        _matrix = None
+        _loaded = False
+
+
+def travel_minutes(location, home_code, distance_miles):
+    """
+    Driving minutes to a home: a matrix read for postcodes, else an estimate.
+
+    Args:
+        location (str): Free-text location (may be empty for lat/lon searches)
+        home_code (str): Care home code
+        distance_miles (float): Straight-line distance used for the fallback
+
+    Returns:
+        int: Estimated driving time in minutes
+    """
+    outcode = outcode_from_location(location) if location else None
+    if outcode:
+        matrix = get_travel_matrix()
+        if matrix is not None:
+            minutes = matrix.lookup(outcode, home_code)
+            if minutes is not None:
+                return minutes
+    return estimate_minutes(distance_miles)
+
+
+async def atravel_minutes(location, home_code, distance_miles):
+    """travel_minutes() for async views, without file I/O on the event loop"""
+    await aget_travel_matrix()
+    return travel_minutes(location, home_code, distance_miles)
@@ -45,4 +45,10 @@ urlpatterns = [
     
     # Find nearest care home to user location
     path('find-nearest-home/', views.find_nearest_home, name='find_nearest_home'),
+    
+    # Find nearest care homes with their next available tour slots
+    path('find-nearest-home/availability/', views.find_nearest_home_with_slots, name='find_nearest_home_with_slots'),
+    
+    # Find nearest care homes for a batch of locations (streamed)
+    path('find-nearest-home/batch/', views.find_nearest_home_batch, name='find_nearest_home_batch'),
 ]
@@ -2,16 +2,37 @@
 # This file contains all the API endpoints for the tour booking functionality
 
 from rest_framework import status, generics
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, throttle_classes
 from rest_framework.response import Response
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from .email_service import send_booking_confirmation_email, send_test_email
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count, Q
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_date
+from bellavista_backend.instrumentation import current_stats, request_context, track
+from bellavista_backend.routers import is_pinned_to_primary, replica_reads, use_replica
+from .email_service import send_booking_confirmation_email, send_test_email_async
+from .location_service import (
+    aresolve_nearest_homes, ageocode_location, geocode_location, nearest_homes, parse_point,
+    resolve_nearest_homes
+)
 import requests
+import json
+import logging
 import math
 
+from .async_api import async_api_view
+from .cache import cache_policy
+from .availability import available_slots_for_day, next_available_slots
 from .models import TourBooking
+from .registry import get_registry
+from .travel_times import atravel_minutes, travel_minutes
 from .serializers import TourBookingCreateSerializer, TourBookingListSerializer
-from .constants import HOME_LOCATIONS, AVERAGE_SPEED_KMH
+from .throttling import BookingRateThrottle, GeocodingBatchRateThrottle, GeocodingRateThrottle
+from .constants import MAX_BATCH_LOCATIONS, MAX_NEAREST_HOMES, MAX_SLOTS_PER_HOME
+
+logger = logging.getLogger(__name__)
 
 # =============================================================================
 # MAIN BOOKING VIEWS
@@ -27,6 +48,7 @@ class TourBookingCreateView(generics.CreateAPIView):
     
     queryset = TourBooking.objects.all()
     serializer_class = TourBookingCreateSerializer
+    throttle_classes = [BookingRateThrottle]
     
     def get(self, request, *args, **kwargs):
         """
@@ -47,16 +69,19 @@ class TourBookingCreateView(generics.CreateAPIView):
         Handle POST requests - create a new tour booking.
         """
         serializer = self.get_serializer(data=request.data)
-        if serializer.is_valid():
-            booking = serializer.save()
+        with track('validate'):
+            valid = serializer.is_valid()
+        if valid:
+            with track('insert'):
+                booking = serializer.save()
             
             # Try to send email with timeout protection
             email_sent = False
             email_error = None
             
             try:
+                import contextvars
                 import threading
-                import time
                 
                 # Use threading for timeout protection
                 result = {'email_sent': False, 'error': None}
@@ -67,24 +92,26 @@ class TourBookingCreateView(generics.CreateAPIView):
                     except Exception as e:
                         result['error'] = str(e)
                 
-                # Start email thread with 1 second timeout
-                email_thread = threading.Thread(target=send_email_thread)
+                # Start email thread with 1 second timeout; it runs in a copy of
+                # this context so the SendGrid call is counted against this request
+                email_thread = threading.Thread(target=contextvars.copy_context().run, args=(send_email_thread,))
                 email_thread.daemon = True
-                email_thread.start()
-                email_thread.join(timeout=1.0)
+                with track('email'):
+                    email_thread.start()
+                    email_thread.join(timeout=1.0)
                 
                 if email_thread.is_alive():
                     email_error = "Email timeout - continuing without email"
-                    print(f"Email timeout for booking {booking.id} - continuing")
+                    logger.warning('Email timeout - continuing without email', extra={'booking_id': booking.id})
                 else:
                     email_sent = result['email_sent']
                     if result['error']:
                         email_error = result['error']
-                        print(f"Email error for booking {booking.id}: {result['error']}")
+                        logger.error('Email error: %s', result['error'], extra={'booking_id': booking.id})
                 
             except Exception as e:
                 email_error = f"Email system error: {str(e)}"
-                print(f"Email system error for booking {booking.id}: {e}")
+                logger.exception('Email system error', extra={'booking_id': booking.id})
             
             return Response({
                 'success': True,
@@ -113,11 +140,17 @@ class TourBookingListView(generics.ListAPIView):
     queryset = TourBooking.objects.all()
     serializer_class = TourBookingListSerializer
     
+    def get(self, request, *args, **kwargs):
+        """Serve the list from the read replica when one is configured"""
+        with replica_reads(request):
+            return super().get(request, *args, **kwargs)
+    
 # =============================================================================
 # UTILITY API ENDPOINTS
 # =============================================================================
 
 @api_view(['GET'])
+@cache_policy(3600, vary_on=('date', 'home'), tags=('bookings',))
 def available_slots(request):
     """
     Get available time slots for a specific date and care home.
@@ -138,31 +171,23 @@ def available_slots(request):
             'error': 'Date and home parameters are required'
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    # Get existing bookings for this date and home
-    existing_bookings = TourBooking.objects.filter(
-        preferred_date=date,
-        preferred_home=home
-    ).values_list('preferred_time', flat=True)
-
-    # Define all possible time slots
-    all_slots = ['09:00', '10:00', '11:00', '14:00', '15:00', '16:00']
-    
-    # Convert booked times to string format
-    booked_slots = [str(time) for time in existing_bookings]
-    
-    # Find available slots
-    available_slots_list = [
-        slot for slot in all_slots
-        if slot not in booked_slots
-    ]
+    tour_date = parse_date(date)
+    if tour_date is None:
+        return Response({
+            'error': 'Date must be in YYYY-MM-DD format'
+        }, status=status.HTTP_400_BAD_REQUEST)
     
     return Response({
-        'available_slots': available_slots_list,
+        'available_slots': available_slots_for_day(home, tour_date),
         'date': date,
         'home': home
     })
 
 @api_view(['GET'])
+# Pinned clients skip the cache: an entry may have been computed on a
+# replica that had not yet caught up with their write
+@cache_policy(300, tags=('bookings', 'care_homes'), bypass=is_pinned_to_primary)
+@use_replica
 def booking_stats(request):
     """
     Get booking statistics for admin dashboard.
@@ -173,21 +198,28 @@ def booking_stats(request):
         - Bookings by status
         - Bookings by care home
     """
-    # Count bookings by status
-    total_bookings = TourBooking.objects.count()
-    confirmed_bookings = TourBooking.objects.filter(status='visited').count()
-    pending_bookings = TourBooking.objects.filter(status='pending').count()
+    # Count bookings by status in a single query
+    totals = TourBooking.objects.aggregate(
+        total_bookings=Count('id'),
+        confirmed_bookings=Count('id', filter=Q(status='visited')),
+        pending_bookings=Count('id', filter=Q(status='pending')),
+    )
     
-    # Count bookings by care home
-    homes_stats = {}
-    for home_code, home_name in TourBooking.HOME_CHOICES:
-        count = TourBooking.objects.filter(preferred_home=home_code).count()
-        homes_stats[home_name] = count
+    # Count bookings by care home in a single grouped query
+    home_counts = dict(
+        TourBooking.objects.order_by()
+        .values_list('preferred_home')
+        .annotate(count=Count('id'))
+    )
+    homes_stats = {
+        home.display_name: home_counts.get(home.code, 0)
+        for home in get_registry().all_homes
+    }
     
     return Response({
-        'total_bookings': total_bookings,
-        'confirmed_bookings': confirmed_bookings,
-        'pending_bookings': pending_bookings,
+        'total_bookings': totals['total_bookings'],
+        'confirmed_bookings': totals['confirmed_bookings'],
+        'pending_bookings': totals['pending_bookings'],
         'homes_stats': homes_stats
     })
 
@@ -238,7 +270,14 @@ def update_tour_status(request, booking_id):
 # ADMIN AND EXPORT ENDPOINTS
 # =============================================================================
 
+# Column headings of the Excel export, in order
+EXPORT_COLUMNS = [
+    'ID', 'First Name', 'Last Name', 'Email', 'Phone', 'Location',
+    'Date', 'Time', 'Notes', 'Status', 'Created',
+]
+
 @api_view(['GET'])
+@use_replica
 def export_tours(request):
     """
     Export tour bookings to Excel file.
@@ -250,9 +289,9 @@ def export_tours(request):
         Excel file download or error message
     """
     try:
-        import pandas as pd
-        from django.http import HttpResponse
-        import io
+        import tempfile
+        from django.http import FileResponse
+        from openpyxl import Workbook
         
         # Get status filter from query parameters
         status_filter = request.GET.get('status', 'all')
@@ -263,71 +302,69 @@ def export_tours(request):
         else:
             bookings = TourBooking.objects.filter(status=status_filter)
         
-        # Convert bookings to list of dictionaries
-        data = []
-        for booking in bookings:
-            data.append({
-                'ID': booking.id,
-                'First Name': booking.first_name,
-                'Last Name': booking.last_name or '',
-                'Email': booking.email,
-                'Phone': booking.phone_number,
-                'Location': booking.get_home_display_name(),
-                'Date': booking.preferred_date.strftime('%Y-%m-%d'),
-                'Time': booking.preferred_time.strftime('%H:%M'),
-                'Notes': booking.notes or '',
-                'Status': booking.status.title(),
-                'Created': booking.created_at.strftime('%Y-%m-%d %H:%M')
-            })
+        # Stream rows in chunks (a server-side cursor on PostgreSQL) into a
+        # write-only workbook, which flushes each row to disk, so memory
+        # stays flat however many bookings are exported
+        bookings = bookings.iterator(chunk_size=settings.DATABASE_ITERATOR_CHUNK_SIZE)
         
-        # Create DataFrame and Excel file
-        df = pd.DataFrame(data)
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet('Tour Bookings')
+        sheet.append(EXPORT_COLUMNS)
         
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Tour Bookings', index=False)
+        registry = get_registry()
+        for booking in bookings:
+            sheet.append([
+                booking.id,
+                booking.first_name,
+                booking.last_name or '',
+                booking.email,
+                booking.phone_number,
+                registry.display_name(booking.preferred_home),
+                booking.preferred_date.strftime('%Y-%m-%d'),
+                booking.preferred_time.strftime('%H:%M'),
+                booking.notes or '',
+                booking.status.title(),
+                booking.created_at.strftime('%Y-%m-%d %H:%M'),
+            ])
         
+        # The finished file is sent from disk in chunks and deleted on close
+        output = tempfile.TemporaryFile()
+        workbook.save(output)
         output.seek(0)
         
         # Return Excel file as download
-        response = HttpResponse(
-            output.getvalue(),
+        return FileResponse(
+            output,
+            as_attachment=True,
+            filename=f'tour_bookings_{status_filter}.xlsx',
             content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
         )
-        response['Content-Disposition'] = f'attachment; filename="tour_bookings_{status_filter}.xlsx"'
-        
-        return response
         
     except ImportError:
         return Response({
-            'error': 'Excel export not available. Install pandas and openpyxl.'
+            'error': 'Excel export not available. Install openpyxl.'
         }, status=500)
     except Exception as e:
         return Response({
             'error': f'Export failed: {str(e)}'
         }, status=500)
 
-@api_view(['GET', 'POST'])
-def test_connection(request):
+@async_api_view(['GET', 'POST'])
+async def test_connection(request):
     """
     Test endpoint to verify frontend-backend connection and performance.
     
     GET: Basic connection test
     POST: Test email functionality
     
+    Runs as an async view so a slow SendGrid call does not hold a worker.
+    
     Returns:
         JSON with connection status, performance metrics, and test results
     """
-    import time
-    from django.core.mail import send_mail
-    from django.conf import settings
-    
-    start_time = time.time()
-    
     # Basic database query test
     try:
-        booking_count = TourBooking.objects.count()
-        db_time = time.time() - start_time
+        booking_count = await TourBooking.objects.acount()
     except Exception as e:
         return Response({
             'status': 'error',
@@ -338,10 +375,6 @@ def test_connection(request):
         'status': 'connected',
         'message': 'Backend is working!',
         'total_bookings': booking_count,
-        'performance': {
-            'db_query_time': f'{db_time:.3f}s',
-            'total_response_time': f'{time.time() - start_time:.3f}s'
-        },
         'email_configured': bool(settings.EMAIL_HOST_USER)
     }
     
@@ -349,26 +382,31 @@ def test_connection(request):
     if request.method == 'POST':
         test_email = request.data.get('email')
         if test_email:
-            email_start = time.time()
-            email_result = send_test_email(test_email)
-            email_time = time.time() - email_start
+            email_result = await send_test_email_async(test_email)
             
             response_data['email_test'] = {
                 'success': email_result.get('success', False),
-                'time': f'{email_time:.3f}s',
                 'sent_to': test_email if email_result.get('success') else None,
                 'error': email_result.get('error') if not email_result.get('success') else None
             }
     
-    response_data['performance']['total_response_time'] = f'{time.time() - start_time:.3f}s'
+    # Timings come from the request instrumentation (also sent as Server-Timing)
+    stats = current_stats()
+    if stats is not None:
+        response_data['performance'] = {
+            'db_queries': stats.db_queries,
+            'db_query_time': f'{stats.db_seconds:.3f}s',
+            'external_call_time': f'{stats.external_seconds:.3f}s',
+        }
     return Response(response_data)
 
 # =============================================================================
 # LOCATION-BASED SERVICES
 # =============================================================================
 
-@api_view(['GET'])
-def find_nearest_home(request):
+@async_api_view(['GET'], throttle_classes=[GeocodingRateThrottle])
+@cache_policy(3600, vary_on=('location', 'lat', 'lon'), tags=('care_homes',))
+async def find_nearest_home(request):
     """
     Find the nearest Bellavista care home to a given location.
     
@@ -377,115 +415,258 @@ def find_nearest_home(request):
         lat (float): Latitude coordinate (alternative to location)
         lon (float): Longitude coordinate (alternative to location)
         
+    Runs as an async view so waiting on Nominatim does not hold a worker.
+    
     Returns:
         JSON with nearest home details, distance, and navigation URL
     """
+    user_point, error_response = await aresolve_user_location(request)
+    if error_response:
+        return error_response
+    
+    # Look up the nearest care home in the spatial index (may reload the registry)
+    match = (await sync_to_async(nearest_homes)([user_point]))[0]
+
+    if not match:
+        return Response({
+            'error': 'No homes found'
+        }, status=status.HTTP_404_NOT_FOUND)
+
+    home_code, home, min_distance = match[0]
+    user_location = request.GET.get('location', '').strip()
+
+    return Response({
+        'nearest_home': home.name,
+        'address': home.address,
+        'phone': home.phone,
+        'distance': f"{round(min_distance, 1)} miles",
+        'duration': format_duration(await atravel_minutes(user_location, home_code, min_distance)),
+        'maps_url': build_maps_url(request, user_point, home),
+        'coordinates': home.coordinates
+    })
+
+@api_view(['GET'])
+@throttle_classes([GeocodingRateThrottle])
+@cache_policy(60, vary_on=('location', 'lat', 'lon', 'homes', 'slots'), tags=('bookings', 'care_homes'))
+def find_nearest_home_with_slots(request):
+    """
+    Find the nearest care homes together with their next available tour slots.
+    
+    Collapses the search-then-book flow into one request: availability for
+    every candidate home is computed from a single grouped booking query.
+    
+    Query Parameters:
+        location (str): Address or postcode to search from
+        lat (float): Latitude coordinate (alternative to location)
+        lon (float): Longitude coordinate (alternative to location)
+        homes (int): Number of nearest homes to return (default 3)
+        slots (int): Number of available slots per home (default 3)
+        
+    Returns:
+        JSON with ranked homes, each with distance, duration and next slots
+    """
+    try:
+        home_count = int(request.GET.get('homes', 3))
+        slot_count = int(request.GET.get('slots', 3))
+    except ValueError:
+        return Response({
+            'error': 'homes and slots must be whole numbers'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    if not 1 <= home_count <= MAX_NEAREST_HOMES or not 1 <= slot_count <= MAX_SLOTS_PER_HOME:
+        return Response({
+            'error': f'homes must be 1-{MAX_NEAREST_HOMES} and slots must be 1-{MAX_SLOTS_PER_HOME}'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    user_point, error_response = resolve_user_location(request)
+    if error_response:
+        return error_response
+
+    matches = nearest_homes([user_point], k=home_count)[0]
+    if not matches:
+        return Response({
+            'error': 'No homes found'
+        }, status=status.HTTP_404_NOT_FOUND)
+
+    # One query covers availability for every candidate home
+    slots_by_home = next_available_slots([code for code, _, _ in matches], slot_count)
+    user_location = request.GET.get('location', '').strip()
+
+    homes = []
+    for home_code, home, distance in matches:
+        homes.append({
+            'key': home_code,
+            'name': home.name,
+            'address': home.address,
+            'phone': home.phone,
+            'distance': f"{round(distance, 1)} miles",
+            'duration': format_duration(travel_minutes(user_location, home_code, distance)),
+            'maps_url': build_maps_url(request, user_point, home),
+            'coordinates': home.coordinates,
+            'next_available_slots': slots_by_home[home_code]
+        })
+
+    return Response({
+        'homes': homes
+    })
+
+@api_view(['POST'])
+@throttle_classes([GeocodingBatchRateThrottle])
+def find_nearest_home_batch(request):
+    """
+    Find the nearest Bellavista care home for a list of locations.
+    
+    Body Parameters:
+        locations (list): Address/postcode strings or {"lat": ..., "lon": ...} objects
+        
+    Returns:
+        Newline-delimited JSON stream with one result per location, tagged
+        with its index in the request and emitted as soon as it is resolved
+    """
+    # A JSON body that is not an object (e.g. a bare list) has no locations
+    locations = request.data.get('locations') if isinstance(request.data, dict) else None
+
+    # Validate input parameters
+    if not isinstance(locations, list) or not locations:
+        return Response({
+            'error': 'locations must be a non-empty list'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    if len(locations) > MAX_BATCH_LOCATIONS:
+        return Response({
+            'error': f'A maximum of {MAX_BATCH_LOCATIONS} locations can be resolved per request'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    # Stream results as newline-delimited JSON. ASGI servers only stream
+    # async iterators (a sync one is buffered whole), WSGI only sync ones.
+    # Lookups happen while the body is sent, after the request has ended,
+    # so they are attributed to it again for the metrics
+    if isinstance(request._request, ASGIRequest):
+        async def lines():
+            with request_context(request._request):
+                async for result in aresolve_nearest_homes(locations):
+                    yield json.dumps(result) + '\n'
+        return StreamingHttpResponse(lines(), content_type='application/x-ndjson')
+
+    def lines():
+        with request_context(request._request):
+            for result in resolve_nearest_homes(locations):
+                yield json.dumps(result) + '\n'
+    return StreamingHttpResponse(lines(), content_type='application/x-ndjson')
+
+# =============================================================================
+# UTILITY FUNCTIONS
+# =============================================================================
+
+def parse_location_params(request):
+    """
+    Read the location or lat/lon query parameters.
+    
+    Returns:
+        tuple: (location, point, error Response); point is set for lat/lon
+        searches, location is the text to geocode otherwise
+    """
     user_location = request.GET.get('location', '').strip()
     user_lat_param = request.GET.get('lat')
     user_lon_param = request.GET.get('lon')
 
     # Validate input parameters
     if not user_location and not (user_lat_param and user_lon_param):
-        return Response({
+        return None, None, Response({
             'error': 'Location parameter or both lat and lon parameters are required'
         }, status=status.HTTP_400_BAD_REQUEST)
 
     # Handle coordinate input
     if user_lat_param and user_lon_param:
         try:
-            user_lat = float(user_lat_param)
-            user_lon = float(user_lon_param)
+            return None, parse_point(user_lat_param, user_lon_param), None
         except ValueError:
-            return Response({
+            return None, None, Response({
                 'error': 'Invalid latitude or longitude values'
             }, status=status.HTTP_400_BAD_REQUEST)
+
+    return user_location, None, None
+
+
+def geocoding_error(error):
+    """Response for a failed or refused geocoding lookup"""
+    return Response({
+        'error': f'Geocoding service error: {str(error)}'
+    }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+def location_not_found():
+    """Response for a location that geocoded to nothing"""
+    return Response({
+        'error': 'Location not found. Please try a different address or postcode.'
+    }, status=status.HTTP_404_NOT_FOUND)
+
+
+def resolve_user_location(request):
+    """
+    Work out the user's coordinates from location or lat/lon query parameters.
     
+    Returns:
+        tuple: ((lat, lon), None) on success or (None, error Response)
+    """
+    user_location, point, error_response = parse_location_params(request)
+    if point or error_response:
+        return point, error_response
+
     # Handle location string input - geocode using OpenStreetMap
-    elif user_location:
-        try:
-            nominatim_url = 'https://nominatim.openstreetmap.org/search'
-            params = {
-                'q': user_location,
-                'format': 'json',
-                'limit': 1,
-                'countrycodes': 'gb'  # Limit to UK
-            }
-            headers = {
-                'User-Agent': 'BellavistaCareHomes/1.0'
-            }
+    try:
+        point = geocode_location(user_location)
+    except requests.RequestException as e:
+        return None, geocoding_error(e)
 
-            response = requests.get(nominatim_url, params=params, headers=headers, timeout=10)
-            response.raise_for_status()
+    if point is None:
+        return None, location_not_found()
+    return point, None
 
-            data = response.json()
-            if not data:
-                return Response({
-                    'error': 'Location not found. Please try a different address or postcode.'
-                }, status=status.HTTP_404_NOT_FOUND)
 
-            user_lat = float(data[0]['lat'])
-            user_lon = float(data[0]['lon'])
-            
-        except requests.RequestException as e:
-            return Response({
-                'error': f'Geocoding service error: {str(e)}'
-            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
-    
-    # Calculate distances to all care homes
-    nearest_home = None
-    min_distance = float('inf')
-
-    for home_key, home_data in HOME_LOCATIONS.items():
-        home_lat, home_lon = home_data['coordinates']
-        distance = haversine_distance(user_lat, user_lon, home_lat, home_lon)
-
-        if distance < min_distance:
-            min_distance = distance
-            nearest_home = {
-                'key': home_key,
-                'name': home_data['name'],
-                'address': home_data['address'],
-                'phone': home_data['phone'],
-                'distance': round(distance, 1),
-                'coordinates': home_data['coordinates']
-            }
+async def aresolve_user_location(request):
+    """Async resolve_user_location() that geocodes without blocking the event loop"""
+    user_location, point, error_response = parse_location_params(request)
+    if point or error_response:
+        return point, error_response
 
-    if not nearest_home:
-        return Response({
-            'error': 'No homes found'
-        }, status=status.HTTP_404_NOT_FOUND)
+    try:
+        point = await ageocode_location(user_location)
+    except requests.RequestException as e:
+        return None, geocoding_error(e)
 
-    # Calculate estimated driving time
-    duration_hours = min_distance / AVERAGE_SPEED_KMH
-    duration_minutes = int(duration_hours * 60)
+    if point is None:
+        return None, location_not_found()
+    return point, None
 
-    # Format duration string
+
+def format_duration(duration_minutes):
+    """
+    Format a driving time for display.
+    
+    Args:
+        duration_minutes (int): Driving time in minutes
+        
+    Returns:
+        str: e.g. "25 minutes" or "1 hour 5 minutes"
+    """
     if duration_minutes < 60:
-        duration_str = f"{duration_minutes} minutes"
-    else:
-        hours = duration_minutes // 60
-        minutes = duration_minutes % 60
-        duration_str = f"{hours} hour{'s' if hours > 1 else ''} {minutes} minutes"
+        return f"{duration_minutes} minutes"
 
-    # Create Google Maps navigation URL
-    if user_lat_param and user_lon_param:
-        maps_url = f"https://www.google.com/maps/dir/?api=1&origin={user_lat},{user_lon}&destination={nearest_home['coordinates'][0]},{nearest_home['coordinates'][1]}"
-    else:
-        maps_url = f"https://www.google.com/maps/dir/?api=1&origin={user_location.replace(' ', '+')}&destination={nearest_home['coordinates'][0]},{nearest_home['coordinates'][1]}"
+    hours = duration_minutes // 60
+    minutes = duration_minutes % 60
+    return f"{hours} hour{'s' if hours > 1 else ''} {minutes} minutes"
 
-    return Response({
-        'nearest_home': nearest_home['name'],
-        'address': nearest_home['address'],
-        'phone': nearest_home['phone'],
-        'distance': f"{nearest_home['distance']} miles",
-        'duration': duration_str,
-        'maps_url': maps_url,
-        'coordinates': nearest_home['coordinates']
-    })
 
-# =============================================================================
-# UTILITY FUNCTIONS
-# =============================================================================
+def build_maps_url(request, user_point, home):
+    """Create a Google Maps navigation URL from the user's location to a home"""
+    destination = f"{home.coordinates[0]},{home.coordinates[1]}"
+    if request.GET.get('lat') and request.GET.get('lon'):
+        origin = f"{user_point[0]},{user_point[1]}"
+    else:
+        origin = request.GET.get('location', '').strip().replace(' ', '+')
+    return f"https://www.google.com/maps/dir/?api=1&origin={origin}&destination={destination}"
+
 
 def haversine_distance(lat1, lon1, lat2, lon2):
     """
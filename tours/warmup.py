@@ -0,0 +1,121 @@
+"""
+Cache Warm-up for Bellavista Care Homes
+Pre-populates the shared cache after a deploy or cold start
+"""
+
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import GeocodedLocation
+from .registry import get_registry
+
+# Held while one worker warms the shared cache, so others skip it
+WARMUP_LOCK_KEY = 'tours:warmup:lock'
+WARMUP_LOCK_SECONDS = 300
+
+
+def _get(view, path, params=None):
+    """Call a cached view in-process so it stores its own response"""
+    from django.test import RequestFactory
+
+    request = RequestFactory().get(path, params or {})
+    return view(request)
+
+
+def warm_availability(days):
+    """
+    Cache available slots for every active home for the next `days` days.
+
+    Returns:
+        int: Number of home/day entries warmed
+    """
+    from .views import available_slots
+
+    today = timezone.localdate()
+    warmed = 0
+    for home in get_registry().homes:
+        for offset in range(days):
+            day = (today + timedelta(days=offset)).isoformat()
+            response = _get(available_slots, '/api/tours/available-slots/', {'date': day, 'home': home.code})
+            warmed += response.status_code == 200
+    return warmed
+
+
+def warm_stats():
+    """
+    Cache the booking statistics aggregates.
+
+    Returns:
+        int: 1 if the stats were warmed, otherwise 0
+    """
+    from .views import booking_stats
+
+    return int(_get(booking_stats, '/api/tours/stats/').status_code == 200)
+
+
+def warm_geocodes(limit):
+    """
+    Restore the most frequently searched locations to the geocode cache.
+
+    Coordinates come from GeocodedLocation, so Nominatim is not called.
+
+    Returns:
+        int: Number of locations warmed
+    """
+    from .location_service import prime_geocode
+
+    locations = GeocodedLocation.objects.order_by('-lookup_count', '-last_looked_up')[:limit]
+    warmed = 0
+    for location in locations:
+        prime_geocode(location.query, (location.latitude, location.longitude))
+        warmed += 1
+    return warmed
+
+
+def warm_caches(days=None, geocodes=None):
+    """
+    Warm availability, stats and geocode caches.
+
+    Args:
+        days (int): Days of availability to warm (default WARM_CACHE_DAYS)
+        geocodes (int): Number of locations to warm (default WARM_GEOCODE_LIMIT)
+
+    Returns:
+        dict: Entries warmed per cache
+    """
+    days = settings.WARM_CACHE_DAYS if days is None else days
+    geocodes = settings.WARM_GEOCODE_LIMIT if geocodes is None else geocodes
+    return {
+        'availability': warm_availability(days),
+        'stats': warm_stats(),
+        'geocodes': warm_geocodes(geocodes),
+    }
+
+
+def warm_caches_in_background():
+    """
+    Post-start hook: warm the caches in a background thread.
+
+    Only one worker per shared cache does the work; the rest see the lock
+    and return straight away. Does nothing unless WARM_CACHES_ON_START is set.
+    """
+    if not settings.WARM_CACHES_ON_START:
+        return None
+    if not cache.add(WARMUP_LOCK_KEY, 1, timeout=WARMUP_LOCK_SECONDS):
+        return None
+
+    def run():
+        from django.db import close_old_connections
+
+        try:
+            warm_caches()
+        finally:
+            close_old_connections()
+
+    thread = threading.Thread(target=run, name='cache-warmup', daemon=True)
+    thread.start()
+    return thread